@@ -0,0 +1,4 @@
+# benchmarks/__init__.py
+#
+# Microbenchmarks for the bot's hot paths.
+# Entry point: python -m benchmarks.run --help
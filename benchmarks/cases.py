@@ -0,0 +1,207 @@
+# benchmarks/cases.py
+#
+# Each case is `fn(number) -> seconds` timing `number` operations itself, so
+# setup (building fixtures, writing files) stays outside the measurement.
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+import wave
+from types import SimpleNamespace
+
+SESSION_COUNT = 10000
+SESSION_HISTORY = 20           # exchanges per stored session
+LONG_HISTORY = 500             # exchanges in the prompt-assembly case
+MEMBER_COUNT = 50000
+TTS_SAMPLE_TEXT = "The quick brown fox jumps over the lazy dog while the bot reads this sentence aloud."
+
+BENCHMARKS = {}
+
+
+def benchmark(name, *, number, repeat=5, group="core"):
+    """Register a case. `number` ops are timed per repeat; the result is reported per op."""
+    def register(fn):
+        BENCHMARKS[name] = {"fn": fn, "number": number, "repeat": repeat, "group": group}
+        return fn
+    return register
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Silence stdout (e.g. Coqui TTS's progress prints) so terminal speed doesn't
+    skew timings. The cogs log through cogs/log.py instead; the benchmarks never
+    set up its pipeline, so their debug records are dropped without any I/O.
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def make_session(user_id: int, exchanges: int) -> dict:
+    messages = []
+    for n in range(exchanges):
+        messages.append({"role": "user", "content": f"message {n} from {user_id}: " + "lorem ipsum " * 8})
+        messages.append({"role": "assistant", "content": f"reply {n}: " + "dolor sit amet " * 10})
+    return {"user_name": f"user{user_id}", "messages": messages, "voice_mode_on": False}
+
+
+###################################################
+#   Session store
+###################################################
+@benchmark("session.save_session", number=SESSION_COUNT, repeat=3)
+def bench_save_session(number):
+    from cogs import conversation_manager as cm
+    cm.private_sessions.clear()
+    for user_id in range(number):
+        cm.private_sessions[user_id] = make_session(user_id, SESSION_HISTORY)
+    with quiet():
+        start = time.perf_counter()
+        for user_id in range(number):
+            cm.save_session(user_id)
+        return time.perf_counter() - start
+
+
+@benchmark("session.load_all_sessions_on_start", number=1, repeat=3)
+def bench_load_all_sessions(number):
+    from cogs import conversation_manager as cm
+    # Reuses the SESSION_COUNT files written by session.save_session (written here if missing)
+    if len(os.listdir(cm.SESSION_FOLDER)) < SESSION_COUNT:
+        bench_save_session(SESSION_COUNT)
+    elapsed = 0.0
+    with quiet():
+        for _ in range(number):
+            cm.private_sessions.clear()
+            start = time.perf_counter()
+            cm.load_all_sessions_on_start()
+            elapsed += time.perf_counter() - start
+    return elapsed
+
+
+###################################################
+#   LLM plumbing
+###################################################
+@benchmark("llm.parse_response", number=20000)
+def bench_parse_llm_response(number):
+    from cogs.llm_utils import parse_llm_response
+    content = json.dumps({
+        "message": "lorem ipsum dolor sit amet " * 20,
+        "tool_calls": [{"tool_name": "get_channels", "parameters": {"page": 1}}],
+    })
+    body = json.dumps({
+        "id": "chatcmpl-1",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 900, "completion_tokens": 120},
+    }).encode()
+    start = time.perf_counter()
+    for _ in range(number):
+        # Same work as response.json() + parse_llm_response in call_local_llm
+        parse_llm_response(json.loads(body))
+    return time.perf_counter() - start
+
+
+@benchmark("llm.build_dm_messages", number=2000)
+def bench_build_dm_messages(number):
+    from cogs.conversation_manager import build_dm_messages
+    session = make_session(1, LONG_HISTORY)
+    system_prompt = "You are a helpful assistant. " * 50
+    start = time.perf_counter()
+    for _ in range(number):
+        build_dm_messages(system_prompt, session, "what did we talk about earlier?")
+    return time.perf_counter() - start
+
+
+###################################################
+#   Server manager
+###################################################
+def make_guild(guild_id: int, member_count: int):
+    members = [
+        SimpleNamespace(id=n, name=f"member{n}", nick=(f"nick{n}" if n % 3 == 0 else None))
+        for n in range(member_count)
+    ]
+    channels = [SimpleNamespace(id=n, name=f"channel-{n}") for n in range(200)]
+
+    async def query_members(query, limit=5, cache=True):
+        return [m for m in members if m.name.startswith(query)][:limit]
+
+    # Fully chunked, like a guild whose member list has already been loaded (see member_cache.ensure_chunked)
+    return SimpleNamespace(
+        id=guild_id, name=f"guild-{guild_id}", members=members, channels=channels,
+        chunked=True, member_count=member_count, query_members=query_members,
+    )
+
+
+@benchmark("server.find_member_by_name", number=200)
+def bench_find_member_by_name(number):
+    from cogs.server_manager import find_member_by_name
+    guild = make_guild(1, MEMBER_COUNT)
+    # Worst case for a linear scan: the match is the last member
+    target = f"member{MEMBER_COUNT - 1}"
+    start = time.perf_counter()
+    for _ in range(number):
+        find_member_by_name(guild, target)
+    return time.perf_counter() - start
+
+
+def _tool_manager():
+    from cogs.server_manager import DiscordServerManager, DEFAULT_GUILD_ID
+    guild = make_guild(DEFAULT_GUILD_ID, 5000)
+    bot = SimpleNamespace(guilds=[guild], get_guild=lambda gid: guild if gid == guild.id else None)
+    return DiscordServerManager(bot)
+
+
+def _time_tool_calls(manager, calls, number, clear_cache):
+    async def run():
+        # Make sure the timed path is the real one, not the error path
+        for result in await manager.handle_tool_calls(calls):
+            assert not result.startswith("[ERROR]"), result
+        manager.cache.clear()
+        start = time.perf_counter()
+        for n in range(number):
+            if clear_cache:
+                manager.cache.clear()
+            await manager.handle_tool_calls([calls[n % len(calls)]])
+        return time.perf_counter() - start
+    return asyncio.run(run())
+
+
+TOOL_CALLS = [
+    {"tool_name": "get_guild_members", "parameters": {"page": 2}},
+    {"tool_name": "get_channels", "parameters": {}},
+    {"tool_name": "get_guilds", "parameters": {}},
+]
+
+
+@benchmark("tools.dispatch_cached", number=20000)
+def bench_tool_dispatch_cached(number):
+    return _time_tool_calls(_tool_manager(), TOOL_CALLS, number, clear_cache=False)
+
+
+@benchmark("tools.dispatch_uncached", number=2000)
+def bench_tool_dispatch_uncached(number):
+    return _time_tool_calls(_tool_manager(), TOOL_CALLS, number, clear_cache=True)
+
+
+###################################################
+#   TTS (opt-in: loads the Coqui model)
+###################################################
+def wav_duration(path: str) -> float:
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+@benchmark("tts.real_time_factor", number=3, repeat=3, group="tts")
+def bench_tts_rtf(number):
+    """Reports synthesis seconds per second of audio (lower is better) instead of wall time."""
+    from cogs.tts_engine import tts_engine
+    path = os.path.join(os.environ["BENCH_WORK_DIR"], "bench_tts.wav")
+    synth = audio = 0.0
+    with quiet():
+        for _ in range(number):
+            start = time.perf_counter()
+            tts_engine.generate_wav(TTS_SAMPLE_TEXT, path)
+            synth += time.perf_counter() - start
+            audio += wav_duration(path)
+    # Scaled so that (value / number) is the real-time factor
+    return synth / audio * number
@@ -0,0 +1,136 @@
+# benchmarks/run.py
+#
+# Usage:
+#   python -m benchmarks.run                          # run, print, write benchmarks/results.json
+#   python -m benchmarks.run --save-baseline          # also store the run as benchmarks/baseline.json
+#   python -m benchmarks.run --compare                # fail (exit 1) on regressions vs the baseline
+#   python -m benchmarks.run -k session --tts         # filter cases; include the TTS model case
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Session files must land in a scratch folder; set before any cog module is imported
+WORK_DIR = tempfile.mkdtemp(prefix="bot-bench-")
+os.environ["DM_SESSION_DIR"] = os.path.join(WORK_DIR, "dm_sessions")
+os.environ["BENCH_WORK_DIR"] = WORK_DIR
+os.environ["AUDIO_CACHE_MAX_MB"] = "0"
+os.environ.setdefault("TRACE_FILE", os.path.join(WORK_DIR, "traces.jsonl"))
+
+from .cases import BENCHMARKS
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, "results.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+# A case regresses when its median per-op time exceeds baseline * (1 + threshold)
+DEFAULT_THRESHOLD = 0.20
+
+
+def run_case(name: str, spec: dict) -> dict:
+    per_op = []
+    for _ in range(spec["repeat"]):
+        elapsed = spec["fn"](spec["number"])
+        per_op.append(elapsed / spec["number"])
+    return {
+        "number": spec["number"],
+        "repeat": spec["repeat"],
+        "median": statistics.median(per_op),
+        "mean": statistics.fmean(per_op),
+        "min": min(per_op),
+        "stdev": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+    }
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": int(time.time()),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Return a list of (name, baseline_median, current_median, ratio) for regressed cases."""
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base or not base.get("median"):
+            continue
+        ratio = current["median"] / base["median"]
+        if ratio > 1 + threshold:
+            regressions.append((name, base["median"], current["median"], ratio))
+    return regressions
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the bot's hot paths")
+    parser.add_argument("-k", dest="filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--tts", action="store_true", help="include the TTS real-time-factor case (loads the model)")
+    parser.add_argument("--out", default=DEFAULT_RESULTS, help="where to write the JSON results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if any case regressed vs the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = {
+        name: spec for name, spec in BENCHMARKS.items()
+        if args.filter in name and (spec["group"] != "tts" or args.tts)
+    }
+
+    results = {"environment": environment(), "benchmarks": {}}
+    try:
+        for name, spec in cases.items():
+            result = run_case(name, spec)
+            results["benchmarks"][name] = result
+            print(f"{name:<40} median {format_time(result['median']):>12}  "
+                  f"min {format_time(result['min']):>12}  stdev {format_time(result['stdev']):>12}")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"[DEBUG] Results written to {args.out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[DEBUG] Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"[ERROR] No baseline at {args.baseline}; run with --save-baseline first.")
+            return 1
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, base, current, ratio in regressions:
+            print(f"[WARN] Regression in {name}: {format_time(base)} -> {format_time(current)} ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"[DEBUG] No regressions beyond {args.threshold:.0%} vs baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
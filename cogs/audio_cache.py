@@ -0,0 +1,237 @@
+# cogs/audio_cache.py
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .log import get_logger
+from .memory import memory_tracker
+
+log = get_logger("music")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Folder holding downloaded audio files and the cache index
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(BASE_DIR, "audio_cache"))
+# Total size budget; least recently played files are evicted past this (0 disables the cache)
+AUDIO_CACHE_MAX_MB = int(os.getenv("AUDIO_CACHE_MAX_MB", "2048"))
+# A track is downloaded in the background once it has been played this many times
+AUDIO_CACHE_MIN_PLAYS = int(os.getenv("AUDIO_CACHE_MIN_PLAYS", "3"))
+# Max videos whose play counts are remembered without being cached
+AUDIO_CACHE_MAX_TRACKED = 10000
+# Seconds to wait after a play before writing the index, so busy guilds cost one write per burst
+AUDIO_CACHE_SAVE_DELAY = 10
+
+DOWNLOAD_OPTIONS = {
+    'format': 'bestaudio[acodec=opus]/bestaudio/best',
+    'noplaylist': True,
+    'quiet': True,
+    'no_warnings': True,
+    'source_address': '0.0.0.0',
+    'outtmpl': os.path.join(AUDIO_CACHE_DIR, '%(id)s.%(ext)s'),
+}
+
+
+class AudioCache:
+    """
+    Size-bounded, LRU-evicted cache of downloaded audio keyed by video ID.
+    Play counts are tracked per video; once a video reaches AUDIO_CACHE_MIN_PLAYS
+    it is downloaded on a dedicated single-thread executor, so later plays
+    read a local file instead of streaming from YouTube.
+    """
+    def __init__(self, cache_dir=AUDIO_CACHE_DIR, max_mb=AUDIO_CACHE_MAX_MB, min_plays=AUDIO_CACHE_MIN_PLAYS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self.min_plays = min_plays
+        self.index_path = os.path.join(cache_dir, "index.json")
+        # video_id -> {"plays": int, "last_used": float, "file": str|None, "size": int, "acodec": str|None}
+        self.entries = {}
+        self._downloading = set()
+        self._save_task = None
+        self._version = 0           # bumped per snapshot; an older snapshot never replaces a newer one
+        self._written_version = 0
+        self._write_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-cache")
+        if self.enabled:
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _load_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            log.error(f"Could not read audio cache index: {e}")
+            return
+        # Forget files that were removed by hand
+        for entry in self.entries.values():
+            if entry.get("file") and not os.path.isfile(entry["file"]):
+                entry["file"] = None
+                entry["size"] = 0
+
+    async def save_index(self):
+        """Serialize on the loop (entries are only mutated there), write on a thread."""
+        self._version += 1
+        await asyncio.to_thread(self._write_index, json.dumps(self.entries), self._version)
+
+    def schedule_save(self):
+        """Debounce index writes: plays in the next AUDIO_CACHE_SAVE_DELAY seconds share one write."""
+        if self._save_task is not None:
+            return
+
+        async def _save_later():
+            try:
+                await asyncio.sleep(AUDIO_CACHE_SAVE_DELAY)
+            finally:
+                self._save_task = None
+            await self.save_index()
+
+        self._save_task = asyncio.create_task(_save_later())
+
+    def _write_index(self, data: str, version: int):
+        with self._write_lock:
+            if version < self._written_version:
+                return
+            # Unique temp file per write: clusters sharing AUDIO_CACHE_DIR never write the same one
+            tmp = tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.cache_dir, prefix="index.", suffix=".tmp", delete=False
+            )
+            try:
+                with tmp:
+                    tmp.write(data)
+                os.replace(tmp.name, self.index_path)
+                self._written_version = version
+            except Exception as e:
+                log.error(f"Could not save audio cache index: {e}")
+                remove_files([tmp.name])
+
+    def lookup(self, video_id):
+        """Return the cached entry for `video_id` if its file is on disk, else None."""
+        if not self.enabled or not video_id:
+            return None
+        entry = self.entries.get(video_id)
+        if entry and entry.get("file"):
+            entry["last_used"] = time.time()
+            return entry
+        return None
+
+    async def record_play(self, info: dict):
+        """Count a play; schedules a background download once the track is popular enough."""
+        video_id = info.get("id")
+        if not self.enabled or not video_id:
+            return
+        entry = self.entries.setdefault(video_id, {"plays": 0, "file": None, "size": 0, "acodec": None})
+        entry["plays"] += 1
+        entry["last_used"] = time.time()
+
+        if (
+            not entry.get("file")
+            and entry["plays"] >= self.min_plays
+            and video_id not in self._downloading
+            and info.get("webpage_url")
+        ):
+            self._downloading.add(video_id)
+            task = asyncio.create_task(self._download(video_id, info["webpage_url"]))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        self._prune_tracked()
+        self.schedule_save()
+
+    def _download_blocking(self, webpage_url: str):
+        import yt_dlp  # deferred like in ytdl_pool; loaded by the startup warm-up
+        with yt_dlp.YoutubeDL(DOWNLOAD_OPTIONS) as ytdl:
+            data = ytdl.extract_info(webpage_url, download=True)
+            return ytdl.prepare_filename(data), data.get("acodec")
+
+    async def _download(self, video_id: str, webpage_url: str):
+        loop = asyncio.get_running_loop()
+        try:
+            path, acodec = await loop.run_in_executor(self._executor, self._download_blocking, webpage_url)
+            entry = self.entries.get(video_id)
+            if entry is None or not os.path.isfile(path):
+                return
+            entry["file"] = path
+            entry["size"] = os.path.getsize(path)
+            entry["acodec"] = acodec
+            log.debug(f"Cached audio for {video_id} ({entry['size'] // 1024} KB)")
+            evicted = self._evict()
+            if evicted:
+                await asyncio.to_thread(remove_files, evicted)
+            self.schedule_save()
+        except Exception as e:
+            log.warning(f"Audio cache download failed for {video_id}: {e}")
+        finally:
+            self._downloading.discard(video_id)
+
+    def _evict(self):
+        """
+        Forget least recently played files until the cache fits its budget.
+        Runs on the loop; returns the paths for the caller to delete off it.
+        """
+        evicted = []
+        cached = sorted(
+            (e.get("last_used", 0), vid) for vid, e in self.entries.items() if e.get("file")
+        )
+        total = sum(self.entries[vid]["size"] for _, vid in cached)
+        for _, vid in cached:
+            if total <= self.max_bytes:
+                break
+            entry = self.entries[vid]
+            evicted.append(entry["file"])
+            total -= entry["size"]
+            entry["file"] = None
+            entry["size"] = 0
+            log.debug(f"Evicted cached audio for {vid}")
+        return evicted
+
+    def _prune_tracked(self):
+        if len(self.entries) <= AUDIO_CACHE_MAX_TRACKED:
+            return
+        uncached = sorted(
+            (e.get("last_used", 0), vid) for vid, e in self.entries.items() if not e.get("file")
+        )
+        for _, vid in uncached[:len(self.entries) - AUDIO_CACHE_MAX_TRACKED]:
+            del self.entries[vid]
+
+    def stats(self) -> dict:
+        files = [e for e in self.entries.values() if e.get("file")]
+        return {
+            "files": len(files),
+            "size_mb": round(sum(e["size"] for e in files) / (1024 * 1024), 1),
+            "tracked": len(self.entries),
+            "downloading": len(self._downloading),
+        }
+
+    def shutdown(self):
+        """Stop downloading and write a pending debounced save now (blocking)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+            self._version += 1
+            self._write_index(json.dumps(self.entries), self._version)
+
+
+def remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Create a global audio cache shared by all guilds
+audio_cache = AudioCache()
+memory_tracker.track("cache.audio_entries", lambda: audio_cache.entries)
+
+async def setup(bot):
+    pass
@@ -0,0 +1,167 @@
+# cogs/audio_supervisor.py
+
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # CPU/RSS accounting is skipped without psutil
+
+from .metrics import metrics
+from .log import get_logger
+
+log = get_logger("audio")
+
+# Hard cap on FFmpeg processes alive at once (music, pre-warm and TTS combined)
+MAX_FFMPEG_PROCESSES = int(os.getenv("MAX_FFMPEG_PROCESSES", "32"))
+# How many times a dropped network stream is respawned at its last position
+FFMPEG_MAX_RESTARTS = 3
+# FFmpeg's own log level; "error" surfaces stream failures without per-frame noise
+FFMPEG_LOGLEVEL = os.getenv("FFMPEG_LOGLEVEL", "error")
+# Let FFmpeg transparently reconnect dropped HTTP(S) streams before giving up
+RECONNECT_OPTIONS = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+
+
+class FFmpegCapacityError(RuntimeError):
+    """Raised when spawning would exceed MAX_FFMPEG_PROCESSES."""
+
+
+def is_network_source(path) -> bool:
+    return isinstance(path, str) and path.startswith(("http://", "https://"))
+
+
+class ProcessRecord:
+    def __init__(self, source, guild_id, kind, label, restarts=0):
+        self.source = source
+        self.process = getattr(source, "_process", None)
+        self.pid = self.process.pid if self.process else None
+        self.guild_id = guild_id
+        self.kind = kind
+        self.label = label
+        self.restarts = restarts
+        self.started_at = time.monotonic()
+        self._ps = None
+        if psutil and self.pid:
+            try:
+                self._ps = psutil.Process(self.pid)
+                self._ps.cpu_percent(None)  # prime the CPU counter
+            except psutil.Error:
+                self._ps = None
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def usage(self) -> dict:
+        cpu = rss_mb = None
+        if self._ps:
+            try:
+                cpu = self._ps.cpu_percent(None)
+                rss_mb = round(self._ps.memory_info().rss / (1024 * 1024), 1)
+            except psutil.Error:
+                pass
+        return {
+            "pid": self.pid,
+            "guild_id": self.guild_id,
+            "kind": self.kind,
+            "label": self.label,
+            "restarts": self.restarts,
+            "uptime": int(time.monotonic() - self.started_at),
+            "cpu_percent": cpu,
+            "rss_mb": rss_mb,
+        }
+
+
+class AudioProcessSupervisor:
+    """
+    Tracks every FFmpeg process spawned for playback.
+    Enforces MAX_FFMPEG_PROCESSES, counts restarts and reports per-process
+    CPU/RSS (when psutil is installed) grouped by guild.
+    """
+    def __init__(self, max_processes=MAX_FFMPEG_PROCESSES):
+        self.max_processes = max_processes
+        self._records = {}  # id(ffmpeg source) -> ProcessRecord
+        self._lock = threading.Lock()
+        self.total_spawned = 0
+        self.total_restarts = 0
+        self.rejected = 0
+        self.closed = False   # set by kill_all(); nothing new may start during shutdown
+
+    def _prune(self):
+        for key in [k for k, r in self._records.items() if not r.is_alive()]:
+            del self._records[key]
+
+    @property
+    def live_count(self) -> int:
+        with self._lock:
+            self._prune()
+            return len(self._records)
+
+    def spawn(self, factory, *, guild_id=None, kind="music", label="", restarts=0):
+        """
+        Create an FFmpeg source via `factory()` if under the process cap.
+        Raises FFmpegCapacityError otherwise.
+        """
+        with self._lock:
+            if self.closed:
+                raise FFmpegCapacityError("Audio is shutting down.")
+            self._prune()
+            if len(self._records) >= self.max_processes:
+                self.rejected += 1
+                raise FFmpegCapacityError(
+                    f"Too many audio processes running ({self.max_processes}). Try again shortly."
+                )
+            source = factory()
+            self._records[id(source)] = ProcessRecord(source, guild_id, kind, label, restarts)
+            self.total_spawned += 1
+            if restarts:
+                self.total_restarts += 1
+        return source
+
+    def release(self, source):
+        with self._lock:
+            self._records.pop(id(source), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._prune()
+            records = list(self._records.values())
+        processes = [r.usage() for r in records]
+        per_guild = {}
+        for p in processes:
+            guild = per_guild.setdefault(p["guild_id"], {"processes": 0, "cpu_percent": 0.0, "rss_mb": 0.0})
+            guild["processes"] += 1
+            guild["cpu_percent"] += p["cpu_percent"] or 0.0
+            guild["rss_mb"] += p["rss_mb"] or 0.0
+        return {
+            "live": len(processes),
+            "max": self.max_processes,
+            "spawned": self.total_spawned,
+            "restarts": self.total_restarts,
+            "rejected": self.rejected,
+            "processes": processes,
+            "per_guild": per_guild,
+        }
+
+    def kill_all(self):
+        """Terminate every tracked FFmpeg process and refuse new ones (used on shutdown)."""
+        with self._lock:
+            self.closed = True
+            records = list(self._records.values())
+            self._records.clear()
+        for record in records:
+            try:
+                record.source.cleanup()
+            except Exception as e:
+                log.warning(f"Could not clean up FFmpeg process {record.pid}: {e}")
+
+
+# Create a global supervisor shared by the music and TTS cogs
+audio_supervisor = AudioProcessSupervisor()
+metrics.gauge("ffmpeg_processes", "Live FFmpeg processes (music, pre-warm and TTS)").set_function(
+    lambda: audio_supervisor.live_count
+)
+
+async def setup(bot):
+    pass
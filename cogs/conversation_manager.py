@@ -2,27 +2,41 @@
 
 import discord
 from discord.ext import commands
+import asyncio
 import json
 import os
 import re
+import time
 
 from .llm_utils import call_local_llm
+from .metrics import metrics
+from .tracing import span
+from .memory import memory_tracker
+from .member_cache import get_or_fetch_member
+from .log import get_logger, bind_log_context
+from .shutdown import graceful_shutdown
+
+log = get_logger("conversation")
 
 # In-memory storage for private DM sessions
 private_sessions = {}
+# mtime of each session file as last read or written by this process: {user_id: st_mtime_ns}
+session_mtimes = {}
 
 # Define paths relative to the script location
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-SESSION_FOLDER = os.path.join(BASE_DIR, "dm_sessions")  # Folder to store session files
+SESSION_FOLDER = os.getenv("DM_SESSION_DIR", os.path.join(BASE_DIR, "dm_sessions"))  # Folder to store session files
 IMAGE_FOLDER = os.path.join(BASE_DIR, "images")         # Folder to store image files
 
+SESSION_WRITE_LATENCY = metrics.histogram("session_write_seconds", "Time to write one DM session file")
+
 def load_prompt(file_path: str):
     try:
         prompt_path = os.path.join(BASE_DIR, file_path)
         with open(prompt_path, "r", encoding="utf-8") as f:
             return f.read()
     except FileNotFoundError:
-        print(f"[ERROR] '{file_path}' not found.")
+        log.error(f"'{file_path}' not found.")
         return ""
 
 def ensure_dm_folder():
@@ -32,7 +46,7 @@ def ensure_dm_folder():
 def ensure_image_folder():
     if not os.path.exists(IMAGE_FOLDER):
         os.makedirs(IMAGE_FOLDER, exist_ok=True)
-        print(f"[INFO] Created '{IMAGE_FOLDER}/' directory for storing images.")
+        log.info(f"Created '{IMAGE_FOLDER}/' directory for storing images.")
 
 def session_file_path(user_id: int) -> str:
     return os.path.join(SESSION_FOLDER, f"session_{user_id}.json")
@@ -50,25 +64,69 @@ def load_all_sessions_on_start():
         try:
             with open(fullpath, "r", encoding="utf-8") as f:
                 data = json.load(f)
+                mtime = os.fstat(f.fileno()).st_mtime_ns
             user_id_str = fname.replace("session_", "").replace(".json", "")
             user_id = int(user_id_str)
             private_sessions[user_id] = data
-            print(f"[DEBUG] Loaded DM session from {fname}")
+            session_mtimes[user_id] = mtime
+            log.debug("Loaded DM session from %s", fname)
         except Exception as e:
-            print(f"[ERROR] Loading session file {fname}: {e}")
+            log.error(f"Loading session file {fname}: {e}")
 
 def save_session(user_id: int):
     """
     Save the given user's session data to a .json file.
+    Written to a temp file and renamed, so other shard processes never read a partial file.
     """
     ensure_dm_folder()
     data = private_sessions[user_id]
     path = session_file_path(user_id)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    start = time.perf_counter()
     try:
-        with open(path, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        session_mtimes[user_id] = os.stat(path).st_mtime_ns
     except Exception as e:
-        print(f"[ERROR] Could not save session for user {user_id}: {e}")
+        log.error(f"Could not save session for user {user_id}: {e}")
+    finally:
+        SESSION_WRITE_LATENCY.observe(time.perf_counter() - start)
+
+def get_session(user_id: int):
+    """
+    The user's session, or None. The session folder is the store shared by
+    all shard processes (a DM reply lands on shard 0's process even if
+    another process started the conversation), so the file is re-read
+    whenever another process has written it since we last did.
+    """
+    path = session_file_path(user_id)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return private_sessions.get(user_id)
+    if user_id in private_sessions and session_mtimes.get(user_id) == mtime:
+        return private_sessions[user_id]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            private_sessions[user_id] = json.load(f)
+        session_mtimes[user_id] = mtime
+    except (OSError, ValueError) as e:
+        log.error(f"Could not reload session for user {user_id}: {e}")
+    return private_sessions.get(user_id)
+
+def build_dm_messages(system_prompt_dm: str, session_data: dict, user_content: str):
+    """
+    Assemble the LLM message list for a private DM: system prompt, full history, new message.
+    """
+    dynamic_dm_prompt = (
+        f"{system_prompt_dm}\n"
+        f"You are currently talking privately to user: {session_data['user_name']}\n"
+        "They may say anything. You can only respond with JSON: { \"message\": \"...\" }"
+    )
+    full_messages = [{"role": "system", "content": dynamic_dm_prompt}] + session_data["messages"]
+    full_messages.append({"role": "user", "content": user_content})
+    return full_messages
 
 class ConversationManagerCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -80,37 +138,59 @@ class ConversationManagerCog(commands.Cog):
         # Ensure the images folder exists
         ensure_image_folder()
 
-        # On cog load, load all previous sessions from disk
-        load_all_sessions_on_start()
+        memory_tracker.track("conversation.private_sessions", lambda: private_sessions)
+
+    async def cog_load(self):
+        # Load all previous sessions from disk, off the loop so other extensions load meanwhile
+        await asyncio.to_thread(load_all_sessions_on_start)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        if message.author == self.bot.user:
+        if message.author == self.bot.user or graceful_shutdown.closing:
             return
 
+        # Each listener call runs in its own task, so the context can't leak into other messages
+        bind_log_context(guild_id=message.guild.id if message.guild else None, user_id=message.author.id)
+        async with span(
+            "on_message",
+            guild=message.guild.id if message.guild else None,
+            channel=message.channel.id,
+            user=message.author.id
+        ) as root:
+            with graceful_shutdown.in_flight():
+                handled = await self.route_message(message)
+            if root and not handled:
+                root.drop()  # don't export traces for messages the bot ignores
+
+    async def route_message(self, message: discord.Message) -> bool:
+        """
+        Reply to a DM or "bot-chat" message. Returns False if the message was ignored.
+        """
         # Check if it's a command
-        ctx = await self.bot.get_context(message)
+        async with span("get_context"):
+            ctx = await self.bot.get_context(message)
         if ctx.valid:
-            return  # Let commands handle it
+            return False  # Let commands handle it
 
         # If in DM
         if isinstance(message.channel, discord.DMChannel):
             user_id = message.author.id
-            # If user is in private_sessions, handle. Otherwise, do nothing.
-            if user_id in private_sessions:
+            # If user has a session (in memory or written by another shard process), handle. Otherwise, do nothing.
+            if get_session(user_id) is not None:
                 await self.handle_private_dm(message)
-            return
+                return True
+            return False
 
         # If in a guild channel, only respond in "bot-chat"
         if not message.guild:
-            return
+            return False
         if message.channel.name != "bot-chat":
-            return
+            return False
 
         # Normal message in "bot-chat" => call LLM with system_prompt_main
         user_content = message.content.strip()
         if not user_content:
-            return  # empty message
+            return False  # empty message
 
         messages = [
             {"role": "system", "content": self.system_prompt_main},
@@ -119,10 +199,11 @@ class ConversationManagerCog(commands.Cog):
         response = await call_local_llm(messages)
         if not isinstance(response, dict) or "message" not in response:
             await message.channel.send("[ERROR] LLM responded invalid JSON.")
-            return
+            return True
 
         reply_text = response["message"].strip() or "Done"
-        await message.channel.send(reply_text)
+        async with span("channel.send"):
+            await message.channel.send(reply_text)
 
         # Handle tool calls if any
         tool_calls = response.get("tool_calls", [])
@@ -130,8 +211,10 @@ class ConversationManagerCog(commands.Cog):
             server_cog = self.bot.get_cog("ServerManagerCog")
             if server_cog:
                 results = await server_cog.manager.handle_tool_calls(tool_calls)
-                for r in results:
-                    await message.channel.send(f"[Tool result]\n{r}")
+                async with span("channel.send", kind="tool_results", count=len(results)):
+                    for r in results:
+                        await message.channel.send(f"[Tool result]\n{r}")
+        return True
 
     @commands.command(name="talkto")
     async def talkto(self, ctx: commands.Context, member_id: int):
@@ -144,7 +227,7 @@ class ConversationManagerCog(commands.Cog):
             await ctx.send("[ERROR] Not in a valid guild context.")
             return
 
-        member = guild.get_member(member_id)
+        member = await get_or_fetch_member(guild, member_id)
         if not member:
             await ctx.send("[ERROR] Member not found.")
             return
@@ -153,14 +236,14 @@ class ConversationManagerCog(commands.Cog):
         user_id = member.id
 
         # If there's an existing session loaded, great; otherwise create one
-        if user_id not in private_sessions:
+        if get_session(user_id) is None:
             private_sessions[user_id] = {
                 "user_name": member.name,
                 "messages": [],
                 "voice_mode_on": False
             }
             save_session(user_id)
-            print(f"[DEBUG] Created a new DM session for user {user_id}")
+            log.debug(f"Created a new DM session for user {user_id}")
 
         await dm_channel.send(f"Hello {member.name}! We can talk privately anytime.")
         await ctx.send(f"Initiated private conversation with {member.name}.")
@@ -170,21 +253,14 @@ class ConversationManagerCog(commands.Cog):
         Handle user DM in a persistent session.
         """
         user_id = message.author.id
-        session_data = private_sessions[user_id]
+        session_data = get_session(user_id)
         user_content = message.content.strip()
         if not user_content:
             await message.channel.send("Ok, got it.")
             return
 
-        dynamic_dm_prompt = (
-            f"{self.system_prompt_dm}\n"
-            f"You are currently talking privately to user: {session_data['user_name']}\n"
-            "They may say anything. You can only respond with JSON: { \"message\": \"...\" }"
-        )
-
         conv_history = session_data["messages"]
-        full_messages = [{"role": "system", "content": dynamic_dm_prompt}] + conv_history
-        full_messages.append({"role": "user", "content": user_content})
+        full_messages = build_dm_messages(self.system_prompt_dm, session_data, user_content)
 
         response = await call_local_llm(
             messages=full_messages,
@@ -201,9 +277,11 @@ class ConversationManagerCog(commands.Cog):
         conv_history.append({"role": "assistant", "content": assistant_msg})
 
         # Save updated session
-        save_session(user_id)
+        with span("save_session"):
+            save_session(user_id)
 
-        await message.channel.send(assistant_msg)
+        async with span("channel.send"):
+            await message.channel.send(assistant_msg)
 
     #######################################
     #          NEW: !whisper command
@@ -257,20 +335,20 @@ class ConversationManagerCog(commands.Cog):
             await ctx.send("[ERROR] Could not locate a valid guild.")
             return
 
-        member = guild.get_member(target_user_id)
+        member = await get_or_fetch_member(guild, target_user_id)
         if not member:
             await ctx.send("[ERROR] Target user not found in the guild.")
             return
 
         # Create or load their session
-        if target_user_id not in private_sessions:
+        if get_session(target_user_id) is None:
             private_sessions[target_user_id] = {
                 "user_name": member.name,
                 "messages": [],
                 "voice_mode_on": False
             }
             save_session(target_user_id)
-            print(f"[DEBUG] Created a new DM session for user {target_user_id}")
+            log.debug(f"Created a new DM session for user {target_user_id}")
 
         session_data = private_sessions[target_user_id]
         dm_channel = await member.create_dm()
@@ -365,20 +443,20 @@ class ConversationManagerCog(commands.Cog):
             await ctx.send("[ERROR] Could not locate a valid guild.")
             return
 
-        member = guild.get_member(target_user_id)
+        member = await get_or_fetch_member(guild, target_user_id)
         if not member:
             await ctx.send("[ERROR] Target user not found in the guild.")
             return
 
         # Create or load their session
-        if target_user_id not in private_sessions:
+        if get_session(target_user_id) is None:
             private_sessions[target_user_id] = {
                 "user_name": member.name,
                 "messages": [],
                 "voice_mode_on": False
             }
             save_session(target_user_id)
-            print(f"[DEBUG] Created a new DM session for user {target_user_id}")
+            log.debug(f"Created a new DM session for user {target_user_id}")
 
         session_data = private_sessions[target_user_id]
         dm_channel = await member.create_dm()
@@ -0,0 +1,224 @@
+# cogs/diagnostics.py
+
+import asyncio
+import os
+import time
+
+import discord
+from discord.ext import commands
+
+from .profiler import profiler
+from .memory import memory_tracker, resident_memory, MEMORY_CHECK_INTERVAL
+from .tracing import tracer
+from .log import get_logger
+
+log = get_logger("diagnostics")
+
+# Default and maximum length of a `!profile start` window, in seconds
+PROFILE_DEFAULT_SECONDS = 30
+PROFILE_MAX_SECONDS = 600
+# Rows shown per table in the chat summary
+PROFILE_TOP_N = 10
+
+
+def shorten(text: str, width: int) -> str:
+    return text if len(text) <= width else "…" + text[-(width - 1):]
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+class DiagnosticsCog(commands.Cog):
+    """
+    Owner-only live diagnostics. `!profile start [seconds]` samples every
+    thread's stack for a window; `!profile stop` ends it early and `!profile dump`
+    posts the summary plus a collapsed-stack file (feed it to flamegraph.pl or
+    speedscope.app) without stopping. `!memory` reports tracked structures per
+    subsystem, and `!memory snapshot` diffs tracemalloc snapshots. Bounds are
+    checked every MEMORY_CHECK_INTERVAL seconds in the background.
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._auto_stop = None
+        self._command_started = {}  # Context -> perf_counter at invoke, while profiling
+        self._memory_task = None
+
+        # discord.py's caches (sized by the intents / member cache policy)
+        memory_tracker.track("discord.guilds", lambda: bot.guilds)
+        # The underlying containers, not the copying properties (guild.members, bot.users,
+        # bot.cached_messages): these are measured on the loop every MEMORY_CHECK_INTERVAL
+        memory_tracker.track(
+            "discord.members", lambda: [g._members for g in bot.guilds],
+            count=lambda: sum(len(g._members) for g in bot.guilds)
+        )
+        memory_tracker.track("discord.users", lambda: bot._connection._users)
+        memory_tracker.track("discord.messages", lambda: bot._connection._messages or ())
+        memory_tracker.track("tracing.open_traces", lambda: tracer._traces)
+
+    async def cog_load(self):
+        self._memory_task = asyncio.create_task(self._memory_loop())
+
+    async def cog_unload(self):
+        if self._auto_stop:
+            self._auto_stop.cancel()
+        if self._memory_task:
+            self._memory_task.cancel()
+        profiler.stop()
+
+    async def _memory_loop(self):
+        while True:
+            await asyncio.sleep(MEMORY_CHECK_INTERVAL)
+            try:
+                memory_tracker.check()
+            except Exception as e:
+                log.error(f"Memory check failed: {e}")
+
+    async def cog_check(self, ctx: commands.Context):
+        return await self.bot.is_owner(ctx.author)
+
+    # ----------- Per-command wall time -----------
+    # Commands all run inside Bot.on_message, so time them individually here
+    @commands.Cog.listener()
+    async def on_command(self, ctx: commands.Context):
+        if profiler.running:
+            self._command_started[ctx] = time.perf_counter()
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx: commands.Context):
+        self._finish_command(ctx)
+
+    @commands.Cog.listener()
+    async def on_command_error(self, ctx: commands.Context, error):
+        self._finish_command(ctx)
+
+    def _finish_command(self, ctx: commands.Context):
+        started = self._command_started.pop(ctx, None)
+        if started is not None and ctx.command:
+            profiler.record(f"!{ctx.command.qualified_name}", time.perf_counter() - started)
+
+    ###################################################
+    #   !profile
+    ###################################################
+    @commands.group(name="profile", invoke_without_command=True)
+    async def profile_group(self, ctx: commands.Context):
+        """Sampling profiler: start [seconds], stop, dump."""
+        state = f"running for {profiler.duration:.0f}s" if profiler.running else "not running"
+        await ctx.send(f"Profiler is {state}. Usage: `!profile start [seconds]`, `!profile stop`, `!profile dump`.")
+
+    @profile_group.command(name="start")
+    async def profile_start(self, ctx: commands.Context, seconds: int = PROFILE_DEFAULT_SECONDS):
+        if profiler.running:
+            await ctx.send(f"Profiler is already running ({profiler.duration:.0f}s so far).")
+            return
+        seconds = max(1, min(seconds, PROFILE_MAX_SECONDS))
+        self._command_started.clear()
+        profiler.start()
+        self._auto_stop = asyncio.create_task(self._stop_after(ctx, seconds))
+        await ctx.send(f"Profiling for {seconds}s at {1 / profiler.interval:.0f} Hz. `!profile stop` ends it early.")
+
+    @profile_group.command(name="stop")
+    async def profile_stop(self, ctx: commands.Context):
+        if not profiler.running:
+            await ctx.send("Profiler is not running.")
+            return
+        if self._auto_stop:
+            self._auto_stop.cancel()
+            self._auto_stop = None
+        profiler.stop()
+        await self.send_report(ctx)
+
+    @profile_group.command(name="dump")
+    async def profile_dump(self, ctx: commands.Context):
+        if profiler.started_at is None:
+            await ctx.send("Nothing profiled yet; use `!profile start` first.")
+            return
+        await self.send_report(ctx)
+
+    async def _stop_after(self, ctx: commands.Context, seconds: int):
+        await asyncio.sleep(seconds)
+        self._auto_stop = None
+        profiler.stop()
+        await self.send_report(ctx)
+
+    async def send_report(self, ctx: commands.Context):
+        try:
+            path = await asyncio.to_thread(profiler.write_collapsed)
+        except Exception as e:
+            log.error(f"Could not write profile: {e}")
+            path = None
+        summary = await asyncio.to_thread(self.render_summary)
+        if path:
+            await ctx.send(summary, file=discord.File(path, filename=os.path.basename(path)))
+        else:
+            await ctx.send(summary)
+
+    def render_summary(self) -> str:
+        _, thread_samples, thread_busy = profiler.snapshot()
+        status = "running" if profiler.running else "stopped"
+        lines = [f"**Profile** ({status}, {profiler.duration:.1f}s, {sum(thread_samples.values())} samples)"]
+
+        lines.append("**Threads** (busy share of samples):")
+        for group, total in thread_samples.most_common(6):
+            lines.append(f"`{shorten(group, 28):<28}` {thread_busy[group] / total:6.1%}")
+
+        lines.append(f"**Top {PROFILE_TOP_N} frames** (self / inclusive samples):")
+        for frame, own, inclusive in profiler.top_frames(PROFILE_TOP_N):
+            lines.append(f"`{shorten(frame, 60)}` {own} / {inclusive}")
+
+        lines.append("**Handlers** (calls, wall total, worst, on-loop):")
+        for label, stats in profiler.top_handlers(PROFILE_TOP_N):
+            on_loop = stats.loop_samples * profiler.interval
+            lines.append(
+                f"`{shorten(label, 50)}` {stats.calls}x, {stats.wall:.2f}s, "
+                f"worst {stats.worst:.2f}s, loop {on_loop:.2f}s"
+            )
+        return "\n".join(lines)[:2000]
+
+    ###################################################
+    #   !memory
+    ###################################################
+    @commands.group(name="memory", invoke_without_command=True)
+    async def memory_group(self, ctx: commands.Context):
+        """Memory per subsystem: entries and sampled size of each tracked structure."""
+        memory_tracker.check()
+        lines = [f"**Memory:** RSS {format_bytes(resident_memory())}"]
+        for subsystem, structures in memory_tracker.report().items():
+            total = sum(s.bytes for s in structures)
+            lines.append(f"**{subsystem}** (~{format_bytes(total)})")
+            for s in structures:
+                bound = f" / {s.bound}" if s.bound is not None else ""
+                flag = " ⚠️" if s.over else ""
+                lines.append(f"**-** `{s.name}`: {s.items}{bound} entries, ~{format_bytes(s.bytes)}{flag}")
+        await ctx.send("\n".join(lines)[:2000])
+
+    @memory_group.command(name="snapshot")
+    async def memory_snapshot(self, ctx: commands.Context):
+        """Diff a tracemalloc snapshot against the previous one (the first call starts tracing)."""
+        diff = await asyncio.to_thread(memory_tracker.snapshot_diff, PROFILE_TOP_N)
+        if diff is None:
+            await ctx.send("tracemalloc started and baseline taken. Run `!memory snapshot` again later to see growth; "
+                           "`!memory stop` ends tracing.")
+            return
+        lines = ["**Allocation growth since the last snapshot:**"]
+        for stat in diff:
+            frame = stat.traceback[0]
+            lines.append(
+                f"`{shorten(f'{frame.filename}:{frame.lineno}', 60)}` "
+                f"{'+' if stat.size_diff > 0 else ''}{format_bytes(stat.size_diff)} "
+                f"({stat.count_diff:+d} blocks), now {format_bytes(stat.size)}"
+            )
+        await ctx.send("\n".join(lines)[:2000])
+
+    @memory_group.command(name="stop")
+    async def memory_stop(self, ctx: commands.Context):
+        memory_tracker.stop_tracing()
+        await ctx.send("tracemalloc stopped.")
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(DiagnosticsCog(bot))
@@ -1,11 +1,36 @@
 # cogs/llm_utils.py
 import aiohttp
 import json
+import os
+import time
+
+from .metrics import metrics
+from .tracing import span
+
+# OpenAI-compatible chat completions endpoint of the local LLM server
+LLM_API_URL = os.getenv("LLM_API_URL", "http://localhost:1234/v1/chat/completions")
+
+LLM_REQUEST_LATENCY = metrics.histogram(
+    "llm_request_seconds", "Chat completion round trip to the local LLM", ("model", "status")
+)
+LLM_TOKENS_PER_SECOND = metrics.histogram(
+    "llm_tokens_per_second", "Completion tokens per second of request time", ("model",),
+    buckets=(1, 2.5, 5, 10, 20, 40, 80, 160, 320)
+)
+LLM_COMPLETION_TOKENS = metrics.counter("llm_completion_tokens_total", "Completion tokens generated", ("model",))
+
+def parse_llm_response(data: dict):
+    """
+    Extract the JSON object the model was asked to reply with from a chat completion.
+    Raises KeyError / json.JSONDecodeError on malformed responses.
+    """
+    raw_content = data["choices"][0]["message"]["content"]
+    return json.loads(raw_content)
 
 async def call_local_llm(
     messages,
     default_model="qwen2.5-14b-instruct",
-    url="http://localhost:1234/v1/chat/completions",
+    url=LLM_API_URL,
     model_override=None
 ):
     """
@@ -23,22 +48,38 @@ async def call_local_llm(
         "top_p": 0.95
     }
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(url, headers=headers, json=payload, timeout=120) as response:
-                if response.status != 200:
-                    return {
-                        "message": f"[ERROR] HTTP {response.status} from LLM server.",
-                        "tool_calls": []
-                    }
-                data = await response.json()
-                raw_content = data["choices"][0]["message"]["content"]
-                parsed = json.loads(raw_content)
-                return parsed
-        except aiohttp.ClientError as e:
-            return {"message": f"[ERROR] ClientError: {str(e)}", "tool_calls": []}
-        except (KeyError, json.JSONDecodeError) as e:
-            return {"message": f"[ERROR] Parsing LLM response: {str(e)}", "tool_calls": []}
+    async with span("call_local_llm", model=chosen_model, messages=len(messages)) as llm_span:
+        start = time.perf_counter()
+        status = "error"
+        async with aiohttp.ClientSession() as session:
+            try:
+                async with session.post(url, headers=headers, json=payload, timeout=120) as response:
+                    if response.status != 200:
+                        status = f"http_{response.status}"
+                        return {
+                            "message": f"[ERROR] HTTP {response.status} from LLM server.",
+                            "tool_calls": []
+                        }
+                    data = await response.json()
+                    parsed = parse_llm_response(data)
+                    status = "ok"
+                    tokens = (data.get("usage") or {}).get("completion_tokens")
+                    if tokens:
+                        LLM_COMPLETION_TOKENS.inc(tokens, model=chosen_model)
+                        LLM_TOKENS_PER_SECOND.observe(tokens / (time.perf_counter() - start), model=chosen_model)
+                    return parsed
+            except aiohttp.ClientError as e:
+                status = "client_error"
+                return {"message": f"[ERROR] ClientError: {str(e)}", "tool_calls": []}
+            except (KeyError, json.JSONDecodeError) as e:
+                status = "parse_error"
+                return {"message": f"[ERROR] Parsing LLM response: {str(e)}", "tool_calls": []}
+            finally:
+                LLM_REQUEST_LATENCY.observe(time.perf_counter() - start, model=chosen_model, status=status)
+                if llm_span:
+                    llm_span.set(status=status)
+                    if status != "ok":
+                        llm_span.status = "error"
 
 async def setup(bot):
     pass
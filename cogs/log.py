@@ -0,0 +1,187 @@
+# cogs/log.py
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+# Default level for every subsystem logger ("bot.<subsystem>")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Per-subsystem overrides, e.g. "music=DEBUG,tts=WARNING,discord=INFO"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# "text" for human-readable lines, "json" for one JSON object per line
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+# Optional file that receives the same records as stderr
+LOG_FILE = os.getenv("LOG_FILE", "")
+# Share of DEBUG records kept (1.0 keeps all); WARNING and above are never sampled
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+# Messages longer than this are cut, so payload dumps can't flood the output
+LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "2000"))
+# Records buffered for the writer thread before new ones are dropped
+LOG_QUEUE_SIZE = 10000
+
+ROOT_LOGGER = "bot"
+
+# Per-task fields (guild_id, user_id, command) attached to every record
+log_context = contextvars.ContextVar("log_context", default={})
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+def bind_log_context(**fields):
+    """Attach fields to all records logged from the current task (and tasks it spawns)."""
+    merged = dict(log_context.get())
+    merged.update({k: v for k, v in fields.items() if v is not None})
+    return log_context.set(merged)
+
+
+def _request_id():
+    # The trace ID of the active span doubles as the request ID
+    from .tracing import current_span
+    span = current_span.get()
+    return span.trace_id if span else None
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Runs on the logging thread (often the event loop): samples DEBUG records,
+    renders and truncates the message, captures the task's context fields,
+    and hands the record to the writer thread without ever blocking.
+    Formatting and I/O happen in the QueueListener thread.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def prepare(self, record):
+        message = record.getMessage()
+        if len(message) > LOG_MAX_MESSAGE_CHARS:
+            message = message[:LOG_MAX_MESSAGE_CHARS] + f"... [{len(message) - LOG_MAX_MESSAGE_CHARS} chars cut]"
+        if record.exc_info:
+            # Tracebacks can't cross threads as live objects; render them here
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.msg = message
+        record.args = None
+        record.context = log_context.get()
+        record.request_id = _request_id()
+        return record
+
+    def emit(self, record):
+        if record.levelno <= logging.DEBUG and LOG_DEBUG_SAMPLE_RATE < 1.0:
+            if random.random() >= LOG_DEBUG_SAMPLE_RATE:
+                self.sampled_out += 1
+                return
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "context", None) or {})
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    def format(self, record):
+        line = super().format(record)
+        context = dict(getattr(record, "context", None) or {})
+        if getattr(record, "request_id", None):
+            context["request_id"] = record.request_id[:8]
+        if context:
+            line += " " + " ".join(f"{k}={v}" for k, v in context.items())
+        return line
+
+
+class LoggingPipeline:
+    """Owns the queue handler and the writer thread (QueueListener)."""
+    def __init__(self):
+        self.handler = None
+        self.listener = None
+
+    def setup(self):
+        if self.listener is not None:
+            return
+        formatter = JsonFormatter() if LOG_FORMAT == "json" else TextFormatter()
+        outputs = [logging.StreamHandler(sys.stderr)]
+        if LOG_FILE:
+            outputs.append(logging.handlers.WatchedFileHandler(LOG_FILE, encoding="utf-8"))
+        for output in outputs:
+            output.setFormatter(formatter)
+
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        self.handler = NonBlockingQueueHandler(log_queue)
+        self.listener = logging.handlers.QueueListener(log_queue, *outputs, respect_handler_level=False)
+        self.listener.start()
+
+        bot_logger = logging.getLogger(ROOT_LOGGER)
+        bot_logger.setLevel(LOG_LEVEL.upper())
+        bot_logger.addHandler(self.handler)
+        bot_logger.propagate = False
+
+        # discord.py's own logging goes through the same queue
+        discord_logger = logging.getLogger("discord")
+        discord_logger.setLevel(logging.WARNING)
+        discord_logger.addHandler(self.handler)
+        discord_logger.propagate = False
+
+        for name, level in parse_levels(LOG_LEVELS):
+            logger = logging.getLogger(name if name.startswith("discord") else f"{ROOT_LOGGER}.{name}")
+            logger.setLevel(level)
+
+    def shutdown(self):
+        """Flush queued records and stop the writer thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self) -> dict:
+        if self.handler is None:
+            return {}
+        return {
+            "queued": self.handler.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "sampled_out": self.handler.sampled_out,
+        }
+
+
+def parse_levels(spec: str):
+    levels = []
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        name, level = (p.strip() for p in part.split("=", 1))
+        if name and level:
+            levels.append((name, level.upper()))
+    return levels
+
+
+# Create a global pipeline; main.py calls logging_pipeline.setup() at startup
+logging_pipeline = LoggingPipeline()
+
+async def setup(bot):
+    pass
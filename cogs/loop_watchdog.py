@@ -0,0 +1,170 @@
+# cogs/loop_watchdog.py
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+
+from .metrics import metrics, EVENT_LOOP_LAG
+from .log import get_logger
+
+log = get_logger("watchdog")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# How often the loop heartbeat fires, in seconds
+LOOP_HEARTBEAT_INTERVAL = 0.1
+# Lag beyond the heartbeat interval that counts as a blocked loop, in seconds
+LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.25"))
+# Frames of the captured stack printed for a new offender
+STACK_PRINT_DEPTH = 12
+
+LOOP_BLOCKS = metrics.counter("event_loop_blocks_total", "Event loop stalls by offending call site", ("offender",))
+LOOP_BLOCK_DURATION = metrics.histogram(
+    "event_loop_block_seconds", "Duration of event loop stalls past the threshold",
+    buckets=(0.25, 0.5, 1, 2, 5, 10, 30, 60)
+)
+
+
+class BlockRecord:
+    __slots__ = ("offender", "task", "stack", "count", "total", "worst")
+
+    def __init__(self, offender, task, stack):
+        self.offender = offender
+        self.task = task
+        self.stack = stack
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+
+class LoopWatchdog:
+    """
+    Detects synchronous work that stalls the event loop.
+    A heartbeat coroutine stamps the time every LOOP_HEARTBEAT_INTERVAL and
+    records loop lag. A daemon thread checks the stamp; once the loop has
+    missed its heartbeat by LOOP_BLOCK_THRESHOLD, it grabs the loop thread's
+    current stack (sys._current_frames) and the running task, attributes the
+    stall to the innermost frame in this repo, and counts it per offender.
+    """
+    def __init__(self, threshold=LOOP_BLOCK_THRESHOLD, interval=LOOP_HEARTBEAT_INTERVAL):
+        self.threshold = threshold
+        self.interval = interval
+        self.offenders = {}        # offender -> BlockRecord
+        self.stalls = 0
+        self.last_lag = 0.0
+        self._last_beat = time.monotonic()
+        self._loop = None
+        self._loop_thread_id = None
+        self._beat_task = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._stall_beat = None    # heartbeat stamp of the stall being tracked
+        self._stall_record = None
+
+    def start(self):
+        """Start watching the running loop (call from a coroutine)."""
+        if self._beat_task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._beat_task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._beat_task:
+            self._beat_task.cancel()
+            self._beat_task = None
+        self._thread = None
+
+    async def _heartbeat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._last_beat = time.monotonic()
+            self.last_lag = max(0.0, self._last_beat - before - self.interval)
+            EVENT_LOOP_LAG.observe(self.last_lag)
+
+    # ----------- Watchdog thread -----------
+    def _watch(self):
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._last_beat
+            overdue = time.monotonic() - beat - self.interval
+            if overdue >= self.threshold:
+                if self._stall_beat != beat:
+                    self._stall_beat = beat
+                    self._stall_record = self._capture()
+            elif self._stall_beat is not None and beat != self._stall_beat:
+                self._finish_stall(beat - self._stall_beat - self.interval)
+
+    def _capture(self):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame)
+        offender = describe_offender(stack)
+        task = asyncio.current_task(self._loop)
+        task_desc = None
+        if task is not None:
+            coro = task.get_coro()
+            task_desc = f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+        record = self.offenders.get(offender)
+        is_new = record is None
+        if is_new:
+            record = self.offenders[offender] = BlockRecord(offender, task_desc, stack)
+        record.count += 1
+        self.stalls += 1
+        LOOP_BLOCKS.inc(offender=offender)
+
+        log.warning("Event loop blocked >%.2fs in %s (task: %s, seen %dx)",
+                    self.threshold, offender, task_desc or "callback", record.count)
+        if is_new:
+            log.warning("Stack of new offender %s:\n%s", offender,
+                        "".join(traceback.format_list(stack[-STACK_PRINT_DEPTH:])).rstrip())
+        return record
+
+    def _finish_stall(self, duration):
+        record = self._stall_record
+        self._stall_beat = None
+        self._stall_record = None
+        if record is None:
+            return
+        record.total += duration
+        record.worst = max(record.worst, duration)
+        LOOP_BLOCK_DURATION.observe(duration)
+        log.warning("Event loop stall in %s lasted %.2fs", record.offender, duration)
+
+    def report(self, limit=10):
+        """Offenders sorted by total blocked time, worst first."""
+        records = sorted(self.offenders.values(), key=lambda r: (r.total, r.count), reverse=True)
+        return records[:limit]
+
+
+def describe_offender(stack) -> str:
+    """`path:line in func` of the innermost frame in this repo (or the innermost frame overall)."""
+    this_file = os.path.abspath(__file__)
+    chosen = stack[-1] if stack else None
+    for entry in reversed(stack):
+        path = os.path.abspath(entry.filename)
+        if path.startswith(BASE_DIR) and path != this_file and "site-packages" not in path:
+            chosen = entry
+            break
+    if chosen is None:
+        return "unknown"
+    path = os.path.abspath(chosen.filename)
+    if path.startswith(BASE_DIR):
+        path = os.path.relpath(path, BASE_DIR)
+    return f"{path}:{chosen.lineno} in {chosen.name}"
+
+
+# Create a global watchdog; started by the metrics cog
+loop_watchdog = LoopWatchdog()
+
+async def setup(bot):
+    pass
@@ -0,0 +1,141 @@
+# cogs/member_cache.py
+
+import asyncio
+import os
+import time
+
+import discord
+
+from .metrics import metrics
+from .log import get_logger
+
+log = get_logger("members")
+
+# Gateway intents: a base ("default", "all" or "none") plus flags to add or "-flag" to drop.
+# Presences are the heaviest intent and no feature uses them, so they stay off by default.
+BOT_INTENTS = os.getenv("BOT_INTENTS", "default,members,message_content")
+# Which members discord.py keeps cached: "intents" (everything the intents allow),
+# "all", "none", or a list of MemberCacheFlags such as "voice,joined"
+MEMBER_CACHE = os.getenv("MEMBER_CACHE", "intents")
+# Request every guild's full member list at startup; otherwise guilds are chunked on first need
+CHUNK_GUILDS_AT_STARTUP = os.getenv("CHUNK_GUILDS_AT_STARTUP", "false").lower() in ("1", "true", "yes")
+
+INTENT_BASES = {"default": discord.Intents.default, "all": discord.Intents.all, "none": discord.Intents.none}
+
+GUILD_CHUNK_LATENCY = metrics.histogram("guild_chunk_seconds", "Time to chunk one guild's member list on first need")
+MEMBER_FETCHES = metrics.counter(
+    "member_fetches_total", "Member lookups that missed the cache and went to Discord", ("kind", "result")
+)
+
+# In-flight lazy chunk requests: {guild_id: asyncio.Task}
+_chunk_tasks = {}
+
+
+def build_intents(spec: str = BOT_INTENTS) -> discord.Intents:
+    parts = [p.strip() for p in spec.split(",") if p.strip()]
+    base = parts.pop(0) if parts and parts[0] in INTENT_BASES else "default"
+    intents = INTENT_BASES[base]()
+    for part in parts:
+        name = part.lstrip("+-")
+        if name not in discord.Intents.VALID_FLAGS:
+            log.warning(f"Ignoring unknown intent '{name}' in BOT_INTENTS")
+            continue
+        setattr(intents, name, not part.startswith("-"))
+    return intents
+
+
+def build_member_cache_flags(intents: discord.Intents, spec: str = MEMBER_CACHE) -> discord.MemberCacheFlags:
+    spec = spec.strip().lower()
+    if spec == "intents":
+        return discord.MemberCacheFlags.from_intents(intents)
+    if spec == "all":
+        flags = discord.MemberCacheFlags.all()
+    elif spec == "none":
+        flags = discord.MemberCacheFlags.none()
+    else:
+        flags = discord.MemberCacheFlags.none()
+        for name in (p.strip() for p in spec.split(",") if p.strip()):
+            if name not in discord.MemberCacheFlags.VALID_FLAGS:
+                log.warning(f"Ignoring unknown member cache flag '{name}' in MEMBER_CACHE")
+                continue
+            setattr(flags, name, True)
+    # discord.py rejects flags the intents can't feed
+    if flags.joined and not intents.members:
+        log.warning("MEMBER_CACHE 'joined' needs the members intent; disabling it")
+        flags.joined = False
+    if flags.voice and not intents.voice_states:
+        log.warning("MEMBER_CACHE 'voice' needs the voice_states intent; disabling it")
+        flags.voice = False
+    return flags
+
+
+###################################################
+#   On-demand member lookups
+###################################################
+async def ensure_chunked(guild: discord.Guild) -> bool:
+    """
+    Load a guild's full member list the first time a feature needs it
+    (instead of for every guild at startup). Concurrent callers share one
+    request. Returns False when the members intent is off.
+    """
+    if guild.chunked:
+        return True
+    task = _chunk_tasks.get(guild.id)
+    if task is None:
+        async def _chunk():
+            start = time.perf_counter()
+            try:
+                await guild.chunk(cache=True)
+            finally:
+                _chunk_tasks.pop(guild.id, None)
+            GUILD_CHUNK_LATENCY.observe(time.perf_counter() - start)
+            log.debug("Chunked %d members of guild %s in %.2fs",
+                      guild.member_count or 0, guild.id, time.perf_counter() - start)
+
+        task = _chunk_tasks[guild.id] = asyncio.create_task(_chunk())
+    try:
+        await asyncio.shield(task)
+    except (discord.ClientException, asyncio.TimeoutError) as e:
+        log.debug("Not chunking guild %s: %s", guild.id, e)
+        return False
+    return guild.chunked
+
+
+async def get_or_fetch_member(guild: discord.Guild, member_id: int):
+    """guild.get_member(), falling back to a REST fetch when the member isn't cached."""
+    member = guild.get_member(member_id)
+    if member is not None:
+        return member
+    try:
+        member = await guild.fetch_member(member_id)
+        MEMBER_FETCHES.inc(kind="id", result="found")
+        return member
+    except discord.NotFound:
+        MEMBER_FETCHES.inc(kind="id", result="missing")
+    except discord.HTTPException as e:
+        MEMBER_FETCHES.inc(kind="id", result="error")
+        log.warning(f"Could not fetch member {member_id} in guild {guild.id}: {e}")
+    return None
+
+
+async def query_member_by_name(guild: discord.Guild, name: str):
+    """
+    Look a member up by exact name or nickname over the gateway (no full
+    member list needed). Used when the cache doesn't have them.
+    """
+    name_lower = name.strip().lower()
+    try:
+        candidates = await guild.query_members(query=name.strip(), limit=10, cache=True)
+    except (asyncio.TimeoutError, discord.ClientException) as e:
+        MEMBER_FETCHES.inc(kind="name", result="error")
+        log.warning(f"Could not query members named '{name}' in guild {guild.id}: {e}")
+        return None
+    for m in candidates:
+        if m.name.lower() == name_lower or (m.nick and m.nick.lower() == name_lower):
+            MEMBER_FETCHES.inc(kind="name", result="found")
+            return m
+    MEMBER_FETCHES.inc(kind="name", result="missing")
+    return None
+
+async def setup(bot):
+    pass
@@ -0,0 +1,225 @@
+# cogs/memory.py
+
+import os
+import sys
+import tracemalloc
+from collections import deque
+from collections.abc import Mapping
+from itertools import islice
+
+from .metrics import metrics
+from .log import get_logger
+
+log = get_logger("diagnostics")
+
+# Seconds between bound checks / gauge refreshes
+MEMORY_CHECK_INTERVAL = float(os.getenv("MEMORY_CHECK_INTERVAL", "60"))
+# Item-count bounds per structure, e.g. "conversation.private_sessions=5000,discord.members=200000"
+MEMORY_BOUNDS = os.getenv("MEMORY_BOUNDS", "")
+# Frames kept per tracemalloc trace (more frames = better attribution, more overhead)
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "10"))
+# Items measured per container when estimating sizes; the rest is extrapolated
+SIZE_SAMPLE = 10
+# How deep the size estimate follows references
+SIZE_DEPTH = 3
+
+# Bounds used when MEMORY_BOUNDS doesn't name a structure
+DEFAULT_BOUNDS = {
+    "conversation.private_sessions": 10000,
+    "music.queued_tracks": 50000,
+    "music.nowplaying_message": 5000,
+    "tts.queued_clips": 1000,
+    "cache.search_meta": 5000,
+    "cache.search_streams": 5000,
+    "tracing.open_traces": 1000,
+    "discord.members": 500000,
+    "discord.messages": 20000,
+}
+
+STRUCTURE_ITEMS = metrics.gauge("memory_structure_items", "Entries held by a tracked in-memory structure", ("structure",))
+STRUCTURE_BYTES = metrics.gauge(
+    "memory_structure_bytes", "Sampled size estimate of a tracked in-memory structure", ("structure",)
+)
+BOUND_EXCEEDED = metrics.counter(
+    "memory_bound_exceeded_total", "Times a tracked structure grew past its configured bound", ("structure",)
+)
+
+
+def resident_memory() -> int:
+    """Current RSS in bytes (Linux), falling back to the peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def approx_size(obj, sample=SIZE_SAMPLE, depth=SIZE_DEPTH) -> int:
+    """
+    Estimate the bytes reachable from `obj`: sys.getsizeof of each object,
+    following containers, __dict__ and __slots__ up to `depth` levels. Only
+    the first `sample` items of a container are measured and their average is
+    extrapolated, so the cost stays bounded on huge structures. Objects
+    reached twice are counted once.
+    """
+    seen = set()
+
+    def size(o, level):
+        if id(o) in seen:
+            return 0
+        seen.add(id(o))
+        total = sys.getsizeof(o, 0)
+        if level >= depth or isinstance(o, (str, bytes, int, float, bool, type(None))):
+            return total
+        # islice, not list(): copying a 100k-entry cache just to sample it would cost O(n)
+        if isinstance(o, Mapping):  # includes WeakValueDictionary (discord.py's user cache)
+            n = len(o)
+            measured = [size(k, level + 1) + size(v, level + 1) for k, v in islice(o.items(), sample)]
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            n = len(o)
+            measured = [size(c, level + 1) for c in islice(o, sample)]
+        else:
+            attrs = []
+            if hasattr(o, "__dict__"):
+                attrs.append(vars(o))
+            for cls in type(o).__mro__:
+                slots = getattr(cls, "__slots__", ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    if slot in ("__dict__", "__weakref__"):
+                        continue
+                    value = getattr(o, slot, None)
+                    if value is not None:
+                        attrs.append(value)
+            return total + sum(size(a, level + 1) for a in attrs[:sample * 4])
+        if measured:
+            total += int(sum(measured) / len(measured) * n)
+        return total
+
+    try:
+        return size(obj, 0)
+    except RuntimeError:
+        return 0  # mutated mid-walk; the next check will measure it
+
+
+class TrackedStructure:
+    __slots__ = ("name", "get", "count", "bound", "items", "bytes", "over")
+
+    def __init__(self, name, get, count, bound):
+        self.name = name
+        self.get = get
+        self.count = count
+        self.bound = bound
+        self.items = 0
+        self.bytes = 0
+        self.over = False
+
+    @property
+    def subsystem(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+class MemoryTracker:
+    """
+    Per-subsystem memory accounting. Owners register long-lived structures
+    with track(); check() refreshes item counts and sampled size estimates
+    into the memory_structure_* gauges and warns once whenever a structure
+    crosses its bound (again after it has dropped back under it).
+    On demand, tracemalloc snapshots are diffed against the previous one.
+    """
+    def __init__(self):
+        self.structures = {}
+        self.bounds = dict(DEFAULT_BOUNDS)
+        self.bounds.update(parse_bounds(MEMORY_BOUNDS))
+        self.last_snapshot = None
+
+    def track(self, name: str, get, count=None):
+        """
+        Track `get()` (a container) as `name` ("subsystem.structure").
+        `count()` overrides len(get()) for nested structures. Registering a
+        name again replaces it, so reloaded cogs point at their new state.
+        """
+        self.structures[name] = TrackedStructure(name, get, count, self.bounds.get(name))
+
+    def untrack(self, name: str):
+        self.structures.pop(name, None)
+        STRUCTURE_ITEMS.remove(structure=name)
+        STRUCTURE_BYTES.remove(structure=name)
+
+    def check(self, measure_bytes=True):
+        for s in list(self.structures.values()):
+            try:
+                container = s.get()
+                s.items = s.count() if s.count else len(container)
+                if measure_bytes:
+                    s.bytes = approx_size(container)
+            except Exception as e:
+                log.warning(f"Could not measure {s.name}: {e}")
+                continue
+            STRUCTURE_ITEMS.set(s.items, structure=s.name)
+            if measure_bytes:
+                STRUCTURE_BYTES.set(s.bytes, structure=s.name)
+            if s.bound is None:
+                continue
+            if s.items > s.bound and not s.over:
+                s.over = True
+                BOUND_EXCEEDED.inc(structure=s.name)
+                log.warning("%s holds %d entries, past its bound of %d", s.name, s.items, s.bound)
+            elif s.items <= s.bound * 0.9:
+                s.over = False
+
+    def report(self):
+        """{subsystem: [TrackedStructure, ...]} sorted by estimated size, largest first."""
+        by_subsystem = {}
+        for s in sorted(self.structures.values(), key=lambda s: s.bytes, reverse=True):
+            by_subsystem.setdefault(s.subsystem, []).append(s)
+        return by_subsystem
+
+    # ----------- tracemalloc -----------
+    def snapshot_diff(self, limit=10):
+        """
+        Take a tracemalloc snapshot and return the top allocation sites by
+        growth since the previous one. The first call starts tracing and only
+        records the baseline (returns None). Blocking; run via asyncio.to_thread.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.last_snapshot = None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        previous, self.last_snapshot = self.last_snapshot, snapshot
+        if previous is None:
+            return None
+        return snapshot.compare_to(previous, "lineno")[:limit]
+
+    def stop_tracing(self):
+        self.last_snapshot = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def parse_bounds(spec: str) -> dict:
+    bounds = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        name, value = name.strip(), value.strip()
+        if name and value:
+            try:
+                bounds[name] = int(value)
+            except ValueError:
+                log.warning(f"Ignoring memory bound '{part.strip()}': not an integer")
+    return bounds
+
+
+# Create a global tracker; structures register themselves, the diagnostics cog runs the checks
+memory_tracker = MemoryTracker()
+
+metrics.gauge("process_resident_memory_bytes", "Resident memory of the bot process").set_function(resident_memory)
+
+async def setup(bot):
+    pass
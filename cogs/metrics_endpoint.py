@@ -0,0 +1,81 @@
+# cogs/metrics_endpoint.py
+
+import asyncio
+import os
+
+from aiohttp import web
+from discord.ext import commands
+
+from .metrics import metrics
+from .loop_watchdog import loop_watchdog
+from .log import get_logger, logging_pipeline
+
+log = get_logger("metrics")
+
+# Local address for the Prometheus text endpoint; METRICS_PORT=0 disables it
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsCog(commands.Cog):
+    """
+    Serves the registry on http://METRICS_HOST:METRICS_PORT/metrics and runs
+    the event-loop watchdog (lag samples plus blocking-call detection).
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._runner = None
+        metrics.gauge("event_loop_lag_last_seconds", "Most recent event loop lag sample").set_function(
+            lambda: loop_watchdog.last_lag
+        )
+        metrics.gauge("log_records_dropped", "Log records dropped because the log queue was full").set_function(
+            lambda: logging_pipeline.stats().get("dropped", 0)
+        )
+
+    async def cog_load(self):
+        loop_watchdog.start()
+        if METRICS_PORT:
+            app = web.Application()
+            app.router.add_get("/metrics", self.handle_metrics)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            try:
+                await web.TCPSite(self._runner, METRICS_HOST, METRICS_PORT).start()
+                log.debug(f"Metrics served on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+            except OSError as e:
+                log.error(f"Could not start metrics endpoint on port {METRICS_PORT}: {e}")
+                await self._runner.cleanup()
+                self._runner = None
+
+    async def cog_unload(self):
+        loop_watchdog.stop()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_metrics(self, request: web.Request):
+        body = await asyncio.to_thread(metrics.render)
+        return web.Response(body=body.encode("utf-8"), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+    @commands.command(name="loopstats")
+    @commands.is_owner()
+    async def loopstats_command(self, ctx: commands.Context):
+        """Show the call sites that blocked the event loop, worst first."""
+        records = loop_watchdog.report()
+        lines = [
+            f"**Event loop:** last lag {loop_watchdog.last_lag * 1000:.1f} ms, "
+            f"{loop_watchdog.stalls} stalls over {loop_watchdog.threshold:.2f}s"
+        ]
+        for r in records:
+            lines.append(
+                f"**-** `{r.offender}` — {r.count}x, total {r.total:.2f}s, worst {r.worst:.2f}s"
+                + (f" (task {r.task})" if r.task else "")
+            )
+        if not records:
+            lines.append("No blocking calls detected.")
+        await ctx.send("\n".join(lines)[:2000])
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(MetricsCog(bot))
@@ -3,9 +3,33 @@
 import discord
 from discord.ext import commands
 import asyncio
-import yt_dlp
+import os
+import threading
+from collections import deque
 import random
 import re
+import time
+
+from .ytdl_pool import ytdl_pool
+from .search_cache import search_cache
+from .audio_cache import audio_cache
+from .music_queue import GuildQueue, QUEUE_PAGE_SIZE, save_queue_state, load_all_queue_states
+from .voice_mixer import get_mixer, remove_mixer
+from .memory import memory_tracker
+from .sharding import owns_guild
+from .startup import startup
+from .shutdown import graceful_shutdown
+from .audio_supervisor import (
+    audio_supervisor,
+    FFmpegCapacityError,
+    is_network_source,
+    FFMPEG_LOGLEVEL,
+    FFMPEG_MAX_RESTARTS,
+    RECONNECT_OPTIONS,
+)
+from .log import get_logger
+
+log = get_logger("music")
 
 ###################################################
 #  Search Filtering Settings
@@ -13,93 +37,440 @@ import re
 SEARCH_SUFFIX = "music lyrics audio"
 SEARCH_EXCLUDE = ["interview", "podcast", "trailer"]
 
+###################################################
+#  Queue Resolution Settings
+###################################################
+# Direct googlevideo URLs are signed and expire; re-resolve anything older than this
+STREAM_URL_TTL = 60 * 60
+# How many upcoming tracks get their stream URL resolved ahead of time
+PREFETCH_AHEAD = 2
+# Seconds to wait after a queue change before writing its snapshot to disk
+QUEUE_SAVE_DELAY = 2
+# Keys kept from yt-dlp info dicts (the full dict holds every format and is large)
+TRACK_INFO_KEYS = ("id", "title", "url", "webpage_url", "thumbnail", "duration", "acodec", "ext", "http_headers", "resolved_at")
+
+###################################################
+#  Playback Settings
+###################################################
+# "opus" (default): FFmpeg encodes Opus itself (or copies it through); "pcm": legacy in-process path
+MUSIC_PLAYBACK_MODE = os.getenv("MUSIC_PLAYBACK_MODE", "opus").lower()
+# Volume applied by FFmpeg; at 1.0 Opus streams are passed through without re-encoding
+MUSIC_VOLUME = float(os.getenv("MUSIC_VOLUME", "0.5"))
+# Duration of one audio frame as sent by discord.py
+FRAME_SECONDS = 0.02
+# Seconds before the current track ends at which the next one is pre-warmed
+PREWARM_LEAD_SECONDS = 15
+# Frames read ahead when pre-warming (15 x 20 ms = 300 ms of audio)
+PREWARM_FRAMES = 15
+# Seconds of already-played audio kept per track for instant rewinds
+SEEK_BUFFER_SECONDS = 60
+
+###################################################
+#  Now Playing Panel Settings
+###################################################
+# Requests within this window are coalesced into one message edit
+NP_UPDATE_DEBOUNCE = 1.0
+# How often the progress bar is refreshed while a track plays
+NP_PROGRESS_INTERVAL = 15
+NP_BAR_WIDTH = 12
+
+###################################################
+#  Remix Settings
+###################################################
+REMIX_RESULTS_PER_ARTIST = 10
+REMIX_MAX_TRACKS = 50
+# Max artist searches running at once (each holds an extractor pool worker)
+REMIX_SEARCH_CONCURRENCY = 3
+
 
 def is_url(string: str) -> bool:
     pattern = re.compile(r'^(http|https)://', re.IGNORECASE)
     return bool(pattern.match(string))
 
 
+def build_search_input(query: str) -> str:
+    """If query is a URL, use it. Otherwise, build a YouTube search (with music bias)."""
+    if is_url(query):
+        return query
+    # Exclude certain words
+    cleaned_query = " ".join(
+        word for word in query.split()
+        if all(x.lower() not in word.lower() for x in SEARCH_EXCLUDE)
+    )
+    # Append extra terms for music
+    cleaned_query = f"{cleaned_query} {SEARCH_SUFFIX}".strip()
+    # We'll pull up to 10 search results
+    return f"ytsearch10:{cleaned_query}"
+
+
+def slim_info(data: dict) -> dict:
+    return {key: data[key] for key in TRACK_INFO_KEYS if key in data}
+
+
+async def extract_track_info(query: str) -> dict:
+    """
+    Resolve a search/URL to the first playable entry's (slimmed) info dict.
+    Repeat queries are served from the search cache: a fresh stream URL is
+    returned as-is, and a metadata-only hit re-resolves the known video
+    directly instead of running the search again.
+    """
+    cached = await search_cache.get(query)
+    if cached and cached.get("url"):
+        return cached
+    if cached and cached.get("webpage_url"):
+        search_input = cached["webpage_url"]
+    else:
+        search_input = build_search_input(query)
+
+    data = await ytdl_pool.extract_info(search_input)
+
+    if not data:
+        raise ValueError("No data returned from YouTube search.")
+    if 'entries' in data:
+        entries = [e for e in data['entries'] if e]
+        if not entries:
+            raise ValueError("No valid entries found.")
+        data = entries[0]
+
+    if 'url' not in data:
+        raise ValueError("No valid URL found in YouTube data.")
+    info = slim_info(data)
+    info["resolved_at"] = time.time()
+    await search_cache.put(query, info)
+    return info
+
+
+###################################################
+#   QueuedTrack Class
+###################################################
+class QueuedTrack:
+    """
+    Lightweight queue entry holding only track metadata.
+    The direct stream URL is resolved just-in-time (or prefetched shortly
+    before playback), so queued tracks never carry an expired signed URL.
+    """
+    def __init__(self, title, webpage_url, *, thumbnail="", video_id=None, duration=None, info=None):
+        self.title = title or "Unknown Title"
+        self.webpage_url = webpage_url or ""
+        self.thumbnail = thumbnail or ""
+        self.video_id = video_id
+        self.duration = duration
+        # Where playback should start (set when resuming a saved queue)
+        self.start_offset = 0
+        self.info = info
+        self.resolved_at = info.get("resolved_at", time.time()) if info else None
+        self._resolving = None
+
+    @classmethod
+    def from_info(cls, data: dict):
+        info = slim_info(data) if data.get("url") else None
+        if info and "resolved_at" not in info:
+            info["resolved_at"] = time.time()
+        return cls(
+            data.get("title"),
+            data.get("webpage_url"),
+            thumbnail=data.get("thumbnail"),
+            video_id=data.get("id"),
+            duration=data.get("duration"),
+            info=info
+        )
+
+    def to_dict(self) -> dict:
+        """Metadata-only snapshot for queue persistence (no stream URL)."""
+        return {
+            "title": self.title,
+            "webpage_url": self.webpage_url,
+            "thumbnail": self.thumbnail,
+            "video_id": self.video_id,
+            "duration": self.duration,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            data.get("title"),
+            data.get("webpage_url"),
+            thumbnail=data.get("thumbnail"),
+            video_id=data.get("video_id"),
+            duration=data.get("duration")
+        )
+
+    def is_fresh(self) -> bool:
+        return (
+            self.info is not None
+            and self.resolved_at is not None
+            and time.time() - self.resolved_at < STREAM_URL_TTL
+        )
+
+    def invalidate(self):
+        self.info = None
+        self.resolved_at = None
+
+    async def _fetch_info(self):
+        info = await extract_track_info(self.webpage_url)
+        self.info = info
+        self.resolved_at = info.get("resolved_at", time.time())
+        self.title = info.get("title") or self.title
+        self.thumbnail = info.get("thumbnail") or self.thumbnail
+        self.video_id = info.get("id") or self.video_id
+        self.duration = info.get("duration") or self.duration
+        return info
+
+    def local_info(self):
+        """Info pointing at the on-disk audio cache, or None if the track isn't cached."""
+        cached = audio_cache.lookup(self.video_id)
+        if not cached:
+            return None
+        return {
+            "id": self.video_id,
+            "title": self.title,
+            "webpage_url": self.webpage_url,
+            "thumbnail": self.thumbnail,
+            "duration": self.duration,
+            "url": cached["file"],
+            "acodec": cached.get("acodec"),
+        }
+
+    async def resolve(self) -> dict:
+        """Return fresh info with a direct stream URL, re-resolving if needed."""
+        if self.is_fresh():
+            return self.info
+        if self._resolving is None or self._resolving.done():
+            self._resolving = asyncio.ensure_future(self._fetch_info())
+        return await asyncio.shield(self._resolving)
+
+    def prefetch(self):
+        """Start resolving in the background; errors surface on resolve()."""
+        if self.is_fresh() or audio_cache.lookup(self.video_id) or (self._resolving and not self._resolving.done()):
+            return
+        self._resolving = asyncio.ensure_future(self._fetch_info())
+        self._resolving.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
 ###################################################
-#   YTDLSource Class
+#   Track Sources
 ###################################################
-class YTDLSource(discord.PCMVolumeTransformer):
+class TrackSource:
     """
-    Handles YT-DL extraction and PCM transformation.
+    Mixin holding track metadata for any playable music source.
+    Subclasses wrap a supervised FFmpeg source in `self.original` and
+    implement `_spawn(offset_seconds)` and `_read_raw()`.
     """
-    def __init__(self, source, *, data, volume=0.5, raw_info=None):
-        super().__init__(source, volume)
+    # Don't respawn a stream that ends this close to its known duration
+    RESTART_MARGIN_SECONDS = 3
+
+    def _set_track_info(self, data, raw_info=None, guild_id=None):
         self.data = data
         self.title = data.get("title") or "Unknown Title"
         self.url = data.get("url")  # direct stream link
         self.webpage_url = data.get("webpage_url") or ""
         self.thumbnail = data.get("thumbnail") or ""
         self.raw_info = raw_info or data
+        self.duration = data.get("duration")
+        self.frames_played = 0
+        # Frames queued to be served before reading FFmpeg again (pre-warm, or replay after a rewind)
+        self._pending = deque()
+        # Most recently played frames, newest on the right
+        self._history = deque(maxlen=int(SEEK_BUFFER_SECONDS / FRAME_SECONDS))
+        # read() runs on the player thread, seeks come from the event loop
+        self._buffer_lock = threading.Lock()
+        self.guild_id = guild_id
+        self.restarts = 0
+
+    def _spawn_supervised(self, factory, offset_seconds):
+        return audio_supervisor.spawn(
+            factory,
+            guild_id=self.guild_id,
+            kind="music",
+            label=f"{self.title} @{int(offset_seconds)}s",
+            restarts=self.restarts
+        )
+
+    def _should_restart(self) -> bool:
+        return (
+            not graceful_shutdown.closing  # kill_all() ended the stream on purpose
+            and is_network_source(self.url)
+            and self.restarts < FFMPEG_MAX_RESTARTS
+            and self.duration is not None
+            and self.position < self.duration - self.RESTART_MARGIN_SECONDS
+        )
+
+    def _restart(self):
+        """Respawn FFmpeg at the last played position after the stream died early."""
+        self.restarts += 1
+        offset = round(self.position, 2)
+        log.warning(f"FFmpeg stream for '{self.title}' ended early at {offset}s, restarting ({self.restarts}/{FFMPEG_MAX_RESTARTS})")
+        old = self.original
+        try:
+            self.original = self._spawn(offset)
+        except Exception as e:
+            log.error(f"Could not restart FFmpeg for '{self.title}': {e}")
+            return b''
+        audio_supervisor.release(old)
+        old.cleanup()
+        return self._read_raw()
+
+    def _read_frame(self):
+        data = self._read_raw()
+        if not data and self._should_restart():
+            data = self._restart()
+        return data
+
+    def cleanup(self):
+        audio_supervisor.release(self.original)
+        self.original.cleanup()
+
+    @property
+    def position(self) -> float:
+        """Seconds into the track, counted from frames actually handed to the player."""
+        return self.raw_info.get('current_offset', 0) + self.frames_played * FRAME_SECONDS
+
+    def remaining(self):
+        if not self.duration:
+            return None
+        return max(0.0, self.duration - self.position)
+
+    def prewarm(self, frames=PREWARM_FRAMES):
+        """
+        Read the first frames ahead of playback so FFmpeg is connected and
+        audio is buffered when the track starts. Blocking; run in a thread.
+        """
+        for _ in range(frames):
+            data = self._read_frame()
+            if not data:
+                break
+            with self._buffer_lock:
+                self._pending.append(data)
+
+    def read(self):
+        with self._buffer_lock:
+            data = self._pending.popleft() if self._pending else None
+        if data is None:
+            data = self._read_frame()
+            with self._buffer_lock:
+                # A rewind landed while FFmpeg was being read; this frame comes after the replayed ones
+                if self._pending:
+                    if data:
+                        self._pending.append(data)
+                    data = self._pending.popleft()
+        if data:
+            with self._buffer_lock:
+                self._history.append(data)
+                self.frames_played += 1
+        return data
+
+    def seek_buffered(self, delta_seconds: float) -> bool:
+        """
+        Move the playback position by `delta_seconds` using only buffered frames.
+        Returns False (and changes nothing) if the target is outside the buffer,
+        in which case the caller has to re-open the stream at the new offset.
+        """
+        with self._buffer_lock:
+            target = max(0.0, self.position + delta_seconds)
+            frames = round((target - self.position) / FRAME_SECONDS)
+            if frames < 0:
+                if -frames > len(self._history):
+                    return False
+                for _ in range(-frames):
+                    self._pending.appendleft(self._history.pop())
+            elif frames > 0:
+                if frames > len(self._pending):
+                    return False
+                for _ in range(frames):
+                    self._history.append(self._pending.popleft())
+            self.frames_played += frames
+            return True
 
     @classmethod
     async def from_search_or_url(cls, query, loop=None):
         """If query is a URL, use it. Otherwise, search YouTube (with music bias)."""
-        loop = loop or asyncio.get_event_loop()
+        return create_track_source(await extract_track_info(query))
 
-        if is_url(query):
-            search_input = query
-        else:
-            # Exclude certain words
-            cleaned_query = " ".join(
-                word for word in query.split()
-                if all(x.lower() not in word.lower() for x in SEARCH_EXCLUDE)
-            )
-            # Append extra terms for music
-            cleaned_query = f"{cleaned_query} {SEARCH_SUFFIX}".strip()
-            # We'll pull up to 10 search results
-            search_input = f"ytsearch10:{cleaned_query}"
-
-        ytdl_opts = {
-            'format': 'bestaudio/best',
-            'noplaylist': True,
-            'quiet': True,
-            'ignoreerrors': True,
-            'no_warnings': True,
-            'source_address': '0.0.0.0',
-        }
-        ytdl = yt_dlp.YoutubeDL(ytdl_opts)
-        data = await loop.run_in_executor(
-            None,
-            lambda: ytdl.extract_info(search_input, download=False)
-        )
+    @classmethod
+    def create_seek_source(cls, raw_info, offset_seconds=0):
+        """Rebuild the FFmpeg source with -ss <offset_seconds>."""
+        return create_track_source(raw_info, offset_seconds=offset_seconds)
 
-        if not data:
-            raise ValueError("No data returned from YouTube search.")
-        if 'entries' in data:
-            entries = [e for e in data['entries'] if e]
-            if not entries:
-                raise ValueError("No valid entries found.")
-            data = entries[0]
 
-        if 'url' not in data:
-            raise ValueError("No valid URL found in YouTube data.")
+class YTDLSource(TrackSource, discord.PCMVolumeTransformer):
+    """
+    In-process PCM path: FFmpeg decodes to PCM, volume is scaled per frame
+    in Python and discord.py re-encodes to Opus. Only used when a per-frame
+    effect is needed (or MUSIC_PLAYBACK_MODE=pcm).
+    """
+    def __init__(self, *, data, offset_seconds=0, volume=MUSIC_VOLUME, raw_info=None, guild_id=None):
+        self._set_track_info(data, raw_info, guild_id)
+        super().__init__(self._spawn(offset_seconds), volume)
+
+    def _spawn(self, offset_seconds):
+        return self._spawn_supervised(
+            lambda: discord.FFmpegPCMAudio(
+                self.url,
+                before_options=ffmpeg_before_options(self.url, offset_seconds),
+                options=f"-loglevel {FFMPEG_LOGLEVEL}"
+            ),
+            offset_seconds
+        )
 
-        raw_info = data
-        filename = data['url']
-        raw_info['current_offset'] = 0  # start at 0s
+    def _read_raw(self):
+        return discord.PCMVolumeTransformer.read(self)
 
-        return cls(
-            discord.FFmpegPCMAudio(filename, options="-loglevel quiet"),
-            data=data,
-            volume=0.5,
-            raw_info=raw_info
+
+class YTDLOpusSource(TrackSource, discord.AudioSource):
+    """
+    Opus-native path: FFmpeg applies volume and encodes Opus out of process.
+    When the stream is already Opus and no volume change is needed, packets
+    are copied straight through with no decode/encode at all.
+    """
+    def __init__(self, *, data, offset_seconds=0, guild_id=None):
+        self._set_track_info(data, guild_id=guild_id)
+        self.passthrough = data.get("acodec") == "opus" and MUSIC_VOLUME == 1.0
+        self.original = self._spawn(offset_seconds)
+
+    def _spawn(self, offset_seconds):
+        options = f"-loglevel {FFMPEG_LOGLEVEL}"
+        if not self.passthrough:
+            options += f" -filter:a volume={MUSIC_VOLUME}"
+        return self._spawn_supervised(
+            lambda: discord.FFmpegOpusAudio(
+                self.url,
+                codec="opus" if self.passthrough else None,  # discord.py turns "opus" into -c:a copy
+                before_options=ffmpeg_before_options(self.url, offset_seconds),
+                options=options
+            ),
+            offset_seconds
         )
 
-    @classmethod
-    def create_seek_source(cls, raw_info, offset_seconds=0):
-        """Rebuild the FFmpegPCMAudio with -ss <offset_seconds>."""
-        if offset_seconds < 0:
-            offset_seconds = 0
-        new_opts = f"-loglevel quiet -ss {offset_seconds}"
-        filename = raw_info['url']
-        audio = discord.FFmpegPCMAudio(filename, before_options=new_opts, options="-loglevel quiet")
-        new_data = raw_info.copy()
-        new_data['current_offset'] = offset_seconds
-        return cls(audio, data=new_data, volume=0.5, raw_info=new_data)
+    def _read_raw(self):
+        return self.original.read()
+
+    def is_opus(self):
+        return True
+
+
+def ffmpeg_before_options(url, offset_seconds=0) -> str:
+    opts = f"-loglevel {FFMPEG_LOGLEVEL}"
+    if is_network_source(url):
+        opts += f" {RECONNECT_OPTIONS}"
+    if offset_seconds > 0:
+        opts += f" -ss {offset_seconds}"
+    return opts
+
+
+def create_track_source(info: dict, *, offset_seconds=0, needs_pcm=False, guild_id=None):
+    """
+    Spawn a supervised FFmpeg process for an already-resolved info dict.
+    Uses the Opus-native source unless PCM is forced by config or the caller
+    needs per-frame access to the samples.
+    """
+    if offset_seconds < 0:
+        offset_seconds = 0
+    raw_info = dict(info)
+    raw_info['current_offset'] = offset_seconds
+
+    if needs_pcm or MUSIC_PLAYBACK_MODE == "pcm":
+        return YTDLSource(data=raw_info, offset_seconds=offset_seconds, raw_info=raw_info, guild_id=guild_id)
+    return YTDLOpusSource(data=raw_info, offset_seconds=offset_seconds, guild_id=guild_id)
 
 
 ###################################################
@@ -112,18 +483,131 @@ class MusicCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # Queue: {guild_id: [(title, YTDLSource), (title, YTDLSource), ...]}
+        # Queue: {guild_id: GuildQueue of QueuedTrack}
         self.song_queue = {}
+        # Track currently playing: {guild_id: QueuedTrack}
+        self.current_track = {}
+        # Voice channel each guild was playing in: {guild_id: channel_id}
+        self.voice_channel_ids = {}
+        # Pending debounced queue saves: {guild_id: asyncio.Task}
+        self.save_tasks = {}
         # Playback state: {guild_id: bool}
         self.is_playing = {}
         # Track "Now Playing" message for each guild
         self.nowplaying_message = {}  # guild_id -> discord.Message or None
+        # Debounced updater + persistent view behind each message: {guild_id: NowPlayingPanel}
+        self.nowplaying_panels = {}
+        # Next track already spawned and buffered: {guild_id: (QueuedTrack, TrackSource)}
+        self.prepared = {}
+        # Pending pre-warm timers: {guild_id: asyncio.Task}
+        self.prewarm_tasks = {}
+        # Snapshots restored from disk, waiting to be resumed: {guild_id: state}
+        self.saved_states = {}
+
+        memory_tracker.track(
+            "music.queued_tracks", lambda: self.song_queue,
+            count=lambda: sum(len(q) for q in list(self.song_queue.values()))
+        )
+        memory_tracker.track("music.nowplaying_message", lambda: self.nowplaying_message)
+        memory_tracker.track("music.nowplaying_panels", lambda: self.nowplaying_panels)
+        memory_tracker.track("music.prepared", lambda: self.prepared)
+        graceful_shutdown.add_hook("music.save_queues", self.flush_queues_on_shutdown)
+
+    async def cog_load(self):
+        # Restore queues saved before the last restart; the files are read off the loop
+        self.load_saved_queues(await asyncio.to_thread(load_all_queue_states))
 
     def get_queue(self, guild_id: int):
         if guild_id not in self.song_queue:
-            self.song_queue[guild_id] = []
+            self.song_queue[guild_id] = GuildQueue()
         return self.song_queue[guild_id]
 
+    ###################################################
+    #  QUEUE PERSISTENCE
+    ###################################################
+    def load_saved_queues(self, states):
+        for guild_id, state in states.items():
+            if not owns_guild(self.bot, guild_id):
+                continue  # another shard process restores this guild
+            tracks = [QueuedTrack.from_dict(t) for t in state.get("tracks", [])]
+            now_playing = state.get("now_playing")
+            if now_playing:
+                track = QueuedTrack.from_dict(now_playing)
+                track.start_offset = int(now_playing.get("position", 0))
+                tracks.insert(0, track)
+            if tracks:
+                self.song_queue[guild_id] = GuildQueue(tracks)
+                self.saved_states[guild_id] = state
+
+    def queue_snapshot(self, guild_id: int):
+        """Metadata-only snapshot of a guild's queue, or None if there's nothing to keep."""
+        queue = self.get_queue(guild_id)
+        now_playing = None
+        track = self.current_track.get(guild_id)
+        if track and self.is_playing.get(guild_id):
+            now_playing = track.to_dict()
+            source = self.music_source(guild_id)
+            if source is not None:
+                now_playing["position"] = int(source.position)
+        if not queue and not now_playing:
+            return None
+        return {
+            "voice_channel_id": self.voice_channel_ids.get(guild_id),
+            "now_playing": now_playing,
+            "tracks": [t.to_dict() for t in queue],
+        }
+
+    def schedule_queue_save(self, guild_id: int):
+        """Debounce queue writes so bursts of changes (e.g. !remix) cost one write."""
+        if guild_id in self.save_tasks or graceful_shutdown.closing:
+            return  # on shutdown, flush_queues_on_shutdown() writes the final state
+
+        async def _save_later():
+            try:
+                await asyncio.sleep(QUEUE_SAVE_DELAY)
+            finally:
+                self.save_tasks.pop(guild_id, None)
+            await asyncio.to_thread(save_queue_state, guild_id, self.queue_snapshot(guild_id))
+
+        self.save_tasks[guild_id] = asyncio.create_task(_save_later())
+
+    def save_all_queues(self):
+        """Write every guild's queue immediately (blocking)."""
+        for guild_id in list(self.song_queue):
+            save_queue_state(guild_id, self.queue_snapshot(guild_id))
+
+    async def flush_queues_on_shutdown(self):
+        """Replace pending debounced saves with one immediate write of every queue (and its position)."""
+        for task in list(self.save_tasks.values()):
+            task.cancel()
+        self.save_tasks.clear()
+        await asyncio.to_thread(self.save_all_queues)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Resume saved queues in voice channels that still have listeners."""
+        for guild_id, state in list(self.saved_states.items()):
+            self.saved_states.pop(guild_id, None)
+            channel = self.bot.get_channel(state.get("voice_channel_id") or 0)
+            if not isinstance(channel, discord.VoiceChannel):
+                continue
+            if not any(not m.bot for m in channel.members):
+                continue
+            try:
+                vc = channel.guild.voice_client or await channel.connect()
+            except Exception as e:
+                log.warning(f"Could not rejoin voice to resume queue in guild {guild_id}: {e}")
+                continue
+            self.voice_channel_ids[guild_id] = channel.id
+            log.debug(f"Resuming saved queue in guild {guild_id}")
+            if not self.is_playing.get(guild_id):
+                await self.play_next(guild_id, vc)
+
+    async def notify_if_warming_up(self, ctx: commands.Context):
+        """Right after a restart yt-dlp may still be loading; lookups wait for it."""
+        if not startup.ready("yt-dlp"):
+            await ctx.send("⏳ Music is still warming up after a restart; your request will start in a moment.")
+
     async def ensure_voice(self, ctx: commands.Context):
         user = ctx.author
         if not user.voice or not user.voice.channel:
@@ -140,66 +624,289 @@ class MusicCog(commands.Cog):
 
     async def play_next(self, guild_id: int, voice_client: discord.VoiceClient):
         """Plays next song or stops if queue empty."""
+        if graceful_shutdown.closing:
+            return  # keep the queue as saved for the next start
         queue = self.get_queue(guild_id)
         if not queue:
             self.is_playing[guild_id] = False
-            await self.update_nowplaying_embed(guild_id, voice_client, ended=True)
+            self.current_track.pop(guild_id, None)
+            self.schedule_queue_save(guild_id)
+            self.request_nowplaying_update(guild_id)
             return
 
-        title, source = queue.pop(0)
+        track = queue.popleft()
         self.is_playing[guild_id] = True
-
+        self.current_track[guild_id] = track
+        if voice_client.channel:
+            self.voice_channel_ids[guild_id] = voice_client.channel.id
+        self.schedule_queue_save(guild_id)
+        source = self._take_prepared(guild_id, track)
+        if source is None:
+            try:
+                source = create_track_source(
+                    track.local_info() or await track.resolve(),
+                    offset_seconds=track.start_offset,
+                    needs_pcm=self.uses_mixer(guild_id),
+                    guild_id=guild_id
+                )
+            except FFmpegCapacityError as e:
+                # Not the track's fault; keep it queued and stay idle until the next command
+                log.error(f"{e}")
+                queue.appendleft(track)
+                self.is_playing[guild_id] = False
+                self.current_track.pop(guild_id, None)
+                return
+            except Exception as e:
+                log.warning(f"Could not resolve '{track.title}', skipping: {e}")
+                if track.info:
+                    await search_cache.invalidate_video(track.info.get("id"))
+                await self.play_next(guild_id, voice_client)
+                return
+        title = source.title
+        self.prefetch_upcoming(guild_id)
+
+        self.play_source(guild_id, voice_client, source)
+        log.debug(f"Now playing: {title}")
+        await audio_cache.record_play(source.raw_info)
+        self.request_nowplaying_update(guild_id)
+
+    def play_source(self, guild_id: int, voice_client: discord.VoiceClient, source):
+        """
+        Start `source` with the queue-advancing callback, and schedule the
+        next track to be pre-warmed shortly before this one ends.
+        """
         async def _after_track():
-            # Sleep a bit to ensure we don't skip instantly
-            await asyncio.sleep(1)
+            if graceful_shutdown.closing:
+                return  # FFmpeg was killed on shutdown; don't advance the saved queue
+            # A seek replaced this source; the replacement owns the queue now
+            current = self.music_source(guild_id)
+            if current is not source and current is not None:
+                return
+            if not voice_client.is_connected():
+                self.is_playing[guild_id] = False
+                self.discard_prepared(guild_id)
+                return
             await self.play_next(guild_id, voice_client)
 
         def after_play(err):
             if err:
-                print(f"[ERROR] Audio playback error: {err}")
+                log.error(f"Audio playback error: {err}")
+                # The cached stream URL (or video) is likely bad; don't serve it again
+                asyncio.run_coroutine_threadsafe(search_cache.invalidate_video(source.raw_info.get("id")), self.bot.loop)
                 # We won't forcibly skip the track on error,
                 # but once the track "ends", we eventually go to the next.
             # Next track logic
             asyncio.run_coroutine_threadsafe(_after_track(), self.bot.loop)
 
-        voice_client.play(source, after=after_play)
-        print(f"[DEBUG] Now playing: {title}")
-        await self.update_nowplaying_embed(guild_id, voice_client, current_source=source)
+        if self.uses_mixer(guild_id):
+            # Voice mode is on: music shares the connection with TTS through the mixer
+            if source.is_opus():
+                source.cleanup()
+                source = create_track_source(
+                    source.raw_info,
+                    offset_seconds=source.raw_info.get('current_offset', 0),
+                    needs_pcm=True,
+                    guild_id=guild_id
+                )
+            mixer = get_mixer(guild_id)
+            mixer.set_music(source, after=after_play)
+            mixer.ensure_playing(voice_client)
+        else:
+            if voice_client.is_playing() or voice_client.is_paused():
+                voice_client.stop()
+            voice_client.play(source, after=after_play)
 
-    async def update_nowplaying_embed(self, guild_id: int, voice_client: discord.VoiceClient, *, ended=False, current_source=None):
-        """Updates the Now Playing embed in the stored message."""
-        if guild_id not in self.nowplaying_message or not self.nowplaying_message[guild_id]:
+        old_task = self.prewarm_tasks.pop(guild_id, None)
+        if old_task:
+            old_task.cancel()
+        self.prewarm_tasks[guild_id] = asyncio.create_task(self._prewarm_next(guild_id, voice_client, source))
+
+    async def _prewarm_next(self, guild_id: int, voice_client: discord.VoiceClient, source):
+        """Wait until `source` is near its end, then spawn and buffer the next track."""
+        try:
+            while True:
+                remaining = source.remaining()
+                if remaining is None:
+                    return  # unknown duration (e.g. live stream)
+                if remaining <= PREWARM_LEAD_SECONDS:
+                    break
+                await asyncio.sleep(min(remaining - PREWARM_LEAD_SECONDS, 5))
+                if self.music_source(guild_id) is not source:
+                    return  # skipped or seeked
+            await self.prepare_next(guild_id)
+        except asyncio.CancelledError:
+            pass
+
+    async def prepare_next(self, guild_id: int):
+        """Resolve the head of the queue, spawn its FFmpeg process and buffer its first frames."""
+        queue = self.get_queue(guild_id)
+        if not queue:
+            return
+        track = queue[0]
+        prepared = self.prepared.get(guild_id)
+        if prepared and prepared[0] is track:
             return
-        msg = self.nowplaying_message[guild_id]
+        self.discard_prepared(guild_id)
+        try:
+            source = create_track_source(
+                track.local_info() or await track.resolve(),
+                offset_seconds=track.start_offset,
+                needs_pcm=self.uses_mixer(guild_id),
+                guild_id=guild_id
+            )
+            await asyncio.to_thread(source.prewarm)
+        except Exception as e:
+            log.warning(f"Could not pre-warm '{track.title}': {e}")
+            return
+        queue = self.get_queue(guild_id)
+        if not queue or queue[0] is not track:
+            source.cleanup()  # queue changed while we were warming up
+            return
+        self.prepared[guild_id] = (track, source)
+        log.debug(f"Pre-warmed next track: {track.title}")
+
+    def _take_prepared(self, guild_id: int, track):
+        prepared = self.prepared.pop(guild_id, None)
+        if not prepared:
+            return None
+        if prepared[0] is track:
+            return prepared[1]
+        prepared[1].cleanup()
+        return None
+
+    def discard_prepared(self, guild_id: int):
+        """Kill a pre-warmed FFmpeg process that will no longer be played."""
+        prepared = self.prepared.pop(guild_id, None)
+        if prepared:
+            prepared[1].cleanup()
+
+    ###################################################
+    #  PLAYBACK STATE (direct or through the voice mixer)
+    ###################################################
+    def _voice_client(self, guild_id: int):
+        guild = self.bot.get_guild(guild_id)
+        return guild.voice_client if guild else None
+
+    def uses_mixer(self, guild_id: int) -> bool:
+        """Music goes through the guild mixer while TTS voice mode is on, so both can play at once."""
+        tts_cog = self.bot.get_cog("VoiceTTSManagerCog")
+        return bool(tts_cog and guild_id in tts_cog.voice_clients)
+
+    def music_source(self, guild_id: int):
+        """The TrackSource currently playing (or paused) in the guild, or None."""
+        vc = self._voice_client(guild_id)
+        if not vc:
+            return None
+        mixer = get_mixer(guild_id, create=False)
+        if mixer and mixer.is_active_on(vc):
+            return mixer.music
+        if (vc.is_playing() or vc.is_paused()) and isinstance(vc.source, TrackSource):
+            return vc.source
+        return None
+
+    def is_music_paused(self, guild_id: int) -> bool:
+        vc = self._voice_client(guild_id)
+        mixer = get_mixer(guild_id, create=False)
+        if vc and mixer and mixer.is_active_on(vc):
+            return mixer.music_paused
+        return bool(vc and vc.is_paused())
+
+    def pause_music(self, guild_id: int) -> bool:
+        if not self.music_source(guild_id) or self.is_music_paused(guild_id):
+            return False
+        vc = self._voice_client(guild_id)
+        mixer = get_mixer(guild_id, create=False)
+        if mixer and mixer.is_active_on(vc):
+            mixer.music_paused = True
+        else:
+            vc.pause()
+        return True
+
+    def resume_music(self, guild_id: int) -> bool:
+        if not self.music_source(guild_id) or not self.is_music_paused(guild_id):
+            return False
+        vc = self._voice_client(guild_id)
+        mixer = get_mixer(guild_id, create=False)
+        if mixer and mixer.is_active_on(vc):
+            mixer.music_paused = False
+        else:
+            vc.resume()
+        return True
+
+    def stop_music(self, guild_id: int) -> bool:
+        """End the current track (its after-callback advances the queue). Leaves TTS alone."""
+        if not self.music_source(guild_id):
+            return False
+        vc = self._voice_client(guild_id)
+        mixer = get_mixer(guild_id, create=False)
+        if mixer and mixer.is_active_on(vc):
+            mixer.stop_music()
+        else:
+            vc.stop()
+        return True
 
-        if ended or not current_source:
+    def attach_to_mixer(self, guild_id: int):
+        """
+        Move a directly playing track into the guild mixer, respawned as PCM at
+        its current position. Called by the TTS cog before it submits audio.
+        """
+        vc = self._voice_client(guild_id)
+        if not vc:
+            return
+        mixer = get_mixer(guild_id)
+        if mixer.is_active_on(vc):
+            return
+        source = self.music_source(guild_id)
+        if source is None:
+            return
+        try:
+            pcm_source = create_track_source(
+                source.raw_info,
+                offset_seconds=round(source.position, 2),
+                needs_pcm=True,
+                guild_id=guild_id
+            )
+        except Exception as e:
+            log.error(f"Could not move music into the voice mixer: {e}")
+            return
+        paused = vc.is_paused()
+        self.play_source(guild_id, vc, pcm_source)
+        mixer.music_paused = paused
+
+    def prefetch_upcoming(self, guild_id: int):
+        """Resolve stream URLs for the next few queued tracks in the background."""
+        for track in self.get_queue(guild_id).peek(PREFETCH_AHEAD):
+            track.prefetch()
+
+    def render_nowplaying(self, guild_id: int):
+        """Build the Now Playing embed from live state. Returns (embed, active)."""
+        source = self.music_source(guild_id)
+        if source is None:
             embed = discord.Embed(
                 title="Now Playing",
                 description="No track is currently playing.",
                 color=discord.Color.red()
             )
-            await msg.edit(embed=embed, view=None)
-            return
-
-        title = current_source.title
-        url = current_source.webpage_url
-        thumb = current_source.thumbnail
+            return embed, False
 
         embed = discord.Embed(
             title="Now Playing",
-            description=f"[**{title}**]({url})",
+            description=f"[**{source.title}**]({source.webpage_url})\n{progress_bar(source.position, source.duration)}",
             color=discord.Color.blue()
         )
-        if thumb:
-            embed.set_thumbnail(url=thumb)
-        embed.set_footer(text="Use the buttons below to control playback.")
-
-        view = MusicControlView(
-            music_cog=self,
-            guild_id=guild_id,
-            voice_client=voice_client
-        )
-        await msg.edit(embed=embed, view=view)
+        if source.thumbnail:
+            embed.set_thumbnail(url=source.thumbnail)
+        if self.is_music_paused(guild_id):
+            embed.set_footer(text="⏸ Paused. Use the buttons below to control playback.")
+        else:
+            embed.set_footer(text="Use the buttons below to control playback.")
+        return embed, True
+
+    def request_nowplaying_update(self, guild_id: int):
+        """Ask the guild's Now Playing panel (if any) to refresh; edits are debounced."""
+        panel = self.nowplaying_panels.get(guild_id)
+        if panel:
+            panel.request_update()
 
     ###################################################
     #  BASIC MUSIC COMMANDS
@@ -211,16 +918,18 @@ class MusicCog(commands.Cog):
         if not voice_client:
             return
 
+        await self.notify_if_warming_up(ctx)
         msg = await ctx.send(f"Searching for: **{query}**...")
         try:
-            source = await YTDLSource.from_search_or_url(query)
+            track = QueuedTrack.from_info(await extract_track_info(query))
         except Exception as e:
             await msg.edit(content=f"⚠️ **Error:** {e}")
             return
 
         q = self.get_queue(ctx.guild.id)
-        q.append((source.title, source))
-        await msg.edit(content=f"✅ **Added to queue:** {source.title}")
+        q.append(track)
+        self.schedule_queue_save(ctx.guild.id)
+        await msg.edit(content=f"✅ **Added to queue:** {track.title}")
 
         if not self.is_playing.get(ctx.guild.id):
             await self.play_next(ctx.guild.id, voice_client)
@@ -228,22 +937,49 @@ class MusicCog(commands.Cog):
     @commands.command(name="skip")
     async def skip_command(self, ctx: commands.Context):
         """Skip the current track."""
-        voice_client = discord.utils.get(self.bot.voice_clients, guild=ctx.guild)
-        if voice_client and (voice_client.is_playing() or voice_client.is_paused()):
-            voice_client.stop()
+        if self.stop_music(ctx.guild.id):
             await ctx.send("⏭ **Skipped the track**")
         else:
             await ctx.send("No track is currently playing or paused.")
 
+    def render_queue_page(self, guild_id: int, page: int = 1) -> str:
+        q = self.get_queue(guild_id)
+        if not q:
+            return "The queue is empty."
+        tracks, page, pages = q.page(page)
+        start = (page - 1) * QUEUE_PAGE_SIZE
+        desc = "\n".join(f"**{start + i + 1}.** {track.title}" for i, track in enumerate(tracks))
+        footer = f"\nPage {page}/{pages} ({len(q)} tracks)"
+        if page < pages:
+            footer += f" — use `!queue {page + 1}` for more"
+        return f"**Current queue:**\n{desc}{footer}"
+
     @commands.command(name="queue")
-    async def queue_command(self, ctx: commands.Context):
-        """Show the upcoming queue."""
+    async def queue_command(self, ctx: commands.Context, page: int = 1):
+        """Show the upcoming queue. Usage: !queue [page]"""
+        await ctx.send(self.render_queue_page(ctx.guild.id, page))
+
+    @commands.command(name="remove")
+    async def remove_command(self, ctx: commands.Context, position: int):
+        """Remove a track from the queue. Usage: !remove <position>"""
         q = self.get_queue(ctx.guild.id)
-        if not q:
-            await ctx.send("The queue is empty.")
-        else:
-            desc = "\n".join(f"**-** {title}" for (title, _) in q)
-            await ctx.send(f"**Current queue:**\n{desc}")
+        if position < 1 or position > len(q):
+            await ctx.send(f"⚠️ **Position must be between 1 and {len(q)}.**")
+            return
+        track = q.remove_at(position - 1)
+        self.schedule_queue_save(ctx.guild.id)
+        await ctx.send(f"🗑 **Removed:** {track.title}")
+
+    @commands.command(name="movetrack")
+    async def move_command(self, ctx: commands.Context, src: int, dst: int):
+        """Move a queued track. Usage: !movetrack <from> <to>"""
+        q = self.get_queue(ctx.guild.id)
+        if not (1 <= src <= len(q) and 1 <= dst <= len(q)):
+            await ctx.send(f"⚠️ **Positions must be between 1 and {len(q)}.**")
+            return
+        track = q.move(src - 1, dst - 1)
+        self.schedule_queue_save(ctx.guild.id)
+        await ctx.send(f"↕️ **Moved** {track.title} **to position {dst}.**")
 
     @commands.command(name="stop")
     async def stop_command(self, ctx: commands.Context):
@@ -251,10 +987,10 @@ class MusicCog(commands.Cog):
         guild_id = ctx.guild.id
         q = self.get_queue(guild_id)
         q.clear()
-        vc = discord.utils.get(self.bot.voice_clients, guild=ctx.guild)
-        if vc and (vc.is_playing() or vc.is_paused()):
-            vc.stop()
+        self.discard_prepared(guild_id)
+        self.stop_music(guild_id)
         self.is_playing[guild_id] = False
+        self.schedule_queue_save(guild_id)
         await ctx.send("⏹ **Stopped playback and cleared the queue**")
 
     @commands.command(name="leave")
@@ -263,11 +999,39 @@ class MusicCog(commands.Cog):
         vc = discord.utils.get(self.bot.voice_clients, guild=ctx.guild)
         if vc and vc.is_connected():
             await vc.disconnect()
+            remove_mixer(ctx.guild.id)
             self.is_playing[ctx.guild.id] = False
             await ctx.send("👋 **Left the voice channel**")
         else:
             await ctx.send("I'm not connected to any voice channel.")
 
+    @commands.command(name="musicstats")
+    async def musicstats_command(self, ctx: commands.Context):
+        """Show yt-dlp extractor pool load and search/audio cache stats."""
+        pool_desc = "\n".join(f"**{key}:** {value}" for key, value in ytdl_pool.stats().items())
+        cache_desc = "\n".join(f"**{key}:** {value}" for key, value in search_cache.stats().items())
+        audio_desc = "\n".join(f"**{key}:** {value}" for key, value in audio_cache.stats().items())
+        await ctx.send(
+            f"**Extractor pool:**\n{pool_desc}\n**Search cache:**\n{cache_desc}\n**Audio cache:**\n{audio_desc}"
+        )
+
+    @commands.command(name="audioprocs")
+    async def audioprocs_command(self, ctx: commands.Context):
+        """Show live FFmpeg processes with CPU/RSS and restart counts."""
+        stats = audio_supervisor.stats()
+        lines = [
+            f"**FFmpeg processes:** {stats['live']}/{stats['max']} "
+            f"(spawned {stats['spawned']}, restarts {stats['restarts']}, rejected {stats['rejected']})"
+        ]
+        for p in stats["processes"][:20]:
+            cpu = "n/a" if p["cpu_percent"] is None else f"{p['cpu_percent']:.1f}%"
+            rss = "n/a" if p["rss_mb"] is None else f"{p['rss_mb']} MB"
+            lines.append(
+                f"**-** pid {p['pid']} [{p['kind']}] guild {p['guild_id']}: {p['label']} "
+                f"— CPU {cpu}, RSS {rss}, restarts {p['restarts']}, up {p['uptime']}s"
+            )
+        await ctx.send("\n".join(lines)[:2000])
+
     ###################################################
     #  NOW PLAYING UI
     ###################################################
@@ -282,44 +1046,29 @@ class MusicCog(commands.Cog):
             await ctx.send("I'm not connected to any voice channel.")
             return
 
-        if not (vc.is_playing() or vc.is_paused()):
+        if not self.music_source(ctx.guild.id):
             await ctx.send("No track is currently playing.")
             return
 
-        current_source = None
-        if isinstance(vc.source, YTDLSource):
-            current_source = vc.source
-
-        embed = discord.Embed(
-            title="Now Playing",
-            color=discord.Color.blue()
-        )
-        if current_source:
-            title = current_source.title
-            url = current_source.webpage_url
-            thumb = current_source.thumbnail
-            embed.description = f"[**{title}**]({url})"
-            if thumb:
-                embed.set_thumbnail(url=thumb)
-        else:
-            embed.description = "Unknown Track"
-        embed.set_footer(text="Use the buttons below to control playback.")
-
-        view = MusicControlView(
-            music_cog=self,
-            guild_id=ctx.guild.id,
-            voice_client=vc
-        )
-
-        old_msg = self.nowplaying_message.get(ctx.guild.id)
+        guild_id = ctx.guild.id
+        old_panel = self.nowplaying_panels.pop(guild_id, None)
+        if old_panel:
+            old_panel.close()
+        old_msg = self.nowplaying_message.get(guild_id)
         if old_msg:
             try:
                 await old_msg.delete()
             except:
                 pass
 
+        # One view for the panel's lifetime; later edits reuse it
+        view = MusicControlView(music_cog=self, guild_id=guild_id)
+        embed, _ = self.render_nowplaying(guild_id)
         np_msg = await ctx.send(embed=embed, view=view)
-        self.nowplaying_message[ctx.guild.id] = np_msg
+        self.nowplaying_message[guild_id] = np_msg
+        panel = NowPlayingPanel(self, guild_id, np_msg, view)
+        self.nowplaying_panels[guild_id] = panel
+        panel.start()
 
     ###################################################
     #  REMIX COMMAND (YouTube-based)
@@ -328,8 +1077,8 @@ class MusicCog(commands.Cog):
     async def remix_command(self, ctx: commands.Context, *, artists: str):
         """
         !remix <artist1>, <artist2>, ... up to 5
-        Gathers multiple tracks, shuffles them, queues them,
-        then auto-sends nowplaying panel.
+        Searches all artists concurrently and queues shuffled tracks as each
+        search finishes, starting playback (and the nowplaying panel) right away.
         """
         artist_list = [a.strip() for a in artists.split(",") if a.strip()]
         if len(artist_list) < 1:
@@ -343,190 +1092,290 @@ class MusicCog(commands.Cog):
         if not vc:
             return
 
+        await self.notify_if_warming_up(ctx)
         msg = await ctx.send("Gathering tracks from YouTube. Please wait...")
 
-        results_per_artist = 10
-        track_entries = []
-        for artist in artist_list:
-            cleaned_artist = " ".join(
-                w for w in artist.split()
-                if all(x.lower() not in w.lower() for x in SEARCH_EXCLUDE)
-            )
-            full_search = f"{cleaned_artist} {SEARCH_SUFFIX}"
-            search_str = f"ytsearch{results_per_artist}:{full_search}"
-
-            ytdl_opts = {
-                'format': 'bestaudio/best',
-                'noplaylist': True,
-                'quiet': True,
-                'ignoreerrors': True,
-                'no_warnings': True,
-                'source_address': '0.0.0.0',
-            }
-            ytdl = yt_dlp.YoutubeDL(ytdl_opts)
-            try:
-                data = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: ytdl.extract_info(search_str, download=False)
-                )
-                if data and 'entries' in data:
-                    for entry in data['entries']:
-                        if entry:
-                            track_entries.append(entry)
-            except Exception as e:
-                print(f"[WARN] Could not fetch YouTube for '{artist}': {e}")
-
-        if not track_entries:
-            await msg.edit(content="⚠️ **No results found for these artists.**")
-            return
+        # Search all artists concurrently; queue each batch as soon as it arrives
+        semaphore = asyncio.Semaphore(REMIX_SEARCH_CONCURRENCY)
+        tasks = [asyncio.create_task(self._search_artist(artist, semaphore)) for artist in artist_list]
 
-        random.shuffle(track_entries)
-        track_entries = track_entries[:50]
-
-        tasks = []
         guild_id = ctx.guild.id
-        for entry in track_entries:
-            if not entry.get('webpage_url'):
+        q = self.get_queue(guild_id)
+        remix_tracks = set()  # the tracks themselves: held references can't be reused like id()s
+        queued_count = 0
+        failed = []
+        for next_done in asyncio.as_completed(tasks):
+            artist, entries, error = await next_done
+            if error:
+                failed.append(artist)
+                continue
+
+            random.shuffle(entries)
+            entries = entries[:REMIX_MAX_TRACKS - queued_count]
+            if not entries:
                 continue
-            track_url = entry['webpage_url']
-            tasks.append(asyncio.create_task(self.fetch_and_queue(track_url, guild_id)))
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        queued_count = sum(1 for r in results if not isinstance(r, Exception))
+            # Interleave with tracks from artists that finished earlier
+            for entry in entries:
+                track = QueuedTrack.from_info(entry)
+                first = next((i for i, t in enumerate(q) if t in remix_tracks), len(q))
+                q.insert(random.randint(first, len(q)), track)
+                remix_tracks.add(track)
+                queued_count += 1
+            self.schedule_queue_save(guild_id)
+
+            await msg.edit(content=f"Gathering tracks from YouTube... **{queued_count} queued so far.**")
+
+            # Start playback as soon as the first batch is in
+            if not self.is_playing.get(guild_id):
+                await self.play_next(guild_id, vc)
+                await self.nowplaying_command(ctx)
+            else:
+                self.prefetch_upcoming(guild_id)
+
+        if not queued_count:
+            await msg.edit(content="⚠️ **No results found for these artists.**")
+            return
 
-        await msg.edit(content=f"✅ **Queued {queued_count} tracks** from {', '.join(artist_list)}.")
+        summary = f"✅ **Queued {queued_count} tracks** from {', '.join(artist_list)}."
+        if failed:
+            summary += f"\n⚠️ Could not fetch: {', '.join(failed)}"
+        await msg.edit(content=summary)
 
-        if not self.is_playing.get(ctx.guild.id):
-            await self.play_next(ctx.guild.id, vc)
+    async def _search_artist(self, artist: str, semaphore: asyncio.Semaphore):
+        """Search one artist for !remix. Returns (artist, entries, error)."""
+        cleaned_artist = " ".join(
+            w for w in artist.split()
+            if all(x.lower() not in w.lower() for x in SEARCH_EXCLUDE)
+        )
+        full_search = f"{cleaned_artist} {SEARCH_SUFFIX}"
+        search_str = f"ytsearch{REMIX_RESULTS_PER_ARTIST}:{full_search}"
+
+        try:
+            async with semaphore:
+                data = await ytdl_pool.extract_info(search_str)
+        except Exception as e:
+            log.warning(f"Could not fetch YouTube for '{artist}': {e}")
+            return artist, [], e
 
-        await self.nowplaying_command(ctx)
+        entries = []
+        if data and 'entries' in data:
+            entries = [e for e in data['entries'] if e and e.get('webpage_url')]
+        return artist, entries, None
 
     async def fetch_and_queue(self, query: str, guild_id: int):
         """Search YT (or direct link) and append track to queue."""
         try:
-            source = await YTDLSource.from_search_or_url(query)
-            self.get_queue(guild_id).append((source.title, source))
+            track = QueuedTrack.from_info(await extract_track_info(query))
+            self.get_queue(guild_id).append(track)
+            self.schedule_queue_save(guild_id)
         except Exception as e:
             return e
         return True
 
 
+###################################################
+#   Now Playing Panel
+###################################################
+def format_time(seconds) -> str:
+    seconds = int(seconds or 0)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def progress_bar(position, duration, width=NP_BAR_WIDTH) -> str:
+    if not duration:
+        return f"`{format_time(position)}`"
+    filled = int(width * min(position / duration, 1.0))
+    return "▬" * filled + "🔘" + "▬" * (width - filled) + f" `{format_time(position)} / {format_time(duration)}`"
+
+
+class NowPlayingPanel:
+    """
+    Owns one guild's Now Playing message and its single persistent view.
+    Update requests are coalesced into at most one edit per NP_UPDATE_DEBOUNCE,
+    edits whose rendered embed hasn't changed are skipped, and the progress
+    bar is refreshed every NP_PROGRESS_INTERVAL seconds.
+    """
+    def __init__(self, music_cog: MusicCog, guild_id: int, message: discord.Message, view: discord.ui.View):
+        self.music_cog = music_cog
+        self.guild_id = guild_id
+        self.message = message
+        self.view = view
+        self._last_rendered = None
+        self._pending = None
+        self._ticker = None
+        self.edits = 0
+        self.skipped = 0
+
+    def start(self):
+        self._ticker = asyncio.create_task(self._tick())
+
+    def request_update(self):
+        if self._pending and not self._pending.done():
+            return
+        self._pending = asyncio.create_task(self._update_later())
+
+    async def _update_later(self):
+        await asyncio.sleep(NP_UPDATE_DEBOUNCE)
+        await self.flush()
+
+    async def _tick(self):
+        try:
+            while True:
+                await asyncio.sleep(NP_PROGRESS_INTERVAL)
+                await self.flush()
+        except asyncio.CancelledError:
+            pass
+
+    async def flush(self):
+        embed, active = self.music_cog.render_nowplaying(self.guild_id)
+        rendered = (repr(embed.to_dict()), active)
+        if rendered == self._last_rendered:
+            self.skipped += 1
+            return
+        try:
+            await self.message.edit(embed=embed, view=self.view if active else None)
+        except discord.NotFound:
+            self.close()
+            return
+        except discord.HTTPException as e:
+            log.warning(f"Could not update Now Playing panel in guild {self.guild_id}: {e}")
+            return
+        self._last_rendered = rendered
+        self.edits += 1
+
+    def close(self):
+        for task in (self._pending, self._ticker):
+            if task and not task.done():
+                task.cancel()
+        self.view.stop()
+        if self.music_cog.nowplaying_panels.get(self.guild_id) is self:
+            self.music_cog.nowplaying_panels.pop(self.guild_id, None)
+
+
 ###################################################
 #   Music Control View
 ###################################################
 class MusicControlView(discord.ui.View):
     """
     UI with Pause, Resume, Skip, Stop, Queue, Fwd, Rew, Leave.
-    We'll do `defer_update()` to keep the embed intact, 
+    We'll do `response.defer()` to keep the embed intact, 
     then send ephemeral feedback so the user knows it worked.
     """
-    def __init__(self, music_cog: MusicCog, guild_id: int, voice_client: discord.VoiceClient, *, timeout=300):
+    def __init__(self, music_cog: MusicCog, guild_id: int, *, timeout=None):
         super().__init__(timeout=timeout)
         self.music_cog = music_cog
         self.guild_id = guild_id
-        self.voice_client = voice_client
+
+    @property
+    def voice_client(self):
+        # Looked up per interaction so one long-lived view survives reconnects
+        guild = self.music_cog.bot.get_guild(self.guild_id)
+        return guild.voice_client if guild else None
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         return True
 
     @discord.ui.button(label="Pause", style=discord.ButtonStyle.blurple)
     async def pause_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer_update()
-        if self.voice_client and self.voice_client.is_playing():
-            self.voice_client.pause()
+        await interaction.response.defer()
+        if self.music_cog.pause_music(self.guild_id):
             # ephemeral feedback
             await interaction.followup.send("⏸ Paused.", ephemeral=True)
-            await self.music_cog.update_nowplaying_embed(self.guild_id, self.voice_client)
+            self.music_cog.request_nowplaying_update(self.guild_id)
         else:
             await interaction.followup.send("No track playing to pause.", ephemeral=True)
 
     @discord.ui.button(label="Resume", style=discord.ButtonStyle.green)
     async def resume_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer_update()
-        if self.voice_client and self.voice_client.is_paused():
-            self.voice_client.resume()
+        await interaction.response.defer()
+        if self.music_cog.resume_music(self.guild_id):
             await interaction.followup.send("▶️ Resumed.", ephemeral=True)
-            await self.music_cog.update_nowplaying_embed(self.guild_id, self.voice_client)
+            self.music_cog.request_nowplaying_update(self.guild_id)
         else:
             await interaction.followup.send("No track paused to resume.", ephemeral=True)
 
     @discord.ui.button(label="Skip", style=discord.ButtonStyle.red)
     async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer_update()
-        if self.voice_client and (self.voice_client.is_playing() or self.voice_client.is_paused()):
-            self.voice_client.stop()
+        await interaction.response.defer()
+        if self.music_cog.stop_music(self.guild_id):
             await interaction.followup.send("⏭ Skipped.", ephemeral=True)
         else:
             await interaction.followup.send("Nothing to skip.", ephemeral=True)
 
     @discord.ui.button(label="Stop", style=discord.ButtonStyle.red)
     async def stop_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer_update()
+        await interaction.response.defer()
         q = self.music_cog.get_queue(self.guild_id)
         q.clear()
-        if self.voice_client and (self.voice_client.is_playing() or self.voice_client.is_paused()):
-            self.voice_client.stop()
+        self.music_cog.discard_prepared(self.guild_id)
+        self.music_cog.stop_music(self.guild_id)
         self.music_cog.is_playing[self.guild_id] = False
-        await self.music_cog.update_nowplaying_embed(self.guild_id, self.voice_client, ended=True)
+        self.music_cog.schedule_queue_save(self.guild_id)
+        self.music_cog.request_nowplaying_update(self.guild_id)
         await interaction.followup.send("⏹ Stopped & cleared queue.", ephemeral=True)
 
     @discord.ui.button(label="Queue", style=discord.ButtonStyle.gray)
     async def queue_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer_update()
-        q = self.music_cog.get_queue(self.guild_id)
-        if not q:
-            text = "The queue is empty."
-        else:
-            desc = "\n".join(f"**-** {title}" for (title, _) in q)
-            text = f"**Current queue:**\n{desc}"
+        await interaction.response.defer()
+        text = self.music_cog.render_queue_page(self.guild_id)
         await interaction.followup.send(text, ephemeral=True)
 
     @discord.ui.button(label="<< Rewind 10s", style=discord.ButtonStyle.gray)
     async def rewind_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer_update()
+        await interaction.response.defer()
         await self._seek(interaction, -10)
 
     @discord.ui.button(label="Forward 10s >>", style=discord.ButtonStyle.gray)
     async def forward_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer_update()
+        await interaction.response.defer()
         await self._seek(interaction, 10)
 
     @discord.ui.button(label="Leave", style=discord.ButtonStyle.gray)
     async def leave_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer_update()
+        await interaction.response.defer()
         if self.voice_client and self.voice_client.is_connected():
             await self.voice_client.disconnect()
+            remove_mixer(self.guild_id)
             self.music_cog.is_playing[self.guild_id] = False
-            await self.music_cog.update_nowplaying_embed(self.guild_id, self.voice_client, ended=True)
+            self.music_cog.request_nowplaying_update(self.guild_id)
             await interaction.followup.send("👋 Left the voice channel.", ephemeral=True)
         else:
             await interaction.followup.send("Not currently connected.", ephemeral=True)
 
     async def _seek(self, interaction: discord.Interaction, offset: int):
-        if not self.voice_client or (not self.voice_client.is_playing() and not self.voice_client.is_paused()):
+        current_source = self.music_cog.music_source(self.guild_id)
+        if current_source is None:
             await interaction.followup.send("No active track to seek.", ephemeral=True)
             return
 
-        current_source = self.voice_client.source
-        if not (isinstance(current_source, YTDLSource) and current_source.raw_info):
+        if not current_source.raw_info:
             await interaction.followup.send("Cannot seek this track.", ephemeral=True)
             return
 
+        # Rewinds (and re-forwards after a rewind) inside the local buffer are instant
+        if current_source.seek_buffered(offset):
+            new_offset = int(current_source.position)
+            self.music_cog.request_nowplaying_update(self.guild_id)
+            if offset > 0:
+                await interaction.followup.send(f"⏩ Forwarded 10s (now at ~{new_offset}s).", ephemeral=True)
+            else:
+                await interaction.followup.send(f"⏪ Rewound 10s (now at ~{new_offset}s).", ephemeral=True)
+            return
+
         raw_info = current_source.raw_info
-        current_offset = raw_info.get('current_offset', 0)
-        new_offset = current_offset + offset
+        new_offset = int(current_source.position + offset)
         if new_offset < 0:
             new_offset = 0
 
         try:
-            new_source = YTDLSource.create_seek_source(raw_info, offset_seconds=new_offset)
+            new_source = create_track_source(raw_info, offset_seconds=new_offset, guild_id=self.guild_id)
         except Exception as e:
             await interaction.followup.send(f"Seek error: {e}", ephemeral=True)
             return
 
-        self.voice_client.stop()
-        self.voice_client.play(new_source)
-        await self.music_cog.update_nowplaying_embed(self.guild_id, self.voice_client, current_source=new_source)
+        self.music_cog.play_source(self.guild_id, self.voice_client, new_source)
+        self.music_cog.request_nowplaying_update(self.guild_id)
         if offset > 0:
             await interaction.followup.send(f"⏩ Forwarded 10s (now at ~{new_offset}s).", ephemeral=True)
         else:
@@ -0,0 +1,128 @@
+# cogs/music_queue.py
+
+import json
+import os
+from collections import deque
+from itertools import islice
+
+from .log import get_logger
+
+log = get_logger("music")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUEUE_FOLDER = os.getenv("MUSIC_QUEUE_DIR", os.path.join(BASE_DIR, "music_queues"))  # Folder to store per-guild queue files
+QUEUE_PAGE_SIZE = 10
+
+
+class GuildQueue:
+    """
+    Per-guild music queue backed by a deque.
+    Push/pop at either end are O(1); indexed access, remove and move are
+    O(n) in the distance from the nearest end, like any deque.
+    """
+    def __init__(self, items=None):
+        self._items = deque(items or [])
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index: int):
+        return self._items[index]
+
+    def append(self, item):
+        self._items.append(item)
+
+    def appendleft(self, item):
+        self._items.appendleft(item)
+
+    def popleft(self):
+        return self._items.popleft()
+
+    def insert(self, index: int, item):
+        self._items.insert(index, item)
+
+    def clear(self):
+        self._items.clear()
+
+    def peek(self, count: int):
+        """Return the first `count` items without removing them."""
+        return list(islice(self._items, count))
+
+    def remove_at(self, index: int):
+        """Remove and return the item at `index`. Raises IndexError if out of range."""
+        item = self._items[index]
+        del self._items[index]
+        return item
+
+    def move(self, src: int, dst: int):
+        """Move the item at `src` so it ends up at index `dst`."""
+        item = self.remove_at(src)
+        self._items.insert(dst, item)
+        return item
+
+    def page(self, page: int, size: int = QUEUE_PAGE_SIZE):
+        """
+        Return (items, page, pages) for a 1-based page number, clamped to range.
+        """
+        pages = max(1, (len(self._items) + size - 1) // size)
+        page = max(1, min(page, pages))
+        start = (page - 1) * size
+        return list(islice(self._items, start, start + size)), page, pages
+
+
+###################################################
+#   Persistence (metadata only)
+###################################################
+def ensure_queue_folder():
+    if not os.path.exists(QUEUE_FOLDER):
+        os.makedirs(QUEUE_FOLDER, exist_ok=True)
+
+def queue_file_path(guild_id: int) -> str:
+    return os.path.join(QUEUE_FOLDER, f"queue_{guild_id}.json")
+
+def save_queue_state(guild_id: int, state):
+    """
+    Write a guild's queue snapshot, or delete it if `state` is None.
+    Blocking; call via asyncio.to_thread from the event loop.
+    """
+    ensure_queue_folder()
+    path = queue_file_path(guild_id)
+    try:
+        if state is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        log.error(f"Could not save music queue for guild {guild_id}: {e}")
+
+def load_all_queue_states():
+    """
+    Load every saved queue snapshot. Returns {guild_id: state}.
+    """
+    ensure_queue_folder()
+    states = {}
+    for fname in os.listdir(QUEUE_FOLDER):
+        if not fname.startswith("queue_") or not fname.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(QUEUE_FOLDER, fname), "r", encoding="utf-8") as f:
+                state = json.load(f)
+            guild_id = int(fname.replace("queue_", "").replace(".json", ""))
+            states[guild_id] = state
+            log.debug("Loaded music queue from %s", fname)
+        except Exception as e:
+            log.error(f"Loading queue file {fname}: {e}")
+    return states
+
+async def setup(bot):
+    pass
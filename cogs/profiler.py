@@ -0,0 +1,249 @@
+# cogs/profiler.py
+
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from .log import get_logger
+
+log = get_logger("diagnostics")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Folder collapsed-stack files are written to
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+# Seconds between stack samples (100 Hz keeps the overhead around 1-2%)
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.01"))
+# Deepest stack kept per sample; deeper frames are cut at the root end
+PROFILE_MAX_DEPTH = 64
+
+# Innermost frames that mean a thread is waiting rather than working
+IDLE_FRAMES = {
+    ("selectors.py", "select"),           # event loop waiting for I/O
+    ("threading.py", "wait"),             # Event/Condition waits
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),             # idle ThreadPoolExecutor worker (in SimpleQueue.get)
+    ("tracing.py", "_export_loop"),       # trace exporter waiting for work
+}
+
+
+_frame_labels = {}  # code object -> label; saves path work on every sample
+
+
+def frame_label(code) -> str:
+    label = _frame_labels.get(code)
+    if label is None:
+        path = os.path.abspath(code.co_filename)
+        if path.startswith(BASE_DIR) and "site-packages" not in path:
+            path = os.path.relpath(path, BASE_DIR)
+        else:
+            path = os.path.basename(path)
+        label = _frame_labels[code] = f"{code.co_name} ({path})"
+    return label
+
+
+def thread_group(name: str) -> str:
+    """Fold pool workers ("ytdl_0", "ytdl_1") into one flame graph root."""
+    return re.sub(r"_\d+$", "", name)
+
+
+def task_label(task) -> str:
+    """
+    Name a task by the handler it runs. discord.py wraps every event listener
+    in Client._run_event(coro, event_name, ...), so look through that wrapper.
+    """
+    coro = task.get_coro() if isinstance(task, asyncio.Task) else task
+    qualname = getattr(coro, "__qualname__", type(coro).__name__)
+    frame = getattr(coro, "cr_frame", None)
+    if qualname.endswith("_run_event") and frame is not None:
+        inner = frame.f_locals.get("coro")
+        event = frame.f_locals.get("event_name")
+        inner_name = getattr(inner, "__qualname__", None)
+        if inner_name:
+            return f"{inner_name} ({event})" if event else inner_name
+    return qualname
+
+
+class HandlerStats:
+    __slots__ = ("calls", "wall", "worst", "loop_samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.worst = 0.0
+        self.loop_samples = 0
+
+
+class SamplingProfiler:
+    """
+    Low-overhead wall-clock sampler for the whole process.
+    A daemon thread reads every thread's stack (sys._current_frames) each
+    PROFILE_INTERVAL and counts collapsed stacks; samples whose innermost
+    frame is a known wait are counted as idle and kept out of the flame graph.
+    Loop-thread samples are also charged to the running task's handler, and a
+    task factory records the wall time of every task that finishes during
+    the window, so per-handler wall time and on-loop time can be compared.
+    """
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()          # "thread;frame;frame" -> busy samples
+        self.thread_samples = Counter()  # thread group -> total samples
+        self.thread_busy = Counter()     # thread group -> busy samples
+        self.handlers = {}               # handler label -> HandlerStats
+        self.started_at = None
+        self.stopped_at = None
+        self._loop = None
+        self._loop_thread_id = None
+        self._previous_factory = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.stopped_at or time.monotonic()) - self.started_at
+
+    def start(self):
+        """Start a new window (call from a coroutine); clears the previous one."""
+        if self.running:
+            return
+        self.stacks.clear()
+        self.thread_samples.clear()
+        self.thread_busy.clear()
+        self.handlers = {}
+        self.started_at = time.monotonic()
+        self.stopped_at = None
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._previous_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._thread.start()
+        log.info("Profiler started (%.0f Hz)", 1 / self.interval)
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self.stopped_at = time.monotonic()
+        if self._loop.get_task_factory() == self._task_factory:
+            self._loop.set_task_factory(self._previous_factory)
+        log.info("Profiler stopped after %.1fs", self.duration)
+
+    # ----------- Per-task wall time -----------
+    def _task_factory(self, loop, coro, **kwargs):
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        label = task_label(coro)
+        started = time.perf_counter()
+        task.add_done_callback(lambda t: self.record(label, time.perf_counter() - started))
+        return task
+
+    def record(self, label: str, elapsed: float):
+        """Add one finished call of `label` to the per-handler wall-time table."""
+        with self._lock:
+            stats = self.handlers.get(label)
+            if stats is None:
+                stats = self.handlers[label] = HandlerStats()
+            stats.calls += 1
+            stats.wall += elapsed
+            stats.worst = max(stats.worst, elapsed)
+
+    # ----------- Sampler thread -----------
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._sample(thread_id, names.get(thread_id, str(thread_id)), frame)
+
+    def _sample(self, thread_id, thread_name, frame):
+        group = thread_group(thread_name)
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+            with self._lock:
+                self.thread_samples[group] += 1
+            return
+
+        labels = []
+        while frame is not None and len(labels) < PROFILE_MAX_DEPTH:
+            labels.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        handler = None
+        if thread_id == self._loop_thread_id:
+            task = asyncio.current_task(self._loop)
+            if task is not None:
+                handler = task_label(task)
+                labels.append(f"[{handler}]")
+        labels.append(group)
+        labels.reverse()
+        stack = ";".join(labels)
+
+        with self._lock:
+            self.thread_samples[group] += 1
+            self.thread_busy[group] += 1
+            self.stacks[stack] += 1
+            if handler is not None:
+                stats = self.handlers.get(handler)
+                if stats is None:
+                    stats = self.handlers[handler] = HandlerStats()
+                stats.loop_samples += 1
+
+    # ----------- Reports -----------
+    def snapshot(self):
+        """Copies of (stacks, thread_samples, thread_busy); safe while sampling."""
+        with self._lock:
+            return Counter(self.stacks), Counter(self.thread_samples), Counter(self.thread_busy)
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format, ready for flamegraph.pl or speedscope."""
+        stacks = self.snapshot()[0]
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+
+    def write_collapsed(self) -> str:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"profile-{time.strftime('%Y%m%d-%H%M%S')}.collapsed")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        return path
+
+    def top_frames(self, limit=10):
+        """(frame, self samples, inclusive samples) for the frames with the most self time."""
+        self_counts = Counter()
+        inclusive = Counter()
+        for stack, count in self.snapshot()[0].items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for frame in set(frames[1:]):
+                inclusive[frame] += count
+        return [(frame, n, inclusive[frame]) for frame, n in self_counts.most_common(limit)]
+
+    def top_handlers(self, limit=10):
+        """Handlers by wall time, with the share of it spent running on the loop."""
+        with self._lock:
+            items = list(self.handlers.items())
+        items.sort(key=lambda item: (item[1].wall, item[1].loop_samples), reverse=True)
+        return items[:limit]
+
+
+# Create a global profiler; driven by the diagnostics cog
+profiler = SamplingProfiler()
+
+async def setup(bot):
+    pass
@@ -0,0 +1,159 @@
+# cogs/search_cache.py
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .log import get_logger
+from .memory import memory_tracker
+
+log = get_logger("music")
+
+# How long a query -> video mapping stays valid (metadata rarely changes)
+SEARCH_META_TTL = 7 * 24 * 60 * 60
+# Direct stream URLs are signed and short-lived
+SEARCH_STREAM_TTL = 30 * 60
+# Max queries kept in memory (least recently used are dropped first)
+SEARCH_CACHE_MAX_ENTRIES = 2000
+# Optional persistent tier for metadata; leave unset to keep the cache in memory only
+SEARCH_CACHE_DB = os.getenv("SEARCH_CACHE_DB", "")
+
+META_KEYS = ("id", "title", "webpage_url", "thumbnail", "duration")
+STREAM_KEYS = ("url", "acodec", "ext", "http_headers", "resolved_at")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """
+    Cache from normalized !play query to resolved video info.
+    Metadata (query -> video) lives for SEARCH_META_TTL and can be persisted
+    to SQLite; stream URLs are kept per video for SEARCH_STREAM_TTL in memory only.
+    """
+    def __init__(self, db_path=SEARCH_CACHE_DB, max_entries=SEARCH_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._meta = OrderedDict()  # query -> (meta dict, stored_at)
+        self._streams = {}          # video_id -> stream dict (with resolved_at)
+        self._db = None
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS search_cache ("
+                    "query TEXT PRIMARY KEY, video_id TEXT, meta TEXT, stored_at REAL)"
+                )
+                self._db.commit()
+                log.debug(f"Search cache persisted to {db_path}")
+            except sqlite3.Error as e:
+                log.error(f"Could not open search cache DB {db_path}: {e}")
+                self._db = None
+
+    # ----------- SQLite tier (run via asyncio.to_thread) -----------
+    def _db_get(self, key: str):
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT meta, stored_at FROM search_cache WHERE query = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _db_put(self, key: str, meta: dict, stored_at: float):
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search_cache (query, video_id, meta, stored_at) VALUES (?, ?, ?, ?)",
+                (key, meta.get("id"), json.dumps(meta), stored_at)
+            )
+            self._db.commit()
+
+    def _db_delete_video(self, video_id: str):
+        with self._db_lock:
+            self._db.execute("DELETE FROM search_cache WHERE video_id = ?", (video_id,))
+            self._db.commit()
+
+    # ----------- Public API -----------
+    async def get(self, query: str):
+        """
+        Return cached info for `query` or None.
+        The result includes a direct 'url' only if the stream URL is still fresh;
+        otherwise it is metadata only and the caller should re-resolve the video.
+        """
+        key = normalize_query(query)
+        now = time.time()
+        entry = self._meta.get(key)
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._db_get, key)
+            if entry is not None:
+                self._meta[key] = entry
+
+        if entry is None or now - entry[1] > SEARCH_META_TTL:
+            self._meta.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._meta.move_to_end(key)
+        self.hits += 1
+        info = dict(entry[0])
+        stream = self._streams.get(info.get("id"))
+        if stream and now - stream.get("resolved_at", 0) < SEARCH_STREAM_TTL:
+            info.update(stream)
+        return info
+
+    async def put(self, query: str, info: dict):
+        key = normalize_query(query)
+        meta = {k: info[k] for k in META_KEYS if k in info}
+        stored_at = time.time()
+        self._meta[key] = (meta, stored_at)
+        self._meta.move_to_end(key)
+        while len(self._meta) > self.max_entries:
+            self._meta.popitem(last=False)
+
+        if info.get("id") and info.get("url"):
+            self._streams[info["id"]] = {k: info[k] for k in STREAM_KEYS if k in info}
+            self._prune_streams()
+
+        if self._db is not None:
+            await asyncio.to_thread(self._db_put, key, meta, stored_at)
+
+    async def invalidate_video(self, video_id: str):
+        """Drop a video's stream URL and every query mapped to it (e.g. after a playback failure)."""
+        if not video_id:
+            return
+        self._streams.pop(video_id, None)
+        for key in [k for k, (meta, _) in self._meta.items() if meta.get("id") == video_id]:
+            del self._meta[key]
+        if self._db is not None:
+            await asyncio.to_thread(self._db_delete_video, video_id)
+        log.debug(f"Invalidated cached search results for video {video_id}")
+
+    def _prune_streams(self):
+        now = time.time()
+        for video_id in [v for v, s in self._streams.items() if now - s.get("resolved_at", 0) > SEARCH_STREAM_TTL]:
+            del self._streams[video_id]
+
+    def stats(self) -> dict:
+        return {
+            "queries": len(self._meta),
+            "streams": len(self._streams),
+            "hits": self.hits,
+            "misses": self.misses,
+            "sqlite": bool(self._db),
+        }
+
+
+# Create a global search cache shared by all guilds
+search_cache = SearchCache()
+memory_tracker.track("cache.search_meta", lambda: search_cache._meta)
+memory_tracker.track("cache.search_streams", lambda: search_cache._streams)
+
+async def setup(bot):
+    pass
@@ -4,8 +4,15 @@ import discord
 from discord.ext import commands
 import json
 
+from .tracing import span
+from .memory import memory_tracker
+from .member_cache import ensure_chunked
+
 DEFAULT_GUILD_ID = 745769392767500322  # Replace with your guild ID
 
+# Max entries returned per page by the read-only listing tools
+TOOL_RESULT_PAGE_SIZE = 50
+
 def find_channel_by_name(guild, name: str):
     if not name:
         return None
@@ -24,9 +31,128 @@ def find_member_by_name(guild, name: str):
             return m
     return None
 
+def clamp_page(page, total: int) -> int:
+    """
+    Coerce a tool's `page` argument ("2", None, 999...) to a valid 1-based page
+    for `total` entries. Done before the cache lookup, so equivalent requests share one entry.
+    """
+    pages = max(1, (total + TOOL_RESULT_PAGE_SIZE - 1) // TOOL_RESULT_PAGE_SIZE)
+    return max(1, min(int(page or 1), pages))
+
+def paginate_lines(lines, page: int, label: str):
+    """
+    Render one page of `lines` with a short header, so large guilds
+    don't dump thousands of entries into the LLM context.
+    """
+    total = len(lines)
+    if total == 0:
+        return f"No {label} found."
+    pages = (total + TOOL_RESULT_PAGE_SIZE - 1) // TOOL_RESULT_PAGE_SIZE
+    page = clamp_page(page, total)
+    start = (page - 1) * TOOL_RESULT_PAGE_SIZE
+    chunk = lines[start:start + TOOL_RESULT_PAGE_SIZE]
+    header = f"{label.capitalize()} {start + 1}-{start + len(chunk)} of {total} (page {page}/{pages})"
+    footer = f"\n(Use page={page + 1} for more.)" if page < pages else ""
+    return header + ":\n" + "\n".join(chunk) + footer
+
+class ToolResultCache:
+    """
+    Caches rendered results of read-only tools.
+    Keys are (tool_name, guild_id, page); entries are dropped by the
+    gateway event listeners in ServerManagerCog.
+    """
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tool_name: str, guild_id, page: int):
+        key = (tool_name, guild_id, page)
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, tool_name: str, guild_id, page: int, result: str):
+        self._entries[(tool_name, guild_id, page)] = result
+
+    def invalidate(self, tool_name: str, guild_id=None):
+        """
+        Drop all pages of `tool_name`, optionally only for one guild.
+        """
+        stale = [
+            key for key in self._entries
+            if key[0] == tool_name and (guild_id is None or key[1] == guild_id)
+        ]
+        for key in stale:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
 class DiscordServerManager:
     def __init__(self, bot):
         self.bot = bot
+        self.cache = ToolResultCache()
+        memory_tracker.track("cache.tool_results", lambda: self.cache._entries)
+
+    def _resolve_guild(self, guild_id=None):
+        return self.bot.get_guild(int(guild_id) if guild_id else DEFAULT_GUILD_ID)
+
+    # ----------- READ-ONLY TOOLS (cached) -----------
+    async def get_guilds(self, page=1):
+        """
+        Return a page of (guild_id - guild_name) lines for the bot's guilds.
+        """
+        page = clamp_page(page, len(self.bot.guilds))
+        cached = self.cache.get("get_guilds", None, page)
+        if cached is not None:
+            return cached
+        lines = [f"{g.id} - {g.name}" for g in self.bot.guilds]
+        result = paginate_lines(lines, page, "guilds")
+        self.cache.set("get_guilds", None, page, result)
+        return result
+
+    async def get_guild_members(self, guild_id=None, page=1):
+        """
+        Return a page of (member_id - member_name) lines for a guild.
+        """
+        guild = self._resolve_guild(guild_id)
+        if not guild:
+            return f"[ERROR] Guild {guild_id or DEFAULT_GUILD_ID} not found."
+
+        # Listing every member is the one feature that needs the full member list
+        # (a no-op once the guild is chunked); it also fixes the page count
+        await ensure_chunked(guild)
+        page = clamp_page(page, len(guild.members))
+        cached = self.cache.get("get_guild_members", guild.id, page)
+        if cached is not None:
+            return cached
+        lines = [
+            f"{m.id} - {m.name}" + (f" ({m.nick})" if m.nick else "")
+            for m in guild.members
+        ]
+        result = paginate_lines(lines, page, "members")
+        self.cache.set("get_guild_members", guild.id, page, result)
+        return result
+
+    async def get_channels(self, guild_id=None, page=1):
+        """
+        Return a page of (channel_id - channel_name) lines for a guild.
+        """
+        guild = self._resolve_guild(guild_id)
+        if not guild:
+            return f"[ERROR] Guild {guild_id or DEFAULT_GUILD_ID} not found."
+
+        page = clamp_page(page, len(guild.channels))
+        cached = self.cache.get("get_channels", guild.id, page)
+        if cached is not None:
+            return cached
+        lines = [f"{ch.id} - {ch.name}" for ch in guild.channels]
+        result = paginate_lines(lines, page, "channels")
+        self.cache.set("get_channels", guild.id, page, result)
+        return result
 
     # Example tool calls (implement your actual tools here)
     async def change_channel_name(self, channel_id=None, channel_name=None, new_name=None):
@@ -61,6 +187,18 @@ class DiscordServerManager:
         try:
             if tool_name == "change_channel_name":
                 return await self.change_channel_name(**params)
+            elif tool_name == "get_guilds":
+                return await self.get_guilds(page=params.get("page", 1))
+            elif tool_name == "get_guild_members":
+                return await self.get_guild_members(
+                    guild_id=params.get("guild_id"),
+                    page=params.get("page", 1)
+                )
+            elif tool_name == "get_channels":
+                return await self.get_channels(
+                    guild_id=params.get("guild_id"),
+                    page=params.get("page", 1)
+                )
             # Add more tool handling as needed...
             else:
                 return f"[ERROR] Tool not recognized: '{tool_name}'."
@@ -69,9 +207,11 @@ class DiscordServerManager:
 
     async def handle_tool_calls(self, tool_calls: list):
         results = []
-        for call in tool_calls:
-            result = await self.handle_tool_call(call)
-            results.append(result)
+        async with span("handle_tool_calls", count=len(tool_calls)):
+            for call in tool_calls:
+                async with span("tool", tool=call.get("tool_name")):
+                    result = await self.handle_tool_call(call)
+                results.append(result)
         return results
 
 class ServerManagerCog(commands.Cog):
@@ -79,10 +219,63 @@ class ServerManagerCog(commands.Cog):
         self.bot = bot
         self.manager = DiscordServerManager(bot)
 
+    ###################################
+    # Cache invalidation for read-only tools
+    ###################################
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.manager.cache.invalidate("get_guilds")
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.manager.cache.invalidate("get_guilds")
+        self.manager.cache.invalidate("get_guild_members", guild.id)
+        self.manager.cache.invalidate("get_channels", guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        if before.name != after.name:
+            self.manager.cache.invalidate("get_guilds")
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.manager.cache.invalidate("get_guild_members", member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.manager.cache.invalidate("get_guild_members", member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.nick != after.nick:
+            self.manager.cache.invalidate("get_guild_members", after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        if before.name != after.name:
+            for guild in after.mutual_guilds:
+                self.manager.cache.invalidate("get_guild_members", guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.manager.cache.invalidate("get_channels", channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.manager.cache.invalidate("get_channels", channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if before.name != after.name:
+            self.manager.cache.invalidate("get_channels", after.guild.id)
+
     @commands.command(name="list_tools")
     async def list_tools(self, ctx):
         tools = [
             "change_channel_name",
+            "get_guilds",
+            "get_guild_members",
+            "get_channels",
             # Add other tools here...
         ]
         await ctx.send(f"Available tools: {', '.join(tools)}")
@@ -0,0 +1,59 @@
+# cogs/sharding.py
+
+import os
+
+from discord.ext import commands
+
+from .log import get_logger
+
+log = get_logger("main")
+
+# "on" runs an AutoShardedBot; "off" keeps the single-connection commands.Bot
+SHARDING = os.getenv("SHARDING", "off").lower() in ("1", "on", "true", "yes")
+# Total shards across every process; empty lets Discord recommend a count (single process only)
+SHARD_COUNT = os.getenv("SHARD_COUNT", "")
+# Shards this process runs, e.g. "0-3" or "4,5,6,7"; set by launcher.py per cluster
+SHARD_IDS = os.getenv("SHARD_IDS", "")
+# Cluster (process) number, used in logs and metrics
+CLUSTER_ID = os.getenv("CLUSTER_ID", "0")
+
+
+def parse_shard_ids(spec: str):
+    """ "0-3,8" -> [0, 1, 2, 3, 8]; empty -> None (all shards)."""
+    ids = []
+    for part in (p.strip() for p in spec.split(",") if p.strip()):
+        start, _, end = part.partition("-")
+        ids.extend(range(int(start), int(end or start) + 1))
+    return sorted(set(ids)) or None
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Discord's routing rule: which shard receives a guild's events."""
+    return (guild_id >> 22) % shard_count
+
+
+def owns_guild(bot: commands.Bot, guild_id: int) -> bool:
+    """
+    Whether this process serves `guild_id`. Per-guild state (music queues,
+    TTS queues, voice clients) only ever lives in the owning process; state
+    restored from disk for other guilds must be skipped.
+    """
+    shard_ids = getattr(bot, "shard_ids", None)
+    if not shard_ids or not bot.shard_count:
+        return True
+    return shard_for_guild(guild_id, bot.shard_count) in shard_ids
+
+
+def create_bot(**kwargs) -> commands.Bot:
+    """commands.Bot, or an AutoShardedBot for SHARD_IDS of SHARD_COUNT when SHARDING is on."""
+    if not SHARDING:
+        return commands.Bot(**kwargs)
+    shard_count = int(SHARD_COUNT) if SHARD_COUNT else None
+    shard_ids = parse_shard_ids(SHARD_IDS)
+    if shard_ids and shard_count is None:
+        raise ValueError("SHARD_IDS requires SHARD_COUNT (the total across all clusters).")
+    log.info("Cluster %s running shards %s of %s", CLUSTER_ID, shard_ids or "all", shard_count or "auto")
+    return commands.AutoShardedBot(shard_count=shard_count, shard_ids=shard_ids, **kwargs)
+
+async def setup(bot):
+    pass
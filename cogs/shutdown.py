@@ -0,0 +1,137 @@
+# cogs/shutdown.py
+
+import asyncio
+import glob
+import inspect
+import os
+import time
+from contextlib import contextmanager
+
+from .audio_supervisor import audio_supervisor
+from .audio_cache import audio_cache
+from .ytdl_pool import ytdl_pool
+from .log import get_logger
+
+log = get_logger("main")
+
+# Total seconds a graceful shutdown may take before the remaining steps are skipped
+# (launcher.py kills clusters that take longer than 45s)
+SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", "30"))
+# Seconds in-flight messages and commands (mostly waiting on the LLM) get to finish before they are cancelled
+SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "15"))
+
+# Temporary TTS clips are written to the working directory as tts_<uuid>.wav
+TEMP_AUDIO_PATTERN = "tts_*.wav"
+
+
+class GracefulShutdown:
+    """
+    Coordinated shutdown on SIGTERM/SIGINT, in this order:
+      1. stop accepting work: `closing` turns on and message handlers ignore new messages
+      2. drain: handlers registered with in_flight() get SHUTDOWN_DRAIN_TIMEOUT to
+         finish (reply, save their session), then are cancelled
+      3. flush: hooks registered by the cogs run in order (music queues, TTS queues)
+      4. kill every FFmpeg child, stop the yt-dlp / download pools, delete temp audio;
+         playback callbacks see `closing` and neither restart FFmpeg nor advance the queues
+      5. close the gateway and voice connections
+    main.py flushes traces and the log pipeline after bot.start() returns.
+    """
+    def __init__(self):
+        self.closing = False
+        self._in_flight = set()
+        self._hooks = {}  # name -> callable, sync or async; run in registration order
+        self._done = None  # asyncio.Event, created on the running loop by shutdown()
+
+    @contextmanager
+    def in_flight(self):
+        """Mark the current task as work to drain before shutting down."""
+        task = asyncio.current_task()
+        self._in_flight.add(task)
+        try:
+            yield
+        finally:
+            self._in_flight.discard(task)
+
+    @property
+    def in_flight_count(self) -> int:
+        return len(self._in_flight)
+
+    def add_hook(self, name: str, hook):
+        """Run `hook()` during the flush step. Registering a name again replaces it (cog reloads)."""
+        self._hooks.pop(name, None)
+        self._hooks[name] = hook
+
+    def remove_hook(self, name: str):
+        self._hooks.pop(name, None)
+
+    async def drain(self, timeout: float):
+        """Wait up to `timeout` seconds for in-flight work, then cancel what's left."""
+        pending = {t for t in self._in_flight if not t.done()}
+        if not pending:
+            return
+        log.info("Waiting up to %gs for %d in-flight handlers", timeout, len(pending))
+        _, pending = await asyncio.wait(pending, timeout=timeout)
+        if pending:
+            log.warning("Cancelling %d handlers still running after %gs", len(pending), timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending, timeout=2)
+
+    async def run_hooks(self, deadline: float):
+        for name, hook in list(self._hooks.items()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log.warning(f"Shutdown deadline reached; skipping flush step '{name}' and the ones after it")
+                return
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await asyncio.wait_for(result, remaining)
+            except asyncio.TimeoutError:
+                log.warning(f"Shutdown step '{name}' timed out")
+            except Exception as e:
+                log.error(f"Shutdown step '{name}' failed: {e}")
+
+    def release_resources(self):
+        audio_supervisor.kill_all()
+        ytdl_pool.shutdown()
+        audio_cache.shutdown()
+        removed = 0
+        for path in glob.glob(TEMP_AUDIO_PATTERN):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                log.warning(f"Could not remove temp audio {path}: {e}")
+        log.debug("Removed %d temp audio files", removed)
+
+    async def shutdown(self, bot, reason="signal"):
+        """Run the whole sequence once; later calls wait for the first one to finish."""
+        if self.closing:
+            if self._done is not None:
+                await self._done.wait()
+            return
+        self.closing = True
+        self._done = asyncio.Event()
+        start = time.monotonic()
+        deadline = start + SHUTDOWN_TIMEOUT
+        log.info(f"Shutting down ({reason})...")
+        try:
+            await self.drain(min(SHUTDOWN_DRAIN_TIMEOUT, SHUTDOWN_TIMEOUT))
+            await self.run_hooks(deadline)
+            self.release_resources()
+            await asyncio.wait_for(bot.close(), max(1.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            log.warning("Gateway did not close before the shutdown deadline")
+        except Exception as e:
+            log.error(f"Shutdown error: {e}")
+        finally:
+            log.info("Shutdown finished in %.1fs", time.monotonic() - start)
+            self._done.set()
+
+
+# Create a global coordinator; main.py wires the signals, cogs register hooks and in-flight work
+graceful_shutdown = GracefulShutdown()
+
+async def setup(bot):
+    pass
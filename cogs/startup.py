@@ -0,0 +1,125 @@
+# cogs/startup.py
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+from .metrics import metrics
+from .log import get_logger
+
+log = get_logger("main")
+
+# Taken when main.py first imports this module, right after load_dotenv()
+PROCESS_START = time.perf_counter()
+
+STARTUP_PHASE_SECONDS = metrics.gauge(
+    "startup_phase_seconds", "Time spent in one startup phase (import, extension, warm-up)", ("phase",)
+)
+WARMUPS_PENDING = metrics.gauge("startup_warmups_pending", "Heavy dependencies still loading in the background")
+
+
+class Warmup:
+    __slots__ = ("name", "loader", "done", "error", "seconds")
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.done = threading.Event()
+        self.error = None
+        self.seconds = None
+
+
+class StartupReport:
+    """
+    Startup timing and background warm-ups. main.py wraps imports and
+    extension loads in phase(); modules with heavy dependencies (the TTS
+    model, yt-dlp) register a blocking loader with add_warmup() instead of
+    loading at import time. start_warmups() runs every loader on its own
+    thread while the gateway connects; features ask ready(name) and tell
+    users they are warming up until it returns True.
+    """
+    def __init__(self):
+        self.phases = []  # [(name, seconds, ok)]
+        self.warmups = {}
+        self.connected_after = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(name, time.perf_counter() - start, ok)
+
+    def record(self, name: str, seconds: float, ok=True):
+        self.phases.append((name, seconds, ok))
+        STARTUP_PHASE_SECONDS.set(seconds, phase=name)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - PROCESS_START
+
+    def mark_connected(self):
+        """Called on the first gateway READY; later reconnects don't count."""
+        if self.connected_after is None:
+            self.connected_after = self.elapsed()
+            log.info("Gateway ready %.2fs after start\n%s", self.connected_after, self.format())
+
+    # ----------- warm-ups -----------
+    def add_warmup(self, name: str, loader):
+        """Register `loader()` (blocking) to run in the background once start_warmups() is called."""
+        self.warmups.setdefault(name, Warmup(name, loader))
+
+    def start_warmups(self):
+        for warmup in self.warmups.values():
+            if warmup.seconds is None and not warmup.done.is_set():
+                threading.Thread(
+                    target=self._run_warmup, args=(warmup,), name=f"warmup-{warmup.name}", daemon=True
+                ).start()
+        WARMUPS_PENDING.set(len(self.pending()))
+
+    def _run_warmup(self, warmup):
+        start = time.perf_counter()
+        try:
+            warmup.loader()
+        except Exception as e:
+            warmup.error = e
+            log.error(f"Warm-up of {warmup.name} failed: {e}")
+        warmup.seconds = time.perf_counter() - start
+        warmup.done.set()
+        STARTUP_PHASE_SECONDS.set(warmup.seconds, phase=f"warmup:{warmup.name}")
+        WARMUPS_PENDING.set(len(self.pending()))
+        if warmup.error is None:
+            log.info("%s warmed up in %.2fs (%.2fs after start)", warmup.name, warmup.seconds, self.elapsed())
+
+    def ready(self, name: str) -> bool:
+        """Whether warm-up `name` has finished. Names never registered count as ready."""
+        warmup = self.warmups.get(name)
+        return warmup is None or warmup.done.is_set()
+
+    async def wait_ready(self, interval=0.5):
+        """Wait until every registered warm-up has finished (or failed)."""
+        while self.pending():
+            await asyncio.sleep(interval)
+
+    def pending(self):
+        return [w.name for w in self.warmups.values() if not w.done.is_set()]
+
+    def format(self) -> str:
+        lines = [f"{'ok ' if ok else 'ERR'} {seconds * 1000:8.1f} ms  {name}" for name, seconds, ok in self.phases]
+        for w in self.warmups.values():
+            if w.done.is_set():
+                status = "ERR" if w.error else "ok "
+                lines.append(f"{status} {w.seconds * 1000:8.1f} ms  warm-up {w.name} (background)")
+            else:
+                lines.append(f"... {'':>8}     warm-up {w.name} (still loading)")
+        return "\n".join(lines)
+
+
+# Create a global report; main.py fills in the phases, heavy modules register warm-ups
+startup = StartupReport()
+
+async def setup(bot):
+    pass
@@ -0,0 +1,370 @@
+# cogs/tracing.py
+
+import argparse
+import contextvars
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+
+from .log import get_logger
+
+log = get_logger("tracing")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# JSONL file finished traces are appended to; set TRACE_FILE= (empty) to disable it
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(BASE_DIR, "traces.jsonl"))
+# Optional OTLP/HTTP JSON collector, e.g. http://127.0.0.1:4318/v1/traces
+TRACE_OTLP_URL = os.getenv("TRACE_OTLP_URL", "")
+# Share of traces kept regardless of duration
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.05"))
+# Traces whose root takes at least this long (or that fail) are always kept
+TRACE_SLOW_SECONDS = float(os.getenv("TRACE_SLOW_SECONDS", "5"))
+# How long a finished trace's keep/discard decision is remembered for children
+# that start after their root has ended (e.g. the TTS task spawned right before the reply returns)
+TRACE_LATE_CHILD_SECONDS = float(os.getenv("TRACE_LATE_CHILD_SECONDS", "30"))
+SERVICE_NAME = "discord-bot"
+
+# The span the running task is inside of; asyncio copies it into child tasks
+current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes",
+                 "start", "start_wall", "end", "status", "error")
+
+    def __init__(self, name, trace_id, parent_id, attributes):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.start_wall = time.time()
+        self.end = None
+        self.status = "ok"
+        self.error = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def drop(self):
+        """Discard the whole trace (e.g. on_message for a message the bot ignores)."""
+        tracer.drop(self.trace_id)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start_wall, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _TraceState:
+    __slots__ = ("spans", "open", "root", "dropped", "decision")
+
+    def __init__(self, decision=None):
+        self.spans = []
+        self.open = 0
+        self.root = None
+        self.dropped = False
+        self.decision = decision  # keep/discard already made for this trace_id (late children)
+
+
+class Tracer:
+    """
+    Collects spans per trace and exports a trace once all of its spans have
+    ended. A finished trace is kept if it was sampled at TRACE_SAMPLE_RATE,
+    was slower than TRACE_SLOW_SECONDS, or contains an error. The decision is
+    remembered for TRACE_LATE_CHILD_SECONDS, so background children that
+    only start after the root has ended (TTS) follow it and land in the same
+    tree; an erroring late child is exported either way. Export runs on a
+    daemon thread so file/HTTP writes never block the event loop.
+    """
+    def __init__(self, path=TRACE_FILE, otlp_url=TRACE_OTLP_URL,
+                 sample_rate=TRACE_SAMPLE_RATE, slow_seconds=TRACE_SLOW_SECONDS):
+        self.path = path
+        self.otlp_url = otlp_url
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self._traces = {}
+        self._decided = {}  # trace_id -> (keep, expires_at), oldest first
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self.exported = 0
+        self.discarded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path or self.otlp_url)
+
+    def start_span(self, name, attributes) -> Span:
+        parent = current_span.get()
+        if parent is None:
+            span = Span(name, f"{random.getrandbits(128):032x}", None, attributes)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+        with self._lock:
+            state = self._traces.get(span.trace_id)
+            if state is None:
+                decided = self._decided.get(span.trace_id)
+                state = self._traces[span.trace_id] = _TraceState(decided[0] if decided else None)
+                state.root = span
+            state.open += 1
+        return span
+
+    def end_span(self, span: Span):
+        span.end = time.perf_counter()
+        with self._lock:
+            state = self._traces.get(span.trace_id)
+            if state is None:
+                return
+            state.spans.append(span)
+            state.open -= 1
+            if state.open > 0:
+                return
+            del self._traces[span.trace_id]
+            if state.dropped:
+                keep = False
+            elif state.decision is not None:
+                keep = state.decision or any(s.status == "error" for s in state.spans)
+            else:
+                keep = (
+                    random.random() < self.sample_rate
+                    or state.root.duration >= self.slow_seconds
+                    or any(s.status == "error" for s in state.spans)
+                )
+            self._remember(span.trace_id, keep if state.decision is None else state.decision)
+        if state.dropped:
+            return
+        if keep:
+            self._submit([s.to_dict() for s in state.spans])
+        else:
+            self.discarded += 1
+
+    def _remember(self, trace_id: str, keep: bool):
+        """Record a trace's decision for late children; expired entries are pruned. Caller holds the lock."""
+        now = time.monotonic()
+        while self._decided:
+            oldest = next(iter(self._decided))
+            if self._decided[oldest][1] > now:
+                break
+            del self._decided[oldest]
+        self._decided.pop(trace_id, None)
+        self._decided[trace_id] = (keep, now + TRACE_LATE_CHILD_SECONDS)
+
+    def drop(self, trace_id: str):
+        with self._lock:
+            state = self._traces.get(trace_id)
+            if state:
+                state.dropped = True
+
+    # ----------- Export (background thread) -----------
+    def _submit(self, records):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._export_loop, name="trace-export", daemon=True)
+            self._thread.start()
+        self._queue.put(records)
+
+    def _export_loop(self):
+        while True:
+            records = self._queue.get()
+            if records is None:
+                return
+            if self.path:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        for record in records:
+                            f.write(json.dumps(record, default=str) + "\n")
+                except Exception as e:
+                    log.error(f"Could not write trace file {self.path}: {e}")
+            if self.otlp_url:
+                self._post_otlp(records)
+            self.exported += 1
+
+    def _post_otlp(self, records):
+        body = json.dumps(to_otlp(records)).encode("utf-8")
+        request = urllib.request.Request(
+            self.otlp_url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            log.warning(f"Could not export trace to {self.otlp_url}: {e}")
+
+    def flush(self, timeout=5.0):
+        """Stop the export thread after it drains pending traces (used on shutdown)."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def to_otlp(records) -> dict:
+    """Convert exported span dicts to an OTLP/HTTP JSON ExportTraceServiceRequest."""
+    spans = []
+    for r in records:
+        start_ns = int(r["start"] * 1e9)
+        spans.append({
+            "traceId": r["trace_id"],
+            "spanId": r["span_id"],
+            "parentSpanId": r["parent_id"] or "",
+            "name": r["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(r["duration_ms"] * 1e6)),
+            "attributes": [{"key": k, "value": {"stringValue": str(v)}} for k, v in r["attributes"].items()],
+            "status": {"code": 2, "message": r["error"] or ""} if r["status"] == "error" else {"code": 1},
+        })
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": spans}],
+    }]}
+
+
+class _SpanContext:
+    """`with span(...)` / `async with span(...)`: opens a child of the current span (or a new trace)."""
+    __slots__ = ("name", "attributes", "span", "_token")
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.span = None
+        self._token = None
+
+    def __enter__(self):
+        if not tracer.enabled:
+            return None
+        self.span = tracer.start_span(self.name, self.attributes)
+        self._token = current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.span is None:
+            return False
+        current_span.reset(self._token)
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.span.status = "error"
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        tracer.end_span(self.span)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def span(name: str, **attributes) -> _SpanContext:
+    """
+    Time a block as a span. Yields the Span (None when tracing is disabled):
+
+        async with span("call_local_llm", model=model) as s:
+            ...
+            if s: s.set(status="ok")
+    """
+    return _SpanContext(name, attributes)
+
+
+# Create a global tracer shared by all cogs
+tracer = Tracer()
+
+
+###################################################
+#   Critical path report: python -m cogs.tracing
+###################################################
+def load_traces(path: str):
+    traces = defaultdict(list)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                traces[record["trace_id"]].append(record)
+    return traces
+
+
+def _span_end(record) -> float:
+    return record["start"] + record["duration_ms"] / 1000
+
+
+def critical_path(spans):
+    """
+    Walk from the root, at each level following the child that finished last
+    within its parent: that chain is what the reply was actually waiting on.
+    Background children that outlive their parent (tasks started with create_task) are not on it.
+    """
+    children = defaultdict(list)
+    root = None
+    for s in spans:
+        if s["parent_id"] is None:
+            root = s
+        else:
+            children[s["parent_id"]].append(s)
+    path = []
+    node = root
+    while node is not None:
+        path.append(node)
+        node_end = _span_end(node)
+        kids = [k for k in children.get(node["span_id"], []) if _span_end(k) <= node_end + 0.001]
+        node = max(kids, key=_span_end) if kids else None
+    return root, children, path
+
+
+def print_trace(spans):
+    root, children, path = critical_path(spans)
+    if root is None:
+        return
+    on_path = {s["span_id"] for s in path}
+
+    def walk(node, depth):
+        offset = (node["start"] - root["start"]) * 1000
+        marker = "*" if node["span_id"] in on_path else " "
+        error = f"  !! {node['error']}" if node["error"] else ""
+        print(f"{marker} {'  ' * depth}{node['name']:<{40 - 2 * depth}} "
+              f"+{offset:8.1f} ms {node['duration_ms']:10.1f} ms{error}")
+        for child in sorted(children.get(node["span_id"], []), key=lambda s: s["start"]):
+            walk(child, depth + 1)
+
+    print(f"\ntrace {root['trace_id']}  {root['name']}  {root['duration_ms']:.1f} ms  {root['attributes']}")
+    walk(root, 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the slowest traces and their critical path (*)")
+    parser.add_argument("path", nargs="?", default=TRACE_FILE)
+    parser.add_argument("--slowest", type=int, default=5)
+    parser.add_argument("--name", default="", help="only traces whose root span has this name")
+    args = parser.parse_args(argv)
+
+    roots = []
+    for spans in load_traces(args.path).values():
+        root = next((s for s in spans if s["parent_id"] is None), None)
+        if root and (not args.name or root["name"] == args.name):
+            roots.append((root["duration_ms"], spans))
+    roots.sort(key=lambda item: item[0], reverse=True)
+    for _, spans in roots[:args.slowest]:
+        print_trace(spans)
+
+
+async def setup(bot):
+    pass
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,48 @@
 # cogs/tts_engine.py
 
-import uuid
-import asyncio
-from TTS.api import TTS
+import threading
+
+from .log import get_logger
+from .startup import startup
+
+log = get_logger("tts")
 
 class CoquiTTS:
     """
     Simple wrapper around Coqui TTS.
+    Importing TTS pulls in torch and loading the model takes seconds, so both
+    happen in load(): on the warm-up thread at startup, or on first use.
     """
     def __init__(self, model_name="tts_models/en/ljspeech/tacotron2-DDC"):
-        print(f"[DEBUG] Loading TTS model: {model_name}")
-        try:
-            self.tts = TTS(model_name=model_name)
-            print("[DEBUG] TTS model loaded successfully.")
-        except Exception as e:
-            print(f"[ERROR] Failed to load TTS model: {e}")
+        self.model_name = model_name
+        self.tts = None
+        self._load_lock = threading.Lock()
+
+    def load(self):
+        with self._load_lock:
+            if self.tts is not None:
+                return
+            log.debug(f"Loading TTS model: {self.model_name}")
+            try:
+                from TTS.api import TTS
+                self.tts = TTS(model_name=self.model_name)
+                log.debug("TTS model loaded successfully.")
+            except Exception as e:
+                log.error(f"Failed to load TTS model: {e}")
+                raise
 
     def generate_wav(self, text: str, output_file: str):
+        # Blocks until the warm-up finishes if it is still running; raises if the model can't load
+        self.load()
         try:
             self.tts.tts_to_file(text=text, file_path=output_file)
-            print(f"[DEBUG] Generated TTS audio: {output_file}")
+            log.debug(f"Generated TTS audio: {output_file}")
         except Exception as e:
-            print(f"[ERROR] TTS generation error: {e}")
+            log.error(f"TTS generation error: {e}")
 
-# Create a global TTS engine instance
+# Create a global TTS engine instance; the model loads in the background at startup
 tts_engine = CoquiTTS()
+startup.add_warmup("tts", tts_engine.load)
 
 async def setup(bot):
     pass
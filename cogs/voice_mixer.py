@@ -0,0 +1,207 @@
+# cogs/voice_mixer.py
+
+import threading
+from collections import deque
+
+import discord
+import numpy as np
+
+from .log import get_logger
+
+log = get_logger("voice")
+
+# Bytes in one 20 ms frame of 48 kHz stereo 16-bit PCM
+FRAME_SIZE = discord.opus.Encoder.FRAME_SIZE
+SILENCE = b"\x00" * FRAME_SIZE
+# Music gain while an overlay (TTS) is speaking
+DUCK_GAIN = 0.25
+# Max gain change per frame, so ducking fades over ~100 ms instead of clicking
+DUCK_STEP = 0.15
+
+
+def mix_frames(music: bytes, overlay: bytes, gain_from: float, gain_to: float) -> bytes:
+    """
+    Mix one PCM frame of music (ramped from gain_from to gain_to) with an overlay frame.
+    Both inputs are padded to a full frame; the sum is clipped to int16.
+    """
+    samples = FRAME_SIZE // 2
+    m = np.zeros(samples, dtype=np.float32)
+    if music:
+        m[:len(music) // 2] = np.frombuffer(music, dtype=np.int16)
+    if gain_from != 1.0 or gain_to != 1.0:
+        # Per-sample linear ramp; stereo pairs share the same gain
+        ramp = np.repeat(np.linspace(gain_from, gain_to, samples // 2, dtype=np.float32), 2)
+        m *= ramp
+    if overlay:
+        m[:len(overlay) // 2] += np.frombuffer(overlay, dtype=np.int16)
+    return np.clip(m, -32768, 32767).astype(np.int16).tobytes()
+
+
+class _MixerPlayback(discord.AudioSource):
+    """
+    Handle passed to VoiceClient.play. A fresh one is used per play() call so a
+    late cleanup() from an old player thread can't tear down newer audio.
+    """
+    def __init__(self, mixer):
+        self.mixer = mixer
+
+    def read(self):
+        return self.mixer._read()
+
+    def is_opus(self):
+        return False
+
+    def cleanup(self):
+        self.mixer._player_stopped(self)
+
+
+class GuildMixer:
+    """
+    Per-guild PCM mixer feeding the guild's single VoiceClient.
+    Holds one music source plus a FIFO of overlay sources (TTS). While an
+    overlay plays, music is ducked to DUCK_GAIN and both are summed per
+    20 ms frame with NumPy. Sources must be PCM (is_opus() == False).
+    """
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.music = None
+        self._music_after = None
+        self.music_paused = False
+        self._overlays = deque()  # [(source, after)]
+        self._gain = 1.0
+        self._lock = threading.Lock()
+        self._playback = None
+
+    # ----------- Submitting audio -----------
+    def set_music(self, source, after=None):
+        """Replace the music source. The replaced source is cleaned up without calling its `after`."""
+        with self._lock:
+            old = self.music
+            self.music = source
+            self._music_after = after
+            self.music_paused = False
+        if old is not None and old is not source:
+            old.cleanup()
+
+    def stop_music(self):
+        """End the music source as if it finished, calling its `after`."""
+        with self._lock:
+            source, after = self.music, self._music_after
+            self.music = None
+            self._music_after = None
+        self._finish(source, after)
+
+    def add_overlay(self, source, after=None):
+        with self._lock:
+            self._overlays.append((source, after))
+
+    @property
+    def has_audio(self) -> bool:
+        return self.music is not None or bool(self._overlays)
+
+    def is_active_on(self, voice_client) -> bool:
+        return self._playback is not None and voice_client.source is self._playback
+
+    def ensure_playing(self, voice_client):
+        """Make this mixer the voice client's source, stopping whatever played directly."""
+        if self.is_active_on(voice_client) and (voice_client.is_playing() or voice_client.is_paused()):
+            return
+        if voice_client.is_playing() or voice_client.is_paused():
+            voice_client.stop()
+        self._playback = _MixerPlayback(self)
+        voice_client.play(self._playback)
+
+    def close(self):
+        """Stop and clean up everything (voice disconnect / shutdown)."""
+        with self._lock:
+            music, music_after = self.music, self._music_after
+            overlays = list(self._overlays)
+            self.music = None
+            self._music_after = None
+            self._overlays.clear()
+            self._playback = None
+        self._finish(music, music_after)
+        for source, after in overlays:
+            self._finish(source, after)
+
+    # ----------- Player thread -----------
+    def _finish(self, source, after, error=None):
+        if source is None:
+            return
+        try:
+            source.cleanup()
+        finally:
+            if after:
+                try:
+                    after(error)
+                except Exception as e:
+                    log.error(f"Mixer after-callback failed: {e}")
+
+    def _read(self):
+        with self._lock:
+            music = None if self.music_paused else self.music
+            overlay = self._overlays[0] if self._overlays else None
+
+        music_frame = b""
+        if music is not None:
+            music_frame = music.read()
+            if not music_frame:
+                with self._lock:
+                    ended = self.music is music
+                    after = self._music_after if ended else None
+                    if ended:
+                        self.music = None
+                        self._music_after = None
+                if ended:
+                    self._finish(music, after)
+
+        overlay_frame = b""
+        if overlay is not None:
+            overlay_frame = overlay[0].read()
+            if not overlay_frame:
+                with self._lock:
+                    if self._overlays and self._overlays[0] is overlay:
+                        self._overlays.popleft()
+                self._finish(*overlay)
+
+        target = DUCK_GAIN if overlay_frame else 1.0
+        gain_from = self._gain
+        if gain_from < target:
+            self._gain = min(target, gain_from + DUCK_STEP)
+        else:
+            self._gain = max(target, gain_from - DUCK_STEP)
+
+        if not music_frame and not overlay_frame:
+            # Keep the player alive while anything is queued or paused; end it when idle
+            return SILENCE if self.has_audio else b""
+        if overlay_frame or self._gain != 1.0 or gain_from != 1.0:
+            return mix_frames(music_frame, overlay_frame, gain_from, self._gain)
+        if len(music_frame) < FRAME_SIZE:
+            music_frame += b"\x00" * (FRAME_SIZE - len(music_frame))
+        return music_frame
+
+    def _player_stopped(self, playback):
+        # Only a stop of the current player (disconnect, external stop) tears down sources
+        if playback is not self._playback:
+            return
+        self._playback = None
+        if self.has_audio:
+            self.close()
+
+
+# guild_id -> GuildMixer, shared by the music and TTS cogs
+mixers = {}
+
+def get_mixer(guild_id: int, create=True):
+    mixer = mixers.get(guild_id)
+    if mixer is None and create:
+        mixer = mixers[guild_id] = GuildMixer(guild_id)
+    return mixer
+
+def remove_mixer(guild_id: int):
+    mixer = mixers.pop(guild_id, None)
+    if mixer:
+        mixer.close()
+
+async def setup(bot):
+    pass
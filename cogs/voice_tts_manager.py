@@ -4,10 +4,33 @@ import discord
 from discord.ext import commands
 import asyncio
 import os
+import time
 import uuid
+import wave
 
 from .tts_engine import tts_engine
 from .conversation_manager import private_sessions, save_session
+from .audio_supervisor import audio_supervisor, FFMPEG_LOGLEVEL
+from .voice_mixer import get_mixer, remove_mixer
+from .metrics import metrics
+from .tracing import span
+from .memory import memory_tracker
+from .startup import startup
+from .shutdown import graceful_shutdown
+from .log import get_logger
+
+log = get_logger("tts")
+
+TTS_SYNTH_LATENCY = metrics.histogram("tts_synthesis_seconds", "Time to synthesize one TTS clip")
+TTS_REAL_TIME_FACTOR = metrics.histogram(
+    "tts_real_time_factor", "Synthesis time divided by audio duration (below 1 is faster than real time)",
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 4, 8)
+)
+TTS_QUEUE_DEPTH = metrics.gauge("tts_queue_depth", "Synthesized clips waiting to be spoken", ("guild",))
+
+def wav_duration(path: str) -> float:
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
 
 class VoiceTTSManagerCog(commands.Cog):
     """
@@ -18,6 +41,11 @@ class VoiceTTSManagerCog(commands.Cog):
         self.bot = bot
         self.voice_clients = {}  # Maps guild_id -> VoiceClient (connected instance)
         self.tts_queues = {}     # Maps guild_id -> asyncio.Queue of wav_path
+        memory_tracker.track(
+            "tts.queued_clips", lambda: self.tts_queues,
+            count=lambda: sum(q.qsize() for q in list(self.tts_queues.values()))
+        )
+        graceful_shutdown.add_hook("tts.drop_queues", self.drop_queued_clips)
 
     async def join_voice(self, ctx: commands.Context):
         """
@@ -55,8 +83,20 @@ class VoiceTTSManagerCog(commands.Cog):
         vc = self.voice_clients.get(guild_id)
         if vc and vc.is_connected():
             await vc.disconnect(force=True)
+        remove_mixer(guild_id)
         self.voice_clients.pop(guild_id, None)
         self.tts_queues.pop(guild_id, None)
+        TTS_QUEUE_DEPTH.remove(guild=guild_id)
+
+    def drop_queued_clips(self):
+        """On shutdown: discard clips nobody will hear and delete their WAV files."""
+        for guild_id, queue in list(self.tts_queues.items()):
+            while not queue.empty():
+                wav_path = queue.get_nowait()
+                queue.task_done()
+                if os.path.exists(wav_path):
+                    os.remove(wav_path)
+            TTS_QUEUE_DEPTH.remove(guild=guild_id)
 
     async def queue_tts_for_guild(self, guild_id: int, text: str):
         """
@@ -64,21 +104,36 @@ class VoiceTTSManagerCog(commands.Cog):
         We generate TTS audio, push it into the guild's TTS queue.
         If not currently playing, begin playback.
         """
-        if guild_id not in self.tts_queues:
-            # Create a queue and a playback task
-            self.tts_queues[guild_id] = asyncio.Queue()
-            asyncio.create_task(self._playback_worker(guild_id))
-
-        # Generate TTS .wav
-        wav_path = f"tts_{uuid.uuid4()}.wav"
-        try:
-            await asyncio.to_thread(tts_engine.generate_wav, text, wav_path)
-        except Exception as e:
-            print(f"[ERROR] TTS generation failed: {e}")
+        if graceful_shutdown.closing:
             return
+        async with span("queue_tts_for_guild", guild=guild_id, chars=len(text)):
+            if guild_id not in self.tts_queues:
+                # Create a queue and a playback task
+                self.tts_queues[guild_id] = asyncio.Queue()
+                asyncio.create_task(self._playback_worker(guild_id))
 
-        # Enqueue
-        await self.tts_queues[guild_id].put(wav_path)
+            # Generate TTS .wav
+            wav_path = f"tts_{uuid.uuid4()}.wav"
+            start = time.perf_counter()
+            try:
+                async with span("tts.generate_wav"):
+                    await asyncio.to_thread(tts_engine.generate_wav, text, wav_path)
+            except Exception as e:
+                log.error(f"TTS generation failed: {e}")
+                return
+            elapsed = time.perf_counter() - start
+            TTS_SYNTH_LATENCY.observe(elapsed)
+            try:
+                duration = wav_duration(wav_path)
+                if duration > 0:
+                    TTS_REAL_TIME_FACTOR.observe(elapsed / duration)
+            except (OSError, wave.Error, EOFError):
+                pass  # generation failed and already logged; nothing to measure
+
+            # Enqueue
+            queue = self.tts_queues[guild_id]
+            await queue.put(wav_path)
+            TTS_QUEUE_DEPTH.set(queue.qsize(), guild=guild_id)
 
     async def _playback_worker(self, guild_id: int):
         """
@@ -93,6 +148,7 @@ class VoiceTTSManagerCog(commands.Cog):
                 wav_path = await queue.get()  # block until there's an item
             except asyncio.CancelledError:
                 return
+            TTS_QUEUE_DEPTH.set(queue.qsize(), guild=guild_id)
 
             # Check if still connected
             vc = self.voice_clients.get(guild_id)
@@ -104,12 +160,31 @@ class VoiceTTSManagerCog(commands.Cog):
                     os.remove(wav_path)
                 continue
 
-            audio_source = discord.FFmpegPCMAudio(wav_path, options="-loglevel quiet")
-            vc.play(audio_source)
+            try:
+                audio_source = audio_supervisor.spawn(
+                    lambda: discord.FFmpegPCMAudio(wav_path, options=f"-loglevel {FFMPEG_LOGLEVEL}"),
+                    guild_id=guild_id,
+                    kind="tts",
+                    label=os.path.basename(wav_path)
+                )
+            except Exception as e:
+                log.error(f"Could not start TTS playback: {e}")
+                queue.task_done()
+                if os.path.exists(wav_path):
+                    os.remove(wav_path)
+                continue
+            # Speak over the music (ducked) through the guild mixer instead of replacing it
+            loop = asyncio.get_running_loop()
+            done = asyncio.Event()
+            mixer = get_mixer(guild_id)
+            mixer.add_overlay(audio_source, after=lambda err: loop.call_soon_threadsafe(done.set))
+            music_cog = self.bot.get_cog("MusicCog")
+            if music_cog:
+                music_cog.attach_to_mixer(guild_id)
+            mixer.ensure_playing(vc)
 
             # Wait until playback finishes
-            while vc.is_playing():
-                await asyncio.sleep(0.5)
+            await done.wait()
 
             # Cleanup
             queue.task_done()
@@ -136,7 +211,13 @@ class VoiceTTSManagerCog(commands.Cog):
                 return  # cannot join
             self.voice_clients[guild.id] = vc
             # Set a flag in guild data if needed
-            await ctx.send("Voice mode is now ON. I'll read messages in 'bot-chat' via TTS.")
+            if startup.ready("tts"):
+                await ctx.send("Voice mode is now ON. I'll read messages in 'bot-chat' via TTS.")
+            else:
+                await ctx.send(
+                    "Voice mode is now ON. The voice model is still warming up, "
+                    "so the first messages will be read out once it has loaded."
+                )
         elif mode == "off":
             # Turn off voice mode
             await self.leave_voice(guild.id)
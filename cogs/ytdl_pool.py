@@ -0,0 +1,167 @@
+# cogs/ytdl_pool.py
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import metrics
+from .log import get_logger
+from .startup import startup
+
+log = get_logger("music")
+
+# Number of dedicated extraction threads (each holds its own YoutubeDL)
+YTDL_POOL_SIZE = int(os.getenv("YTDL_POOL_SIZE", "3"))
+
+# Default per-lookup timeout, in seconds
+YTDL_TIMEOUT = 30
+
+YTDL_OPTIONS = {
+    'format': 'bestaudio/best',
+    'noplaylist': True,
+    'quiet': True,
+    'ignoreerrors': True,
+    'no_warnings': True,
+    'source_address': '0.0.0.0',
+}
+
+
+EXTRACT_LATENCY = metrics.histogram(
+    "music_extract_seconds", "yt-dlp extraction time including queueing", ("result",)
+)
+
+
+class YTDLExtractorPool:
+    """
+    Size-bounded pool of extraction threads with long-lived YoutubeDL instances.
+    YoutubeDL is not thread-safe, so every worker thread lazily builds and
+    keeps its own instance instead of paying extractor setup per lookup.
+    Running on a private executor keeps heavy lookups (e.g. !remix) from
+    starving the default executor used by TTS.
+    """
+    def __init__(self, max_workers=YTDL_POOL_SIZE, options=None):
+        self.max_workers = max_workers
+        self.options = dict(options or YTDL_OPTIONS)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ytdl")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.pending = 0      # submitted but not finished (queued + running)
+        self.running = 0      # currently executing on a worker
+        self.abandoned = 0    # timed out / cancelled by the caller but still holding a worker
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    def _get_ytdl(self):
+        ytdl = getattr(self._local, "ytdl", None)
+        if ytdl is None:
+            import yt_dlp  # imported by the startup warm-up; see import_yt_dlp()
+            ytdl = yt_dlp.YoutubeDL(self.options)
+            self._local.ytdl = ytdl
+        return ytdl
+
+    def _extract(self, query: str, download: bool):
+        with self._lock:
+            self.running += 1
+        try:
+            return self._get_ytdl().extract_info(query, download=download)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def _finished(self, future):
+        # Runs on the worker thread (or the caller's, if cancelled before starting)
+        with self._lock:
+            self.pending -= 1
+            if getattr(future, "abandoned", False):
+                self.abandoned -= 1
+
+    def _abandon(self, future):
+        """The caller stopped waiting; a lookup that already started keeps its worker until it ends."""
+        with self._lock:
+            if not future.done():
+                future.abandoned = True
+                self.abandoned += 1
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of lookups waiting for a free worker."""
+        return max(0, self.pending - self.running)
+
+    async def extract_info(self, query: str, *, download=False, timeout=YTDL_TIMEOUT):
+        """
+        Run `extract_info` on the pool.
+        Raises asyncio.TimeoutError after `timeout` seconds. Cancelling the
+        awaiting task drops the lookup if it hasn't started yet; a lookup that
+        is already running finishes in the background and its result is discarded.
+        """
+        with self._lock:
+            self.pending += 1
+        start = time.perf_counter()
+        # pending only drops when the worker is really done, not when the caller gives up
+        try:
+            future = self._executor.submit(self._extract, query, download)
+        except RuntimeError:  # executor shut down
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._finished)
+        result = "error"
+        try:
+            data = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+            self.completed += 1
+            result = "ok"
+            return data
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            result = "timeout"
+            self._abandon(future)
+            log.warning(f"yt-dlp lookup timed out after {timeout}s: {query}")
+            raise
+        except asyncio.CancelledError:
+            result = "cancelled"
+            self._abandon(future)
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            EXTRACT_LATENCY.observe(elapsed, result=result)
+            log.debug("yt-dlp lookup took %.2fs (queue depth: %d)", elapsed, self.queue_depth)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "abandoned": self.abandoned,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def import_yt_dlp():
+    """yt_dlp registers hundreds of extractors on import; do it off the event loop."""
+    import yt_dlp
+    log.debug("Loaded yt-dlp %s", yt_dlp.version.__version__)
+
+
+# Create a global extractor pool shared by all music lookups
+ytdl_pool = YTDLExtractorPool()
+startup.add_warmup("yt-dlp", import_yt_dlp)
+metrics.gauge("music_extract_queue_depth", "yt-dlp lookups waiting for a worker").set_function(
+    lambda: ytdl_pool.queue_depth
+)
+metrics.gauge(
+    "music_extract_abandoned", "yt-dlp lookups the caller gave up on (timeout/cancel) that still hold a worker"
+).set_function(lambda: ytdl_pool.abandoned)
+
+async def setup(bot):
+    pass
@@ -13,6 +13,13 @@ from TTS.api import TTS
 # Load Environment Variables
 # ======================
 load_dotenv()
+
+# Imported after load_dotenv() so LOG_* settings from .env apply
+from cogs.log import get_logger, logging_pipeline
+
+logging_pipeline.setup()
+log = get_logger("legacy")
+
 TOKEN = os.getenv("DISCORD_TOKEN")
 if not TOKEN:
     raise ValueError("No Discord API token found in environment variables!")
@@ -26,9 +33,9 @@ class CoquiTTS:
         Initialize and load the TTS model.
         """
         self.model_name = model_name
-        print(f"Loading TTS model: {self.model_name}")
+        log.info(f"Loading TTS model: {self.model_name}")
         self.tts = TTS(model_name=self.model_name)
-        print("TTS model loaded successfully.")
+        log.info("TTS model loaded successfully.")
 
     def generate_wav(self, text: str, output_file: str):
         """
@@ -57,10 +64,10 @@ class DiscordServerManager:
 
         try:
             await channel.edit(name=new_name)
-            print(f"Channel {channel_id} name changed to {new_name} in guild {guild_id}")
+            log.info(f"Channel {channel_id} name changed to {new_name} in guild {guild_id}")
             return f"Channel name changed to {new_name}."
         except Exception as e:
-            print(f"Error changing channel name: {e}")
+            log.error(f"Error changing channel name: {e}")
             return f"Failed to change channel name: {str(e)}"
 
     async def change_nickname(self, guild_id, user_id, new_nickname):
@@ -74,10 +81,10 @@ class DiscordServerManager:
 
         try:
             await member.edit(nick=new_nickname)
-            print(f"Nickname for user {user_id} changed to {new_nickname} in guild {guild_id}")
+            log.info(f"Nickname for user {user_id} changed to {new_nickname} in guild {guild_id}")
             return f"Nickname changed to {new_nickname}."
         except Exception as e:
-            print(f"Error changing nickname: {e}")
+            log.error(f"Error changing nickname: {e}")
             return f"Failed to change nickname: {str(e)}"
 
     async def change_text_channel_topic(self, guild_id, channel_id, new_topic):
@@ -91,19 +98,19 @@ class DiscordServerManager:
 
         try:
             await channel.edit(topic=new_topic)
-            print(f"Channel {channel_id} topic changed to {new_topic} in guild {guild_id}")
+            log.info(f"Channel {channel_id} topic changed to {new_topic} in guild {guild_id}")
             return f"Channel topic changed to: {new_topic}."
         except Exception as e:
-            print(f"Error changing channel topic: {e}")
+            log.error(f"Error changing channel topic: {e}")
             return f"Failed to change channel topic: {str(e)}"
 
     async def get_guilds(self):
         try:
             guilds = [guild for guild in self.bot.guilds]
-            print(f"Retrieved guilds: {[guild.name for guild in guilds]}")
+            log.debug("Retrieved %d guilds", len(guilds))
             return guilds
         except Exception as e:
-            print(f"Error retrieving guilds: {e}")
+            log.error(f"Error retrieving guilds: {e}")
             return f"Failed to retrieve guilds: {str(e)}"
 
     async def get_guild_members(self, guild_id):
@@ -113,10 +120,10 @@ class DiscordServerManager:
 
         try:
             members = [member for member in guild.members]
-            print(f"Retrieved members in guild {guild_id}: {[member.name for member in members]}")
+            log.debug("Retrieved %d members in guild %s", len(members), guild_id)
             return members
         except Exception as e:
-            print(f"Error retrieving members: {e}")
+            log.error(f"Error retrieving members: {e}")
             return f"Failed to retrieve members: {str(e)}"
 
     async def get_channels(self, guild_id):
@@ -126,10 +133,10 @@ class DiscordServerManager:
 
         try:
             channels = [channel for channel in guild.channels]
-            print(f"Retrieved channels in guild {guild_id}: {[channel.name for channel in channels]}")
+            log.debug("Retrieved %d channels in guild %s", len(channels), guild_id)
             return channels
         except Exception as e:
-            print(f"Error retrieving channels: {e}")
+            log.error(f"Error retrieving channels: {e}")
             return f"Failed to retrieve channels: {str(e)}"
 
     async def handle_tool_call(self, tool_call):
@@ -167,10 +174,10 @@ class DiscordServerManager:
             else:
                 return "Tool not recognized."
         except KeyError as e:
-            print(f"Missing parameter in tool call: {e}")
+            log.info(f"Missing parameter in tool call: {e}")
             return f"Missing parameter: {str(e)}"
         except Exception as e:
-            print(f"Error executing tool call: {e}")
+            log.error(f"Error executing tool call: {e}")
             return f"Error executing tool: {str(e)}"
 
 # ======================
@@ -202,10 +209,10 @@ def call_local_llm(messages):
         response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=60)
         response.raise_for_status()
         data = response.json()
-        print(f"LLM Response: {data}")
+        log.debug("LLM Response: %s", data)
         return data["choices"][0]["message"]["content"]
     except Exception as e:
-        print(f"Error calling local LLM: {e}")
+        log.error(f"Error calling local LLM: {e}")
         return "Sorry, I'm having trouble thinking right now."
 
 # ======================
@@ -229,10 +236,10 @@ async def execute_tool(ctx, *, tool_call_json: str):
         result = await server_manager.handle_tool_call(tool_call)
         await ctx.send(f"Result: {result}")
     except json.JSONDecodeError:
-        print("Error: Invalid JSON format")
+        log.error("Invalid JSON format")
         await ctx.send("Invalid JSON format.")
     except Exception as e:
-        print(f"Error executing tool: {e}")
+        log.error(f"Error executing tool: {e}")
         await ctx.send(f"Error: {str(e)}")
 
 # ======================
@@ -240,7 +247,8 @@ async def execute_tool(ctx, *, tool_call_json: str):
 # ======================
 if __name__ == "__main__":
     try:
-        print("Starting bot...")
-        bot.run(TOKEN)
+        log.info("Starting bot...")
+        # The logging pipeline already handles discord.py's logger
+        bot.run(TOKEN, log_handler=None)
     except Exception as e:
-        print(f"Error running bot: {e}")
+        log.error(f"Error running bot: {e}")
@@ -0,0 +1,181 @@
+# launcher.py
+#
+# Runs the bot as several processes ("clusters"), each an AutoShardedBot for a
+# slice of the shards, so gateway handling, TTS and music spread over cores.
+#
+# Usage:
+#   python launcher.py                      # one cluster per CPU, shard count from Discord
+#   python launcher.py --clusters 4 --shards 16
+#
+# Each cluster gets SHARDING=on, SHARD_COUNT, SHARD_IDS and CLUSTER_ID, plus its
+# own METRICS_PORT (base + cluster), TRACE_FILE and audio cache folder (the cache
+# index isn't multi-process safe). DM sessions are shared through DM_SESSION_DIR;
+# music queues are saved and restored by the cluster owning each guild.
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from cogs.log import get_logger, logging_pipeline
+
+logging_pipeline.setup()
+log = get_logger("launcher")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+# Discord allows one IDENTIFY per 5 seconds per max_concurrency bucket
+IDENTIFY_INTERVAL = 5
+# A cluster that exits is restarted after this delay, doubling up to RESTART_MAX_DELAY
+RESTART_BASE_DELAY = 5
+RESTART_MAX_DELAY = 120
+# Clusters that ran this long before exiting restart with the base delay again
+RESTART_RESET_AFTER = 300
+# How long clusters get to shut down gracefully before they are killed
+SHUTDOWN_TIMEOUT = 45
+
+
+def recommended_shards(token: str):
+    """(shard count, max_concurrency) recommended by Discord for this bot."""
+    request = urllib.request.Request(GATEWAY_BOT_URL, headers={
+        "Authorization": f"Bot {token}",
+        "User-Agent": "DiscordBot (launcher, 1.0)",
+    })
+    with urllib.request.urlopen(request, timeout=10) as response:
+        data = json.load(response)
+    return data["shards"], data.get("session_start_limit", {}).get("max_concurrency", 1)
+
+
+def split_shards(shard_count: int, clusters: int):
+    """Contiguous shard ranges, one per cluster: 10 shards / 3 clusters -> [0-3], [4-6], [7-9]."""
+    clusters = max(1, min(clusters, shard_count))
+    base, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for i in range(clusters):
+        size = base + (1 if i < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class Cluster:
+    def __init__(self, cluster_id: int, shard_ids, shard_count: int, metrics_port: int):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.metrics_port = metrics_port
+        self.process = None
+        self.started_at = 0.0
+        self.restart_delay = RESTART_BASE_DELAY
+        self.restart_at = None
+
+    def env(self) -> dict:
+        env = dict(os.environ)
+        env.update({
+            "SHARDING": "on",
+            "SHARD_COUNT": str(self.shard_count),
+            "SHARD_IDS": f"{self.shard_ids[0]}-{self.shard_ids[-1]}",
+            "CLUSTER_ID": str(self.cluster_id),
+            "METRICS_PORT": str(self.metrics_port + self.cluster_id) if self.metrics_port else "0",
+            "TRACE_FILE": os.path.join(BASE_DIR, f"traces.cluster{self.cluster_id}.jsonl"),
+            "AUDIO_CACHE_DIR": os.path.join(
+                os.getenv("AUDIO_CACHE_DIR", os.path.join(BASE_DIR, "audio_cache")), f"cluster{self.cluster_id}"
+            ),
+        })
+        return env
+
+    def start(self):
+        self.process = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, "main.py")], env=self.env())
+        self.started_at = time.monotonic()
+        self.restart_at = None
+        log.info("Cluster %d (shards %d-%d) started as pid %d",
+                 self.cluster_id, self.shard_ids[0], self.shard_ids[-1], self.process.pid)
+
+    def poll(self):
+        """Schedule a restart with backoff if the process has exited."""
+        if self.process is None or self.restart_at is not None:
+            return
+        code = self.process.poll()
+        if code is None:
+            return
+        if time.monotonic() - self.started_at >= RESTART_RESET_AFTER:
+            self.restart_delay = RESTART_BASE_DELAY
+        log.warning("Cluster %d exited with code %s; restarting in %ds", self.cluster_id, code, self.restart_delay)
+        self.restart_at = time.monotonic() + self.restart_delay
+        self.restart_delay = min(self.restart_delay * 2, RESTART_MAX_DELAY)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the bot as multiple sharded processes")
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1, help="number of processes")
+    parser.add_argument("--shards", type=int, default=int(os.getenv("SHARD_COUNT") or 0),
+                        help="total shard count (default: SHARD_COUNT, else Discord's recommendation)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        raise ValueError("No Discord API token found! Please set DISCORD_TOKEN in your .env file.")
+
+    shard_count, max_concurrency = args.shards, 1
+    if not shard_count:
+        shard_count, max_concurrency = recommended_shards(token)
+    metrics_port = int(os.getenv("METRICS_PORT", "9108"))
+    clusters = [
+        Cluster(i, shard_ids, shard_count, metrics_port)
+        for i, shard_ids in enumerate(split_shards(shard_count, args.clusters))
+    ]
+    log.info("Launching %d clusters for %d shards", len(clusters), shard_count)
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    # Stagger cluster starts so their shards don't exceed the IDENTIFY rate limit together
+    for cluster in clusters:
+        if stopping:
+            break
+        cluster.start()
+        deadline = time.monotonic() + IDENTIFY_INTERVAL * len(cluster.shard_ids) / max_concurrency
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(0.5)
+
+    while not stopping:
+        for cluster in clusters:
+            cluster.poll()
+            if cluster.restart_at is not None and time.monotonic() >= cluster.restart_at:
+                cluster.start()
+        time.sleep(1)
+
+    log.info("Stopping clusters...")
+    running = [c.process for c in clusters if c.process and c.process.poll() is None]
+    for process in running:
+        process.send_signal(signal.SIGTERM)
+    deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+    for process in running:
+        try:
+            process.wait(max(0.1, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            log.warning("Cluster pid %d did not stop in time; killing it", process.pid)
+            process.kill()
+    logging_pipeline.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+# loadtest/__init__.py
+#
+# Offline load-test harness: runs main.py's cogs against a fake Discord
+# gateway/HTTP layer, a stub OpenAI-compatible LLM server and a stub TTS engine.
+# Entry point: python -m loadtest.run --help
@@ -0,0 +1,216 @@
+# loadtest/fake_discord.py
+
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter, defaultdict
+
+import discord
+from discord.http import HTTPClient
+from discord.utils import time_snowflake, utcnow
+
+BOT_USER_ID = 900000000000000001
+
+
+def user_payload(user_id: int, name: str, bot=False) -> dict:
+    return {
+        "id": str(user_id),
+        "username": name,
+        "global_name": name,
+        "discriminator": "0",
+        "avatar": None,
+        "bot": bot,
+        "public_flags": 0,
+    }
+
+
+def member_payload(user: dict) -> dict:
+    return {
+        "user": user,
+        "nick": None,
+        "roles": [],
+        "joined_at": utcnow().isoformat(),
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def message_payload(message_id: int, channel_id: int, author: dict, content: str, guild_id=None, member=None) -> dict:
+    data = {
+        "id": str(message_id),
+        "channel_id": str(channel_id),
+        "author": author,
+        "content": content,
+        "timestamp": utcnow().isoformat(),
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+        "flags": 0,
+    }
+    if guild_id is not None:
+        data["guild_id"] = str(guild_id)
+    if member is not None:
+        data["member"] = {k: v for k, v in member.items() if k != "user"}
+    return data
+
+
+class FakeDiscordHTTP(HTTPClient):
+    """
+    HTTPClient that never touches the network. Every REST call lands in
+    `request`, sleeps `latency` to mimic Discord's round trip, is counted
+    per route, and gets a plausible JSON payload back. Sent messages are
+    reported to `on_message_sent(channel_id, content)` so the harness can
+    match replies to the synthetic messages that caused them.
+    """
+    def __init__(self, loop, *, latency=0.0):
+        super().__init__(loop)
+        self.latency = latency
+        self.bot_user = user_payload(BOT_USER_ID, "loadtest-bot", bot=True)
+        self.users = {}           # user_id -> user payload (for DM channel creation)
+        self.on_message_sent = None
+        self.route_counts = Counter()
+        self.route_time = defaultdict(float)
+        self.unhandled = Counter()
+        self._dm_ids = itertools.count(800000000000000001)
+
+    async def static_login(self, token: str):
+        self.token = token
+        return self.bot_user
+
+    async def close(self):
+        pass
+
+    async def request(self, route, *, files=None, form=None, **kwargs):
+        start = time.perf_counter()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        key = f"{route.method} {route.path}"
+        try:
+            return self._respond(route, key, form, kwargs)
+        finally:
+            self.route_counts[key] += 1
+            self.route_time[key] += time.perf_counter() - start
+
+    def _respond(self, route, key, form, kwargs):
+        if key == "POST /channels/{channel_id}/messages":
+            payload = kwargs.get("json") or {}
+            for part in form or []:
+                if part.get("name") == "payload_json":
+                    payload = json.loads(part["value"])
+            content = payload.get("content") or ""
+            if self.on_message_sent:
+                self.on_message_sent(route.channel_id, content)
+            return message_payload(time_snowflake(utcnow()), route.channel_id, self.bot_user, content)
+        if key == "POST /users/@me/channels":
+            recipient_id = int(kwargs["json"]["recipient_id"])
+            recipient = self.users.get(recipient_id, user_payload(recipient_id, f"user-{recipient_id}"))
+            return {"id": str(next(self._dm_ids)), "type": 1, "recipients": [recipient], "last_message_id": None}
+        if key == "GET /oauth2/applications/@me":
+            return {
+                "id": str(BOT_USER_ID),
+                "name": "loadtest-bot",
+                "icon": None,
+                "description": "",
+                "summary": "",
+                "rpc_origins": [],
+                "bot_public": True,
+                "bot_require_code_grant": False,
+                "owner": self.bot_user,
+                "team": None,
+                "verify_key": "",
+                "flags": 0,
+            }
+        if key == "POST /channels/{channel_id}/typing":
+            return None
+        self.unhandled[key] += 1
+        return {}
+
+    def stats(self) -> dict:
+        return {
+            key: {"calls": count, "avg_ms": round(self.route_time[key] / count * 1000, 2)}
+            for key, count in self.route_counts.most_common()
+        }
+
+
+class FakeGateway:
+    """
+    Stands in for the gateway: builds guilds/members directly into the bot's
+    connection state and injects MESSAGE_CREATE events through the same
+    parser a real websocket dispatch would use.
+    """
+    def __init__(self, bot, http: FakeDiscordHTTP):
+        self.bot = bot
+        self.http = http
+        self.state = bot._connection
+        self._ids = itertools.count(100000000000000001)
+
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    def add_guild(self, index: int, user_count: int):
+        """Create a guild with a 'bot-chat' text channel, a voice channel and `user_count` members."""
+        guild_id = self._next_id()
+        users = []
+        for n in range(user_count):
+            user_id = self._next_id()
+            user = user_payload(user_id, f"user{index}-{n}")
+            self.http.users[user_id] = user
+            users.append(user)
+        channels = [
+            {"id": str(self._next_id()), "type": 0, "name": "bot-chat", "position": 0,
+             "permission_overwrites": [], "nsfw": False, "topic": None, "rate_limit_per_user": 0},
+            {"id": str(self._next_id()), "type": 2, "name": "General", "position": 1,
+             "permission_overwrites": [], "bitrate": 64000, "user_limit": 0, "rtc_region": None},
+        ]
+        data = {
+            "id": str(guild_id),
+            "name": f"loadtest-{index}",
+            "owner_id": users[0]["id"] if users else str(BOT_USER_ID),
+            "icon": None,
+            "features": [],
+            "roles": [{
+                "id": str(guild_id), "name": "@everyone", "permissions": str(discord.Permissions.all().value),
+                "position": 0, "color": 0, "hoist": False, "managed": False, "mentionable": False,
+            }],
+            "channels": channels,
+            "members": [member_payload(u) for u in users] + [member_payload(self.http.bot_user)],
+            "member_count": user_count + 1,
+            "emojis": [],
+            "stickers": [],
+            "voice_states": [],
+            "presences": [],
+            "threads": [],
+            "stage_instances": [],
+            "guild_scheduled_events": [],
+            "large": False,
+            "unavailable": False,
+            "verification_level": 0,
+            "explicit_content_filter": 0,
+            "default_message_notifications": 0,
+            "mfa_level": 0,
+            "premium_tier": 0,
+            "nsfw_level": 0,
+            "preferred_locale": "en-US",
+            "system_channel_flags": 0,
+        }
+        guild = self.state._add_guild_from_data(data)
+        self.bot.dispatch("guild_available", guild)
+        return guild, int(channels[0]["id"]), users
+
+    def send_guild_message(self, guild_id: int, channel_id: int, user: dict, content: str):
+        payload = message_payload(
+            self._next_id(), channel_id, user, content,
+            guild_id=guild_id, member=member_payload(user)
+        )
+        self.state.parse_message_create(payload)
+
+    def send_dm(self, dm_channel_id: int, user: dict, content: str):
+        self.state.parse_message_create(message_payload(self._next_id(), dm_channel_id, user, content))
@@ -0,0 +1,258 @@
+# loadtest/run.py
+#
+# Usage: python -m loadtest.run --guilds 20 --users 50 --rate 25 --duration 60
+# Runs fully offline: no Discord connection, no LLM model, no TTS model.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Keep every on-disk side effect of the cogs inside a throwaway folder.
+# These must be set before any cog module is imported.
+WORK_DIR = tempfile.mkdtemp(prefix="bot-loadtest-")
+os.environ.setdefault("DISCORD_TOKEN", "loadtest")
+os.environ["DM_SESSION_DIR"] = os.path.join(WORK_DIR, "dm_sessions")
+os.environ["MUSIC_QUEUE_DIR"] = os.path.join(WORK_DIR, "music_queues")
+os.environ["AUDIO_CACHE_MAX_MB"] = "0"
+os.environ.setdefault("METRICS_PORT", "0")
+os.environ.setdefault("TRACE_FILE", os.path.join(WORK_DIR, "traces.jsonl"))
+
+from discord.ext import commands
+
+from .fake_discord import FakeDiscordHTTP, FakeGateway
+from .stub_llm import StubLLMServer, TAG_PATTERN
+from .stub_tts import install_stub_tts
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(values) -> dict:
+    ordered = sorted(values)
+    summary = {f"p{p}_ms": _ms(percentile(ordered, p)) for p in PERCENTILES}
+    summary["max_ms"] = _ms(ordered[-1] if ordered else None)
+    return summary
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class LatencyTracker:
+    """Matches bot replies to the synthetic messages that triggered them via their [lt:N] tag."""
+    def __init__(self):
+        self.pending = {}        # tag -> (kind, sent_at)
+        self.latencies = {"guild": [], "dm": []}
+        self.errors = Counter()
+        self.replies = 0
+        self._tags = 0
+
+    def new_tag(self, kind: str) -> str:
+        self._tags += 1
+        self.pending[self._tags] = (kind, time.perf_counter())
+        return f"[lt:{self._tags}]"
+
+    def on_message_sent(self, channel_id, content: str):
+        self.replies += 1
+        match = TAG_PATTERN.search(content)
+        if match:
+            entry = self.pending.pop(int(match.group(1)), None)
+            if entry:
+                kind, sent_at = entry
+                self.latencies[kind].append(time.perf_counter() - sent_at)
+        elif content.startswith("[ERROR]"):
+            # Error replies carry no tag; count them and let the request time out of `pending`
+            self.errors[content.split(":")[0][:60]] += 1
+
+    def expire(self, timeout: float) -> int:
+        now = time.perf_counter()
+        expired = [tag for tag, (_, sent_at) in self.pending.items() if now - sent_at > timeout]
+        for tag in expired:
+            del self.pending[tag]
+        return len(expired)
+
+
+async def run_load(args) -> dict:
+    tts = install_stub_tts(rtf=args.tts_rtf)
+    llm = StubLLMServer(
+        latency=args.llm_latency, jitter=args.llm_jitter, tokens_per_sec=args.llm_tokens_per_sec,
+        reply_tokens=args.llm_reply_tokens, error_rate=args.llm_error_rate,
+        tool_call_rate=args.tool_call_rate,
+    )
+    await llm.start()
+    os.environ["LLM_API_URL"] = llm.url
+
+    # Same bot setup and extension list as main.py
+    from main import initial_extensions
+    from cogs.member_cache import build_intents, build_member_cache_flags, CHUNK_GUILDS_AT_STARTUP
+    intents = build_intents()
+    bot = commands.Bot(
+        command_prefix="!", intents=intents, member_cache_flags=build_member_cache_flags(intents),
+        chunk_guilds_at_startup=CHUNK_GUILDS_AT_STARTUP,
+    )
+    http = FakeDiscordHTTP(asyncio.get_running_loop(), latency=args.rest_latency)
+    bot.http = http
+    bot._connection.http = http
+    tracker = LatencyTracker()
+    http.on_message_sent = tracker.on_message_sent
+
+    listener_errors = Counter()
+
+    @bot.event
+    async def on_error(event, *a, **kw):
+        exc = sys.exc_info()[1]
+        listener_errors[f"{event}: {type(exc).__name__}"] += 1
+
+    await bot.login("loadtest")
+    startup = time.perf_counter()
+    for extension in initial_extensions:
+        await bot.load_extension(extension)
+    print(f"[DEBUG] Loaded {len(initial_extensions)} extensions in {time.perf_counter() - startup:.2f}s")
+
+    gateway = FakeGateway(bot, http)
+    guilds = [gateway.add_guild(i, args.users) for i in range(args.guilds)]
+
+    # DM users need an existing private session, like after !talkto
+    from cogs.conversation_manager import private_sessions
+    dm_users = []
+    if args.dm_ratio > 0:
+        for guild, _, users in guilds:
+            for user in users[:max(1, len(users) // 10)]:
+                history = []
+                for n in range(args.dm_history):
+                    history.append({"role": "user", "content": f"earlier message {n}"})
+                    history.append({"role": "assistant", "content": f"earlier reply {n}"})
+                private_sessions[int(user["id"])] = {"user_name": user["username"], "messages": history, "voice_mode_on": False}
+                dm_users.append((gateway._next_id(), user))
+
+    tts_cog = bot.get_cog("VoiceTTSManagerCog")
+    interval = 1.0 / args.rate
+    deadline = time.perf_counter() + args.duration
+    sent = Counter()
+    timeouts = 0
+    tts_tasks = set()
+
+    print(f"[DEBUG] Sending ~{args.rate} msg/s for {args.duration}s across {args.guilds} guilds x {args.users} users")
+    started = time.perf_counter()
+    next_send = started
+    while time.perf_counter() < deadline:
+        if dm_users and random.random() < args.dm_ratio:
+            dm_channel_id, user = random.choice(dm_users)
+            gateway.send_dm(dm_channel_id, user, f"hello there {tracker.new_tag('dm')}")
+            sent["dm"] += 1
+        else:
+            guild, channel_id, users = random.choice(guilds)
+            user = random.choice(users)
+            gateway.send_guild_message(guild.id, channel_id, user, f"what's up {tracker.new_tag('guild')}")
+            sent["guild"] += 1
+            if tts_cog and random.random() < args.tts_ratio:
+                task = asyncio.create_task(tts_cog.queue_tts_for_guild(guild.id, "some reply text to read out loud"))
+                tts_tasks.add(task)
+                task.add_done_callback(tts_tasks.discard)
+
+        timeouts += tracker.expire(args.timeout)
+        # Poisson arrivals: exponential gaps around the target rate
+        next_send += random.expovariate(1.0 / interval)
+        await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+
+    # Drain: wait for in-flight replies up to the timeout
+    drain_deadline = time.perf_counter() + args.timeout
+    while tracker.pending and time.perf_counter() < drain_deadline:
+        await asyncio.sleep(0.1)
+    timeouts += tracker.expire(0)
+    if tts_tasks:
+        await asyncio.wait(tts_tasks, timeout=args.timeout)
+    elapsed = time.perf_counter() - started
+
+    completed = sum(len(v) for v in tracker.latencies.values())
+    total_sent = sum(sent.values())
+    # Error replies carry no tag, so their requests also expired; "lost" is what got no reply at all
+    lost = max(0, timeouts - sum(tracker.errors.values()))
+    report = {
+        "config": vars(args),
+        "sent": dict(sent),
+        "completed": completed,
+        "timeouts": timeouts,
+        "lost": lost,
+        "error_replies": dict(tracker.errors),
+        "listener_errors": dict(listener_errors),
+        "error_rate": round((total_sent - completed) / total_sent, 4) if total_sent else 0.0,
+        "throughput_per_s": round(completed / elapsed, 2) if elapsed else 0.0,
+        "latency": {kind: summarize(values) for kind, values in tracker.latencies.items() if values},
+        "tts_synthesis": summarize(tts.synth_times) if tts.synth_times else None,
+        "llm": llm.stats(),
+        "rest_routes": http.stats(),
+        "rest_unhandled": dict(http.unhandled),
+    }
+
+    await bot.close()
+    await llm.stop()
+    return report
+
+
+def print_report(report: dict):
+    print("\n=== Load test report ===")
+    print(f"sent={report['sent']} completed={report['completed']} lost={report['lost']} "
+          f"error_rate={report['error_rate']:.2%} throughput={report['throughput_per_s']}/s")
+    for kind, summary in report["latency"].items():
+        print(f"{kind:>6} latency: " + " ".join(f"{k}={v}" for k, v in summary.items()))
+    if report["tts_synthesis"]:
+        print("   tts synth: " + " ".join(f"{k}={v}" for k, v in report["tts_synthesis"].items()))
+    if report["error_replies"] or report["listener_errors"]:
+        print(f"errors: {report['error_replies']} {report['listener_errors']}")
+    print(f"llm: {report['llm']}")
+    for route, stats in report["rest_routes"].items():
+        print(f"  {route}: {stats}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test for the bot's cogs")
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--users", type=int, default=20, help="members per guild")
+    parser.add_argument("--rate", type=float, default=10.0, help="messages per second (all guilds)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of traffic")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a reply counts as lost")
+    parser.add_argument("--dm-ratio", type=float, default=0.2, help="share of traffic sent as DMs")
+    parser.add_argument("--dm-history", type=int, default=20, help="prior exchanges in each DM session")
+    parser.add_argument("--tool-call-rate", type=float, default=0.1)
+    parser.add_argument("--tts-ratio", type=float, default=0.0, help="share of guild messages also queued for TTS")
+    parser.add_argument("--tts-rtf", type=float, default=0.2, help="stub TTS real-time factor")
+    parser.add_argument("--rest-latency", type=float, default=0.05, help="simulated Discord REST round trip (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--llm-tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--llm-reply-tokens", type=int, default=30)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_out", default=None, help="also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    report = asyncio.run(run_load(args))
+    print_report(report)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(f"[DEBUG] Scratch files left in {WORK_DIR}")
+    # Non-zero exit when any request got no reply at all, so CI can gate on it
+    return 1 if report["lost"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
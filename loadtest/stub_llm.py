@@ -0,0 +1,139 @@
+# loadtest/stub_llm.py
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+
+from aiohttp import web
+
+# Correlation tag the harness embeds in every synthetic message; echoed back in the reply
+TAG_PATTERN = re.compile(r"\[lt:(\d+)\]")
+
+
+class StubLLMServer:
+    """
+    Minimal OpenAI-compatible /v1/chat/completions server for load tests.
+    Each reply waits `latency` (+/- jitter) for the first token, then
+    `reply_tokens / tokens_per_sec` for generation, and returns the JSON
+    body the cogs expect: {"message": ..., "tool_calls": [...]}.
+    """
+    def __init__(self, *, latency=0.3, jitter=0.1, tokens_per_sec=40.0, reply_tokens=30,
+                 error_rate=0.0, tool_call_rate=0.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_sec = tokens_per_sec
+        self.reply_tokens = reply_tokens
+        self.error_rate = error_rate
+        self.tool_call_rate = tool_call_rate
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompt_chars = 0
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1/chat/completions"
+
+    def _reply_content(self, messages) -> str:
+        last_user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        tag = TAG_PATTERN.search(last_user)
+        words = " ".join(random.choice(("lorem", "ipsum", "dolor", "sit", "amet")) for _ in range(self.reply_tokens))
+        message = f"{words} {tag.group(0)}" if tag else words
+        tool_calls = []
+        if random.random() < self.tool_call_rate:
+            tool_calls.append({"tool_name": random.choice(("get_guilds", "get_channels")), "parameters": {}})
+        return json.dumps({"message": message, "tool_calls": tool_calls})
+
+    async def handle_completion(self, request: web.Request):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            body = await request.json()
+            messages = body.get("messages", [])
+            self.prompt_chars += sum(len(m.get("content", "")) for m in messages)
+
+            delay = max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+            if self.tokens_per_sec > 0:
+                delay += self.reply_tokens / self.tokens_per_sec
+            await asyncio.sleep(delay)
+
+            if random.random() < self.error_rate:
+                self.errors += 1
+                return web.json_response({"error": "stub failure"}, status=500)
+
+            return web.json_response({
+                "id": f"chatcmpl-{self.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": self._reply_content(messages)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"completion_tokens": self.reply_tokens},
+            })
+        finally:
+            self.in_flight -= 1
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle_completion)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Port 0 picks a free port; read back the one actually bound
+        self.port = self._runner.addresses[0][1]
+        print(f"[DEBUG] Stub LLM listening on {self.url}")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "max_in_flight": self.max_in_flight,
+            "avg_prompt_chars": round(self.prompt_chars / self.requests) if self.requests else 0,
+        }
+
+
+async def _serve_forever(args):
+    server = StubLLMServer(
+        latency=args.latency, jitter=args.jitter, tokens_per_sec=args.tokens_per_sec,
+        reply_tokens=args.reply_tokens, error_rate=args.error_rate,
+        tool_call_rate=args.tool_call_rate, host=args.host, port=args.port,
+    )
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    # Standalone mode, e.g. to point a real bot at: LLM_API_URL=http://127.0.0.1:1234/v1/chat/completions
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds to first token")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--reply-tokens", type=int, default=30)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--tool-call-rate", type=float, default=0.0)
+    try:
+        asyncio.run(_serve_forever(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
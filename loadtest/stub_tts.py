@@ -0,0 +1,53 @@
+# loadtest/stub_tts.py
+
+import sys
+import threading
+import time
+import types
+import wave
+
+SAMPLE_RATE = 22050
+# Rough speaking rate used to size the generated audio
+SECONDS_PER_WORD = 0.35
+
+
+class StubTTS:
+    """
+    Drop-in for cogs.tts_engine.CoquiTTS that needs no model.
+    generate_wav blocks for (audio duration * rtf) to mimic synthesis cost,
+    then writes silent 16-bit mono audio of that duration.
+    """
+    def __init__(self, rtf=0.2):
+        self.rtf = rtf
+        self.synth_times = []
+        self._lock = threading.Lock()
+
+    def generate_wav(self, text: str, output_file: str):
+        start = time.perf_counter()
+        duration = max(0.5, len(text.split()) * SECONDS_PER_WORD)
+        time.sleep(duration * self.rtf)
+        with wave.open(output_file, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(SAMPLE_RATE)
+            f.writeframes(b"\x00\x00" * int(duration * SAMPLE_RATE))
+        with self._lock:
+            self.synth_times.append(time.perf_counter() - start)
+
+
+def install_stub_tts(rtf=0.2) -> StubTTS:
+    """
+    Register a fake `cogs.tts_engine` module so the voice cog imports the stub
+    instead of loading a Coqui model. Must run before the cogs are loaded.
+    """
+    engine = StubTTS(rtf=rtf)
+    module = types.ModuleType("cogs.tts_engine")
+    module.CoquiTTS = StubTTS
+    module.tts_engine = engine
+
+    async def setup(bot):
+        pass
+
+    module.setup = setup
+    sys.modules["cogs.tts_engine"] = module
+    return engine
@@ -1,50 +1,134 @@
 # main.py
 
-import discord
-from discord.ext import commands
 import asyncio
 from dotenv import load_dotenv
 import os
+import signal
 
-# Load environment variables from .env
+# Load environment variables from .env (before importing cogs, which read them at import time)
 load_dotenv()
 
+# Imported first so the startup report measures from here
+from cogs.startup import startup
+
+with startup.phase("import discord.py"):
+    import discord
+with startup.phase("import core modules"):
+    from cogs.metrics import discord_http_trace
+    from cogs.log import get_logger, logging_pipeline, bind_log_context
+    from cogs.member_cache import build_intents, build_member_cache_flags, CHUNK_GUILDS_AT_STARTUP
+    from cogs.sharding import create_bot
+    from cogs.tracing import tracer
+    from cogs.shutdown import graceful_shutdown
+
+logging_pipeline.setup()
+log = get_logger("main")
+
 # Retrieve the token from the environment variable
 TOKEN = os.getenv("DISCORD_TOKEN")
 if not TOKEN:
     raise ValueError("No Discord API token found! Please set DISCORD_TOKEN in your .env file.")
 
-# Define the bot with all intents
-intents = discord.Intents.all()
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Intents and member caching come from BOT_INTENTS / MEMBER_CACHE; guilds are chunked
+# on first need unless CHUNK_GUILDS_AT_STARTUP is set
+intents = build_intents()
+# http_trace times every Discord REST call for the metrics endpoint.
+# With SHARDING=on this is an AutoShardedBot for SHARD_IDS (see launcher.py)
+bot = create_bot(
+    command_prefix="!",
+    intents=intents,
+    member_cache_flags=build_member_cache_flags(intents),
+    chunk_guilds_at_startup=CHUNK_GUILDS_AT_STARTUP,
+    http_trace=discord_http_trace(),
+)
+
+@bot.before_invoke
+async def bind_command_log_context(ctx):
+    """Tag every log record emitted while a command runs with its guild, user and name."""
+    bind_log_context(
+        guild_id=ctx.guild.id if ctx.guild else None,
+        user_id=ctx.author.id,
+        command=ctx.command.qualified_name if ctx.command else None,
+    )
+
+@bot.event
+async def on_message(message):
+    """Once shutdown starts, new commands are ignored; running ones are drained first."""
+    if graceful_shutdown.closing:
+        return
+    with graceful_shutdown.in_flight():
+        await bot.process_commands(message)
+
+@bot.listen("on_ready")
+async def report_startup():
+    """Log the startup breakdown; show "warming up" as the status until heavy features have loaded."""
+    startup.mark_connected()
+    if not startup.pending():
+        return
+    await bot.change_presence(activity=discord.Game("warming up..."))
+    await startup.wait_ready()
+    await bot.change_presence(activity=None)
+    log.info("All features ready %.2fs after start\n%s", startup.elapsed(), startup.format())
 
-# List of cogs/extensions to load
+# List of cogs/extensions to load. They load concurrently; heavy dependencies
+# (the TTS model, yt-dlp) are not imported here but warmed up in the background.
 initial_extensions = [
+    "cogs.metrics_endpoint",
+    "cogs.diagnostics",
     "cogs.conversation_manager",
     "cogs.server_manager",
     "cogs.voice_tts_manager",
     "cogs.music_cog",
 ]
 
+async def load_extension(extension: str):
+    try:
+        with startup.phase(f"extension {extension}"):
+            await bot.load_extension(extension)
+        log.info(f"Loaded extension: {extension}")
+    except Exception as e:
+        log.error(f"Failed to load extension {extension}: {e}")
+
 async def load_extensions():
-    """Asynchronously load all listed extensions."""
-    for extension in initial_extensions:
+    """
+    Load all listed extensions concurrently. Module code still runs in list
+    order (each extension executes up to its first await before the next
+    starts), so helpers such as conversation_manager are shared as before;
+    only their cog_load I/O (session files, saved queues, the metrics
+    server) overlaps.
+    """
+    await asyncio.gather(*(load_extension(extension) for extension in initial_extensions))
+
+def install_signal_handlers():
+    """SIGTERM (deploys, launcher.py) and Ctrl+C run the graceful shutdown sequence."""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
         try:
-            await bot.load_extension(extension)
-            print(f"[SUCCESS] Loaded extension: {extension}")
-        except Exception as e:
-            print(f"[ERROR] Failed to load extension {extension}: {e}")
+            loop.add_signal_handler(
+                sig, lambda sig=sig: asyncio.create_task(graceful_shutdown.shutdown(bot, reason=sig.name))
+            )
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C still stops the bot, just without draining
 
 async def main():
     """Main async entrypoint for the bot."""
-    print("[DEBUG] Loading extensions...")
-    await load_extensions()
+    install_signal_handlers()
+    log.debug("Loading extensions...")
+    with startup.phase("load extensions (total)"):
+        await load_extensions()
+    # TTS model and yt-dlp load on worker threads while the gateway connects
+    startup.start_warmups()
 
-    print("[DEBUG] Starting bot...")
+    log.debug("Starting bot...")
     try:
         await bot.start(TOKEN)
     except Exception as e:
-        print(f"[ERROR] Bot run error: {e}")
+        log.error(f"Bot run error: {e}")
+    finally:
+        # No-op after a signal; otherwise (crash, bot.close() elsewhere) still release FFmpeg and temp audio
+        await graceful_shutdown.shutdown(bot, reason="bot stopped")
+        tracer.flush()
+        logging_pipeline.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -13,6 +13,12 @@ from TTS.api import TTS
 # ======================
 load_dotenv()
 
+# Imported after load_dotenv() so LOG_* settings from .env apply
+from cogs.log import get_logger, logging_pipeline
+
+logging_pipeline.setup()
+log = get_logger("legacy")
+
 TOKEN =  ""
 if not TOKEN:
     raise ValueError("No Discord API token found!")
@@ -25,19 +31,19 @@ DEFAULT_GUILD_ID = 1234567890  # Modify as needed
 # ======================
 class CoquiTTS:
     def __init__(self, model_name="tts_models/en/ljspeech/tacotron2-DDC"):
-        print(f"[DEBUG] Loading TTS model: {model_name}")
+        log.debug(f"Loading TTS model: {model_name}")
         try:
             self.tts = TTS(model_name=model_name)
-            print("[DEBUG] TTS model loaded successfully.")
+            log.debug("TTS model loaded successfully.")
         except Exception as e:
-            print(f"[ERROR] Failed to load TTS model: {e}")
+            log.error(f"Failed to load TTS model: {e}")
 
     def generate_wav(self, text: str, output_file: str):
         try:
             self.tts.tts_to_file(text=text, file_path=output_file)
-            print(f"[DEBUG] Generated TTS audio: {output_file}")
+            log.debug(f"Generated TTS audio: {output_file}")
         except Exception as e:
-            print(f"[ERROR] TTS generation error: {e}")
+            log.error(f"TTS generation error: {e}")
 
 tts_engine = CoquiTTS()
 
@@ -102,7 +108,7 @@ class DiscordServerManager:
         if channel_id:
             channel = guild.get_channel(channel_id)
             if channel is None:
-                print(f"[DEBUG] channel_id={channel_id} not found. Fallback to channel_name={channel_name}.")
+                log.debug(f"channel_id={channel_id} not found. Fallback to channel_name={channel_name}.")
         if not channel and channel_name:
             channel = find_channel_by_name(guild, channel_name)
 
@@ -131,7 +137,7 @@ class DiscordServerManager:
         if user_id:
             member = guild.get_member(user_id)
             if member is None:
-                print(f"[DEBUG] user_id={user_id} not found. Fallback to user_name={user_name}.")
+                log.debug(f"user_id={user_id} not found. Fallback to user_name={user_name}.")
         if not member and user_name:
             member = find_member_by_name(guild, user_name)
 
@@ -160,7 +166,7 @@ class DiscordServerManager:
         if channel_id:
             channel = guild.get_channel(channel_id)
             if channel is None:
-                print(f"[DEBUG] channel_id={channel_id} not found. Fallback to channel_name={channel_name}.")
+                log.debug(f"channel_id={channel_id} not found. Fallback to channel_name={channel_name}.")
         if not channel and channel_name:
             channel = find_channel_by_name(guild, channel_name)
 
@@ -255,7 +261,7 @@ class DiscordServerManager:
         if user_id:
             member = guild.get_member(user_id)
             if member is None:
-                print(f"[DEBUG] user_id={user_id} not found. Fallback to user_name={user_name}.")
+                log.debug(f"user_id={user_id} not found. Fallback to user_name={user_name}.")
         if not member and user_name:
             member = find_member_by_name(guild, user_name)
 
@@ -327,7 +333,7 @@ class DiscordServerManager:
         if channel_id:
             channel = guild.get_channel(channel_id)
             if channel is None:
-                print(f"[DEBUG] channel_id={channel_id} not found. Fallback to channel_name={channel_name}.")
+                log.debug(f"channel_id={channel_id} not found. Fallback to channel_name={channel_name}.")
         if not channel and channel_name:
             channel = find_channel_by_name(guild, channel_name)
 
@@ -353,7 +359,7 @@ class DiscordServerManager:
         if user_id:
             member = guild.get_member(user_id)
             if member is None:
-                print(f"[DEBUG] user_id={user_id} not found. Fallback to user_name={user_name}.")
+                log.debug(f"user_id={user_id} not found. Fallback to user_name={user_name}.")
         if not member and user_name:
             member = find_member_by_name(guild, user_name)
 
@@ -437,7 +443,7 @@ class DiscordServerManager:
         tool_name = tool_call.get("tool_name")
         params = tool_call.get("parameters", {})
 
-        print(f"[DEBUG] handle_tool_call invoked with tool_name='{tool_name}' and params={params}")
+        log.debug("handle_tool_call invoked with tool_name='%s' and params=%s", tool_name, params)
 
         try:
             if tool_name == "change_channel_name":
@@ -526,7 +532,7 @@ class DiscordServerManager:
     async def handle_tool_calls(self, tool_calls: list):
         results = []
         for call in tool_calls:
-            print(f"[DEBUG] Processing tool call: {call}")
+            log.debug("Processing tool call: %s", call)
             result = await self.handle_tool_call(call)
             results.append(result)
         return results
@@ -846,9 +852,11 @@ async def manual_tool(ctx, *, tool_call_json: str):
 # ======================
 if __name__ == "__main__":
     try:
-        print("[DEBUG] Starting bot...")
+        log.debug("Starting bot...")
+        # The logging pipeline already handles discord.py's logger
         bot.run(
             TOKEN,
+            log_handler=None,
         )
     except Exception as e:
-        print(f"[ERROR] Bot run error: {e}")
+        log.error(f"Bot run error: {e}")
@@ -0,0 +1,42 @@
+# tests/test_music_sources.py
+
+import io
+import types
+
+import pytest
+
+discord = pytest.importorskip("discord")
+pytest.importorskip("aiohttp")
+
+from cogs import music_cog
+
+
+@pytest.fixture
+def ffmpeg_args(monkeypatch):
+    """Capture the FFmpeg command line instead of starting a process."""
+    calls = []
+
+    def fake_spawn(self, args, **kwargs):
+        calls.append(args)
+        return types.SimpleNamespace(stdout=io.BytesIO(), stdin=None, pid=0, poll=lambda: 0)
+
+    monkeypatch.setattr(discord.player.FFmpegAudio, "_spawn_process", fake_spawn)
+    return calls
+
+
+def codec_arg(args):
+    return args[args.index("-c:a") + 1]
+
+
+def test_opus_stream_is_copied_at_full_volume(monkeypatch, ffmpeg_args):
+    monkeypatch.setattr(music_cog, "MUSIC_VOLUME", 1.0)
+    source = music_cog.YTDLOpusSource(data={"url": "track.webm", "acodec": "opus"}, guild_id=1)
+    assert source.passthrough
+    assert codec_arg(ffmpeg_args[-1]) == "copy"
+
+
+def test_non_opus_stream_is_encoded(monkeypatch, ffmpeg_args):
+    monkeypatch.setattr(music_cog, "MUSIC_VOLUME", 1.0)
+    source = music_cog.YTDLOpusSource(data={"url": "track.m4a", "acodec": "mp4a.40.2"}, guild_id=1)
+    assert not source.passthrough
+    assert codec_arg(ffmpeg_args[-1]) == "libopus"
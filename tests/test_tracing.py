@@ -0,0 +1,56 @@
+# tests/test_tracing.py
+
+import asyncio
+
+import pytest
+
+from cogs import tracing
+
+
+@pytest.fixture
+def exported(monkeypatch, tmp_path):
+    """A fresh global tracer that never samples at random and collects exports in a list."""
+    batches = []
+    tracer = tracing.Tracer(path=str(tmp_path / "traces.jsonl"), otlp_url="", sample_rate=0, slow_seconds=0.05)
+    monkeypatch.setattr(tracer, "_submit", batches.append)
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    return batches
+
+
+async def handle_message(child_delay: float, root_delay: float, child_error=False):
+    """Like conversation_manager.route_message: spawn a TTS-style child task right before the root ends."""
+    async def child():
+        async with tracing.span("queue_tts_for_guild"):
+            await asyncio.sleep(child_delay)
+            if child_error:
+                raise RuntimeError("tts failed")
+
+    async with tracing.span("on_message"):
+        await asyncio.sleep(root_delay)
+        task = asyncio.create_task(child())
+    try:
+        await task
+    except RuntimeError:
+        pass
+
+
+def names(batches):
+    return sorted(record["name"] for batch in batches for record in batch)
+
+
+def test_late_child_follows_kept_root(exported):
+    asyncio.run(handle_message(child_delay=0.01, root_delay=0.06))
+    assert names(exported) == ["on_message", "queue_tts_for_guild"]
+    trace_ids = {record["trace_id"] for batch in exported for record in batch}
+    assert len(trace_ids) == 1
+
+
+def test_late_child_follows_discarded_root(exported):
+    asyncio.run(handle_message(child_delay=0.1, root_delay=0))
+    assert exported == []
+    assert tracing.tracer.discarded == 2
+
+
+def test_failing_late_child_is_kept(exported):
+    asyncio.run(handle_message(child_delay=0, root_delay=0, child_error=True))
+    assert names(exported) == ["queue_tts_for_guild"]